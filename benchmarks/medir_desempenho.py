@@ -0,0 +1,200 @@
+"""Benchmarks reprodutíveis do simulador: previsão, simulação, montagem dos dados e relatórios.
+
+Cada caso é executado até somar TEMPO_MINIMO segundos (no máximo MAX_REPETICOES vezes);
+registra-se o melhor tempo, a mediana, a vazão (dias ou pontos por segundo) e o pico de
+memória de uma execução extra sob tracemalloc. Os dados de entrada são gerados com
+semente fixa.
+
+Uso:
+    python benchmarks/medir_desempenho.py --saida benchmarks/baseline.json
+    python benchmarks/medir_desempenho.py --comparar benchmarks/baseline.json --limite 0.25
+
+Com --comparar, o processo termina com código 1 se algum caso ficar mais lento (ou usar
+mais memória) que o baseline além do limite relativo. --completo inclui os casos mais
+pesados de relatório e gráfico (horizontes de 1M de dias).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gerar_relatorio
+import main
+from src import simulacao
+
+HORIZONTES = (10, 1_000, 100_000, 1_000_000)
+HISTORICOS = (2, 1_000, 1_000_000, 10_000_000)
+TEMPO_MINIMO = 0.5
+MAX_REPETICOES = 50
+SEMENTE = 20240101
+# Diferenças de memória abaixo deste valor não contam como regressão
+TOLERANCIA_MEMORIA = 1024 * 1024
+# Relatórios por medição do lote (criar_relatorios_lote)
+RELATORIOS_LOTE = 20
+
+DADOS_BASE = {'initial_reserves': 300.0, 'burn_rate': 2.0, 'market_sentiment': -0.5}
+
+def historico(n):
+    """Série sintética do dólar com n pontos (passeio aleatório em torno de R$ 5,00)"""
+    gerador = np.random.default_rng(SEMENTE)
+    return 5.0 + np.cumsum(gerador.normal(0, 0.01, n))
+
+def dados_simulacao(n_historico, horizonte):
+    return dict(DADOS_BASE, dollar_values=historico(n_historico), days_to_predict=horizonte)
+
+def _limpar_cache_tendencia():
+    # Mede o ajuste de fato, e não o acerto no cache de tendências
+    simulacao._CACHE_TENDENCIA.clear()
+
+def casos(completo=False, diretorio='.'):
+    """Gera (nome, itens processados, função medida, preparação antes de cada repetição)"""
+    for n in HISTORICOS:
+        for horizonte in (10, 1_000_000):
+            valores = historico(n)
+            yield (f'prever_dolar[historico={n},horizonte={horizonte}]', n + horizonte,
+                   lambda v=valores, h=horizonte: simulacao.prever_dolar(v, h), _limpar_cache_tendencia)
+
+    for horizonte in HORIZONTES:
+        for estrategia in ('moderada', 'agressiva'):
+            yield (f'simular_reservas[{estrategia},horizonte={horizonte}]', horizonte,
+                   lambda h=horizonte, e=estrategia: simulacao.simular_reservas(
+                       DADOS_BASE['initial_reserves'], DADOS_BASE['burn_rate'], h, e, DADOS_BASE['market_sentiment']),
+                   None)
+
+    for horizonte in HORIZONTES:
+        previstos = simulacao.prever_dolar(historico(30), horizonte)
+        yield (f'ajustar_dolar[horizonte={horizonte}]', horizonte,
+               lambda p=previstos: simulacao.ajustar_dolar(p, 'moderada', DADOS_BASE['market_sentiment']), None)
+
+    for horizonte in HORIZONTES:
+        dados = dados_simulacao(30, horizonte)
+        tendencia, reservas = main.calcular_estrategia('moderada', dados)
+        yield (f'criar_dataset[horizonte={horizonte}]', len(tendencia),
+               lambda t=tendencia, r=reservas: main.criar_dataset(t, r, 'moderada', DADOS_BASE['market_sentiment']),
+               None)
+
+    pdf = os.path.join(diretorio, 'relatorio.pdf')
+    relatorios = [('completo', 10), ('completo', 1_000), ('resumo', 10), ('resumo', 100_000)]
+    if completo:
+        relatorios += [('completo', 10_000), ('resumo', 1_000_000)]
+    for modo, horizonte in relatorios:
+        dados = dados_simulacao(30, horizonte)
+        resultados = main.simular(dados)
+        yield (f'criar_relatorio[{modo},horizonte={horizonte}]', horizonte * len(resultados),
+               lambda r=resultados, d=dados, m=modo: gerar_relatorio.criar_relatorio(
+                   r, pdf, dados_entrada=main.dados_entrada_relatorio(d), modo=m, gerar_imagens=False),
+               None)
+
+    # Vazão do lote em relatórios por segundo (itens = relatórios)
+    dados = dados_simulacao(30, 30)
+    resultados = main.simular(dados)
+    trabalhos = [(resultados, os.path.join(diretorio, f'lote_{i % 4}.pdf'), main.dados_entrada_relatorio(dados))
+                 for i in range(RELATORIOS_LOTE)]
+    yield (f'criar_relatorios_lote[relatorios={RELATORIOS_LOTE},horizonte=30]', RELATORIOS_LOTE,
+           lambda t=trabalhos: gerar_relatorio.criar_relatorios_lote(t, workers=1), None)
+
+    png = os.path.join(diretorio, 'grafico.png')
+    for horizonte in HORIZONTES if completo else HORIZONTES[:-1]:
+        resultados = main.simular(dados_simulacao(30, horizonte))
+        yield (f'plotar_graficos[horizonte={horizonte}]', horizonte * len(resultados),
+               lambda r=resultados: main.plotar_graficos(r, png), None)
+
+def medir(funcao, preparar=None):
+    """Tempos de cada repetição e pico de memória (bytes) de uma execução rastreada"""
+    tempos = []
+    while len(tempos) < MAX_REPETICOES and sum(tempos) < TEMPO_MINIMO:
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    if preparar is not None:
+        preparar()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return tempos, pico
+
+def executar(filtro=None, completo=False):
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for nome, itens, funcao, preparar in casos(completo, diretorio):
+            if filtro and filtro not in nome:
+                continue
+            tempos, pico = medir(funcao, preparar)
+            melhor = min(tempos)
+            resultados[nome] = {
+                'repeticoes': len(tempos),
+                'melhor_s': melhor,
+                'mediana_s': statistics.median(tempos),
+                'itens_por_s': itens / melhor if melhor else None,
+                'memoria_pico_bytes': pico
+            }
+            print(f"{nome:55s} {melhor * 1000:12.3f} ms  {pico / 2**20:10.1f} MiB", file=sys.stderr)
+    return resultados
+
+def ambiente():
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine()
+    }
+
+def comparar(resultados, baseline, limite):
+    """Lista as regressões de tempo ou memória acima do limite relativo"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = baseline.get(nome)
+        if base is None:
+            continue
+        if atual['melhor_s'] > base['melhor_s'] * (1 + limite):
+            regressoes.append(f"{nome}: tempo {base['melhor_s']:.6f}s -> {atual['melhor_s']:.6f}s")
+        memoria_base, memoria = base['memoria_pico_bytes'], atual['memoria_pico_bytes']
+        if memoria > memoria_base * (1 + limite) and memoria - memoria_base > TOLERANCIA_MEMORIA:
+            regressoes.append(f"{nome}: memória {memoria_base} -> {memoria} bytes")
+    return regressoes
+
+def principal(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do simulador")
+    parser.add_argument('--saida', help="Grava os resultados (JSON) neste arquivo, para uso como baseline")
+    parser.add_argument('--comparar', help="Baseline JSON para detecção de regressões")
+    parser.add_argument('--limite', type=float, default=0.25, help="Regressão relativa tolerada (padrão 0.25 = 25%%)")
+    parser.add_argument('--filtro', help="Executa apenas os casos cujo nome contém este texto")
+    parser.add_argument('--completo', action='store_true', help="Inclui os casos mais pesados de relatório e gráfico")
+    args = parser.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    resultados = executar(args.filtro, args.completo)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump({'ambiente': ambiente(), 'resultados': resultados}, arquivo, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            baseline = json.load(arquivo)['resultados']
+        regressoes = comparar(resultados, baseline, args.limite)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}", file=sys.stderr)
+        return 1 if regressoes else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,207 @@
+"""Execução do simulador sem interface gráfica, para uso em lote ou por outros programas.
+
+Exemplos:
+    python cli.py --dollar-values 5.00,5.05,5.10 --initial-reserves 200 --burn-rate 2 --days-to-predict 10
+    python cli.py --entrada cenarios.csv --saida-json resultados.json --pdf relatorio.pdf
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+import main
+from src import armazenamento, configuracoes, estrategias, exportacao, ingestao, instrumentacao, previsores, sensibilidade
+
+CAMPOS = ('dollar_values', 'initial_reserves', 'burn_rate', 'days_to_predict', 'market_sentiment', 'strategy')
+
+def converter_numero(valor):
+    """Converte texto numérico aceitando vírgula decimal"""
+    if isinstance(valor, str):
+        return float(valor.strip().replace(',', '.'))
+    return float(valor)
+
+def normalizar_parametros(bruto):
+    """Converte um dicionário de parâmetros lido de argumentos ou arquivo para os tipos esperados"""
+    faltando = [campo for campo in CAMPOS[:4] if bruto.get(campo) is None or
+                (isinstance(bruto[campo], str) and not bruto[campo].strip())]
+    if faltando:
+        raise ValueError(f"Parâmetros obrigatórios ausentes: {', '.join(faltando)}")
+
+    valores = bruto['dollar_values']
+    extras = {}
+    if isinstance(valores, str) and os.path.isfile(valores.strip()):
+        # Histórico em arquivo (CSV, Parquet ou binário), mapeado em memória
+        extras['arquivo_historico'] = valores.strip()
+        valores = ingestao.carregar_historico(valores.strip())
+    elif isinstance(valores, str):
+        # Em CSV os valores vêm separados por ';' (a vírgula pode ser o separador decimal)
+        separador = ';' if ';' in valores else ','
+        valores = [converter_numero(v) for v in valores.split(separador) if v.strip()]
+    else:
+        valores = [converter_numero(v) for v in valores]
+
+    return {
+        'dollar_values': valores,
+        'initial_reserves': converter_numero(bruto['initial_reserves']),
+        'burn_rate': converter_numero(bruto['burn_rate']),
+        'days_to_predict': int(converter_numero(bruto['days_to_predict'])),
+        'market_sentiment': converter_numero(bruto.get('market_sentiment') or 0.0),
+        'strategy': str(bruto.get('strategy') or 'padrão').lower(),
+        **extras
+    }
+
+def ler_parametros(caminho):
+    """Lê uma lista de execuções de um arquivo JSON (objeto ou lista) ou CSV (uma execução por linha)"""
+    extensao = os.path.splitext(caminho)[1].lower()
+    with open(caminho, encoding='utf-8', newline='') as arquivo:
+        if extensao == '.json':
+            conteudo = json.load(arquivo)
+            linhas = conteudo if isinstance(conteudo, list) else [conteudo]
+        elif extensao == '.csv':
+            linhas = list(csv.DictReader(arquivo))
+        else:
+            raise ValueError(f"Formato de arquivo não suportado: {extensao or caminho}")
+    return [normalizar_parametros(linha) for linha in linhas]
+
+def resultados_para_dict(dados, resultados):
+    """Converte os resultados numéricos de uma execução em estrutura serializável.
+
+    As séries cobrem os dias 0..N previstos; o histórico aparece uma única vez nos
+    parâmetros (como o caminho do arquivo, quando veio de um).
+    """
+    parametros = {campo: valor for campo, valor in dados.items() if campo != 'arquivo_historico'}
+    parametros['dollar_values'] = dados.get('arquivo_historico') or np.asarray(dados['dollar_values']).tolist()
+    return {
+        'parametros': parametros,
+        'estrategias': {
+            estrategia: {
+                'mensagem': resultados.mensagens[estrategia],
+                'dollar_values': resultados.serie(estrategia, 'dolar').tolist(),
+                'reserves': resultados.serie(estrategia, 'reservas').tolist()
+            }
+            for estrategia in resultados
+        }
+    }
+
+def sensibilidades_para_dict(dados):
+    """Derivadas exatas das trajetórias previstas (dias 0..N das reservas, 1..N do dólar) por estratégia"""
+    saida = {}
+    for estrategia in estrategias.nomes_estrategias():
+        calculado = sensibilidade.simular_com_sensibilidade(
+            dados['initial_reserves'], dados['burn_rate'], dados['days_to_predict'],
+            estrategia, dados['market_sentiment'], dados['dollar_values']
+        )
+        saida[estrategia] = {
+            'd_reserves': {parametro: derivada.tolist() for parametro, derivada in calculado['d_reservas'].items()},
+            'd_dollar_forecast': {parametro: derivada.tolist() for parametro, derivada in calculado['d_dolar'].items()}
+        }
+    return saida
+
+def nome_saida(caminho, indice, total):
+    """Numera os arquivos de saída quando há mais de uma execução"""
+    if total == 1:
+        return caminho
+    base, extensao = os.path.splitext(caminho)
+    return f"{base}_{indice + 1}{extensao}"
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Simulador da alta do dólar (modo sem interface)")
+    parser.add_argument('--entrada', help="Arquivo JSON ou CSV com os parâmetros de uma ou mais execuções")
+    parser.add_argument('--dollar-values',
+                        help="Valores históricos do dólar separados por vírgula, ou arquivo CSV/Parquet/binário")
+    parser.add_argument('--initial-reserves', help="Reservas iniciais (bilhões USD)")
+    parser.add_argument('--burn-rate', help="Taxa de queima diária (bilhões USD)")
+    parser.add_argument('--days-to-predict', help="Dias para previsão")
+    parser.add_argument('--market-sentiment', default='0', help="Sentimento de mercado (-1 a 1)")
+    parser.add_argument('--strategy', default='padrão', help="Estratégia destacada no relatório")
+    parser.add_argument('--previsor', help="Modelo de previsão do dólar: linear, janela:60, holt:0.5,0.1, ar:3")
+    parser.add_argument('--saida-json', default='-', help="Arquivo para os resultados numéricos ('-' = saída padrão)")
+    parser.add_argument('--pdf', help="Gera o relatório PDF no caminho informado")
+    parser.add_argument('--resumo', action='store_true',
+                        help="Relatório resumido: tabela amostrada e estatísticas em vez de todos os dias")
+    parser.add_argument('--graficos', help="Gera o gráfico comparativo PNG no caminho informado")
+    parser.add_argument('--sensibilidade', action='store_true',
+                        help="Inclui as derivadas das trajetórias em relação a reservas, queima e sentimento")
+    parser.add_argument('--instrumentacao', help="Grava tempo de parede, CPU e pico de memória por etapa neste JSON")
+    parser.add_argument('--instrumentacao-memoria', action='store_true',
+                        help="Com --instrumentacao, mede também o pico de alocações por etapa (tracemalloc; "
+                             "torna a execução mais lenta)")
+    parser.add_argument('--perfil', help="Grava o perfil cProfile (pstats) da execução neste arquivo")
+    parser.add_argument('--armazenar', metavar='SQLITE',
+                        help="Acrescenta parâmetros e trajetórias de todas as execuções a este armazém SQLite")
+    parser.add_argument('--exportar', metavar='ARQUIVO',
+                        help="Grava as séries de cada execução em Arrow IPC, Parquet ou NPZ (pela extensão)")
+    return parser
+
+def principal(argv=None):
+    args = criar_parser().parse_args(argv)
+    try:
+        if args.entrada:
+            execucoes = ler_parametros(args.entrada)
+        else:
+            execucoes = [normalizar_parametros({campo: getattr(args, campo) for campo in CAMPOS})]
+
+        if args.previsor:
+            previsores.criar_previsor(args.previsor)
+            configuracoes.PREVISOR = args.previsor
+
+        if args.exportar:
+            exportacao.formato(args.exportar)
+
+        if args.pdf or args.graficos:
+            import matplotlib
+            matplotlib.use('Agg')
+
+        if args.instrumentacao:
+            instrumentacao.ativar(memoria=args.instrumentacao_memoria or None)
+
+        saida = []
+        gravar = []
+        with instrumentacao.perfilar(args.perfil):
+            for indice, dados in enumerate(execucoes):
+                with instrumentacao.medir('Simulação', execucao=indice):
+                    resultados = main.simular(dados)
+                if args.pdf:
+                    with instrumentacao.medir('Relatório PDF', execucao=indice):
+                        main.gerar_relatorios(resultados, main.dados_entrada_relatorio(dados),
+                                              nome_saida(args.pdf, indice, len(execucoes)),
+                                              modo='resumo' if args.resumo else 'completo',
+                                              gerar_imagens=False)
+                if args.graficos:
+                    with instrumentacao.medir('Gráficos', execucao=indice):
+                        main.plotar_graficos(resultados, nome_saida(args.graficos, indice, len(execucoes)))
+                if args.exportar:
+                    with instrumentacao.medir('Exportação', execucao=indice):
+                        exportacao.exportar_resultados(resultados, nome_saida(args.exportar, indice, len(execucoes)))
+                saida.append(resultados_para_dict(dados, resultados))
+                if args.sensibilidade:
+                    saida[-1]['sensibilidade'] = sensibilidades_para_dict(dados)
+                if args.armazenar:
+                    gravar.append((main.dados_entrada_relatorio(dados), resultados))
+
+            # Todas as execuções em uma única transação
+            if gravar:
+                with instrumentacao.medir('Armazenamento'):
+                    with armazenamento.ArmazemResultados(args.armazenar) as armazem:
+                        armazem.salvar_lote(gravar)
+
+        if args.instrumentacao:
+            instrumentacao.salvar_json(args.instrumentacao)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+
+    conteudo = json.dumps(saida if args.entrada else saida[0], ensure_ascii=False)
+    if args.saida_json == '-':
+        print(conteudo)
+    else:
+        with open(args.saida_json, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(principal())
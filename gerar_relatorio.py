@@ -3,87 +3,205 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import cm
-import matplotlib.pyplot as plt
-from matplotlib.font_manager import FontProperties
+from collections import OrderedDict
 from datetime import datetime
-import locale
-
-locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-
-# Dicionário com as descrições detalhadas de cada estratégia
-DESCRICOES_ESTRATEGIAS = {
-    'agressiva': [
-        "• Intervenção intensiva com alto gasto de reservas",
-        "• Controle cambial imediato",
-        "• Redução média de reservas: 15-20% em 14 dias",
-        "• Recomendação: Uso em crises agudas"
-    ],
-    'inatividade': [
-        "• Nenhuma intervenção governamental",
-        "• Valorização livre do dólar",
-        "• Reservas mantidas integralmente",
-        "• Recomendação: Contextos estáveis"
-    ],
-    'moderada': [
-        "• Redução gradual de intervenções",
-        "• Equilíbrio entre controle e reservas",
-        "• Redução média de reservas: 8-12% em 14 dias",
-        "• Recomendação: Cenário padrão recomendado"
-    ],
-    'padrão': [
-        "• Política cambial convencional",
-        "• Manutenção de taxas fixas",
-        "• Redução linear de reservas",
-        "• Recomendação: Situações previsíveis"
-    ]
-}
+from copy import copy
+from itertools import chain, islice
+import hashlib
+import os
+import shutil
+import time
+import numpy as np
+from src import cache, configuracoes, estrategias as registro, instrumentacao, paralelo
+from src.utils import escrita_atomica
 
-def formatar_moeda(valor):
-    return locale.currency(valor, grouping=True, symbol=False)
+MESES = ('janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho',
+         'agosto', 'setembro', 'outubro', 'novembro', 'dezembro')
 
-def traduzir_estrategia(estrategia):
-    traducao = {
-        'agressiva': 'Intervenção intensiva com alto gasto de reservas para controle imediato',
-        'moderada': 'Ações graduais buscando equilíbrio entre reservas e controle cambial',
-        'inatividade': 'Nenhuma intervenção governamental no mercado cambial',
-        'padrão': 'Manutenção da política cambial vigente sem alterações'
-    }
-    return traducao.get(estrategia, 'Estratégia não especificada')
+# Tabelas de resultados: blocos de uma página com cabeçalho repetido, evitando
+# que o reportlab divida (em tempo quadrático) uma única tabela gigante
+LINHAS_POR_TABELA = 45
+# Históricos maiores (ex.: carregados de arquivo) aparecem resumidos na tabela de parâmetros
+MAX_COTACOES_LISTADAS = 20
+CABECALHO_RESULTADOS = ['Dia', 'Valor do Dólar (R$)', 'Reservas (Bilhões USD)']
+ESTILO_TABELA_RESULTADOS = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#4F81BD')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('FONTSIZE', (0,0), (-1,-1), 10)
+])
 
-def salvar_estrategia_png(df, estrategia):
-    plt.figure(figsize=(10, 4))
-    ax = plt.gca()
-    ax.axis('off')
-    
-    # Criar a tabela
-    tabela = plt.table(
-        cellText=df.values,
-        colLabels=df.columns,
-        loc='center',
-        cellLoc='center'
+def texto_historico(valores, maximo=MAX_COTACOES_LISTADAS):
+    """Cotações históricas para a tabela de parâmetros, uma por linha ou resumidas"""
+    def moeda(valor):
+        return f'R$ {valor:.2f}'.replace('.', ',')
+    if len(valores) <= maximo:
+        return '\n'.join(moeda(valor) for valor in valores)
+    valores = np.asarray(valores)
+    return (f"{len(valores):,} cotações".replace(',', '.') +
+            f"\nprimeira: {moeda(valores[0])}\núltima: {moeda(valores[-1])}"
+            f"\nmínima: {moeda(valores.min())}\nmáxima: {moeda(valores.max())}")
+
+def formatar_coluna(valores):
+    """Formata uma coluna inteira no padrão brasileiro (1.234,56) sem consultar o locale por célula"""
+    troca = str.maketrans(',.', '.,')
+    return [f"{valor:,.2f}".translate(troca) for valor in np.asarray(valores, dtype=float).tolist()]
+
+def tabelas_resultados(df, linhas_por_tabela=LINHAS_POR_TABELA):
+    """Gera a tabela de resultados em blocos de até linhas_por_tabela linhas"""
+    dias = [str(dia) for dia in np.asarray(df['Day'], dtype=int).tolist()]
+    dolar = formatar_coluna(df['Dollar Value (R$)'])
+    reservas = formatar_coluna(df['Reserves (Billion USD)'])
+    for inicio in range(0, len(dias), linhas_por_tabela):
+        fim = inicio + linhas_por_tabela
+        linhas = [CABECALHO_RESULTADOS] + [list(linha) for linha in zip(dias[inicio:fim], dolar[inicio:fim], reservas[inicio:fim])]
+        tabela = Table(linhas, colWidths=[2*cm, 4*cm, 4*cm], repeatRows=1)
+        tabela.setStyle(ESTILO_TABELA_RESULTADOS)
+        yield tabela
+
+def amostrar_resultados(df, max_linhas=LINHAS_POR_TABELA):
+    """Reduz o DataFrame a no máximo max_linhas dias igualmente espaçados, mantendo o primeiro e o último"""
+    if len(df) <= max_linhas:
+        return df
+    indices = np.unique(np.linspace(0, len(df) - 1, max_linhas).round().astype(int))
+    return df.iloc[indices]
+
+def resumo_estatistico(df):
+    """Texto com as principais estatísticas de uma estratégia para o relatório resumido"""
+    dolar = np.asarray(df['Dollar Value (R$)'], dtype=float)
+    reservas = np.asarray(df['Reserves (Billion USD)'], dtype=float)
+    dias = np.asarray(df['Day'], dtype=int)
+    esgotadas = np.flatnonzero(reservas <= 0)
+    esgotamento = (f"esgotadas no dia {dias[esgotadas[0]]}" if esgotadas.size
+                   else "não esgotadas no período")
+    return (
+        f"<b>Dólar:</b> mínimo R$ {formatar_coluna([dolar.min()])[0]}, "
+        f"máximo R$ {formatar_coluna([dolar.max()])[0]}, final R$ {formatar_coluna([dolar[-1]])[0]}<br/>"
+        f"<b>Reservas:</b> final US$ {formatar_coluna([reservas[-1]])[0]} bilhões, {esgotamento}<br/>"
+        f"<b>Dias simulados:</b> {len(df)}"
     )
+
+class _ElementosSobDemanda(list):
+    """Lista de elementos abastecida por um iterador à medida que doc.build consome as páginas"""
+
+    def __init__(self, iteravel, reserva=4):
+        super().__init__()
+        self._fonte = iter(iteravel)
+        self._reserva = reserva
+
+    def _abastecer(self):
+        while list.__len__(self) < self._reserva:
+            try:
+                self.append(next(self._fonte))
+            except StopIteration:
+                break
+
+    def __len__(self):
+        self._abastecer()
+        return list.__len__(self)
+
+    def __getitem__(self, indice):
+        self._abastecer()
+        return list.__getitem__(self, indice)
+
+def descrever_estrategia(estrategia):
+    """Tópicos descritivos da estratégia, vindos do registro de estratégias"""
+    if estrategia not in registro.nomes_estrategias():
+        return []
+    return registro.obter_estrategia(estrategia).descricao
+
+def traduzir_estrategia(estrategia):
+    if estrategia not in registro.nomes_estrategias():
+        return 'Estratégia não especificada'
+    return registro.obter_estrategia(estrategia).traducao or 'Estratégia não especificada'
+
+# Imagens das tabelas por estratégia: horizontes longos são amostrados e o
+# resultado é reaproveitado do cache quando conteúdo e estilo não mudaram
+MAX_LINHAS_PNG = 60
+ESTILO_PNG = {'figsize': (10, 4), 'dpi': 300, 'fontsize': 10}
+
+_figura_png = None
+
+def _obter_figura_png():
+    """Reutiliza uma única figura com canvas Agg em vez de criar uma por imagem"""
+    global _figura_png
+    if _figura_png is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        _figura_png = Figure(figsize=ESTILO_PNG['figsize'])
+        FigureCanvasAgg(_figura_png)
+    else:
+        _figura_png.clf()
+    return _figura_png
+
+def chave_png(df):
+    """Hash do conteúdo do DataFrame e do estilo de renderização"""
+    h = hashlib.sha256()
+    h.update(repr((list(df.columns), sorted(ESTILO_PNG.items()))).encode())
+    h.update(np.ascontiguousarray(df.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+def salvar_estrategia_png(df, estrategia, max_linhas=MAX_LINHAS_PNG):
+    df = amostrar_resultados(df, max_linhas)
+    destino = f'estrategia_{estrategia}.png'
+    diretorio = os.path.join(configuracoes.DIRETORIO_CACHE, 'png')
+    em_cache = os.path.join(diretorio, f'{chave_png(df)}.png')
     
-    # Definir o tamanho da fonte para todas as células
-    tabela.auto_set_font_size(False)
-    tabela.set_fontsize(10)  # Define o tamanho da fonte globalmente
-    
-    # Ajustar as propriedades de cada célula individualmente, se necessário
-    for key, cell in tabela.get_celld().items():
-        cell.set_fontsize(10)  # Define o tamanho da fonte para cada célula
-    
-    # Salvar a figura
-    plt.savefig(f'estrategia_{estrategia}.png', bbox_inches='tight', dpi=300)
-    plt.close()
-
-def criar_relatorio(resultados, nome_arquivo, cidade="Ponta Grossa", estado="PR", dados_entrada=None):
-    doc = SimpleDocTemplate(nome_arquivo, pagesize=A4,
-                            leftMargin=2*cm, rightMargin=2*cm,
-                            topMargin=2*cm, bottomMargin=2*cm)
+    if not cache.marcar_uso(em_cache):
+        fig = _obter_figura_png()
+        ax = fig.add_subplot()
+        ax.axis('off')
+        
+        # Criar a tabela, com o tamanho da fonte definido de uma vez para todas as células
+        tabela = ax.table(
+            cellText=df.values,
+            colLabels=df.columns,
+            loc='center',
+            cellLoc='center'
+        )
+        tabela.auto_set_font_size(False)
+        tabela.set_fontsize(ESTILO_PNG['fontsize'])
+        
+        # Salvar no cache (arquivo temporário + rename, seguro entre processos)
+        os.makedirs(diretorio, exist_ok=True)
+        with escrita_atomica(em_cache) as temporario, instrumentacao.medir('savefig', estrategia=estrategia):
+            fig.savefig(temporario, format='png', bbox_inches='tight', dpi=ESTILO_PNG['dpi'])
+        cache.remover_excedente(manter=(em_cache,))
     
-    elementos = []
+    with escrita_atomica(destino) as temporario:
+        shutil.copyfile(em_cache, temporario)
+    return destino
+
+def _salvar_estrategia_png(item):
+    salvar_estrategia_png(*item)
+
+def itens_estrategias_png(resultados):
+    """Argumentos de salvar_estrategia_png para cada estratégia"""
+    return [
+        (df[['Day', 'Dollar Value (R$)', 'Reserves (Billion USD)']], estrategia)
+        for estrategia, (df, _) in resultados.items()
+    ]
+
+def salvar_estrategias_png(resultados, workers=None):
+    """Gera as imagens das tabelas de todas as estratégias, em paralelo quando configurado"""
+    paralelo.mapear(_salvar_estrategia_png, itens_estrategias_png(resultados), workers)
+
+def criar_relatorio(resultados, nome_arquivo, cidade="Ponta Grossa", estado="PR", dados_entrada=None, workers=None,
+                    modo='completo', linhas_por_tabela=LINHAS_POR_TABELA, gerar_imagens=True):
+    """Gera o relatório PDF. modo='resumo' troca as tabelas diárias por uma amostra e estatísticas.
+
+    gerar_imagens=False deixa as imagens das tabelas para quem chama (ex.: o pipeline de saídas).
+    """
+    modelo_relatorio(cidade, estado).criar(resultados, nome_arquivo, dados_entrada, modo, linhas_por_tabela)
+    if gerar_imagens:
+        salvar_estrategias_png(resultados, workers)
+
+def criar_estilos():
+    """Folha de estilos do relatório: a base do reportlab e os estilos personalizados"""
     estilos = getSampleStyleSheet()
     
-    # Estilos personalizados
     estilos.add(ParagraphStyle(
         name='Cabecalho',
         fontSize=10,
@@ -124,43 +242,6 @@ def criar_relatorio(resultados, nome_arquivo, cidade="Ponta Grossa", estado="PR"
         spaceAfter=20
     ))
 
-    # Cabeçalho com local e data
-    data = datetime.now().strftime("%d de %B de %Y")
-    elementos.append(Paragraph(f"{cidade}/{estado}, {data}", estilos['Cabecalho']))
-    elementos.append(Spacer(1, 1*cm))
-
-    # Endereçamento
-    enderecamento = Table([
-        ["DE: Analista Financeiro Chefe", "PARA: Administrador Financeiro"],
-        ["Departamento de Análise Econômica", "Diretoria Executiva"],
-        ["Banco Central do Brasil", "Comitê de Política Monetária"]
-    ], colWidths=[8*cm, 8*cm])
-    
-    enderecamento.setStyle(TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 12),
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 10),
-    ]))
-    
-    elementos.append(enderecamento)
-    elementos.append(Spacer(1, 1.5*cm))
-
-    # Saudação
-    elementos.append(Paragraph("Prezado Sr. Administrador,", estilos['Saudacao']))
-
-    # Introdução
-    intro = """
-    <para>
-    Conforme solicitado, apresento o relatório completo da simulação cambial realizada 
-    para avaliar o impacto de diferentes estratégias de intervenção no mercado financeiro. 
-    O estudo contempla projeções para os próximos dias e análise detalhada das reservas cambiais.
-    </para>
-    """
-    
-    elementos.append(Paragraph(intro, estilos['Corpo']))
-    elementos.append(Spacer(1, 1*cm))
-
     # Estilo para descrições
     estilos.add(ParagraphStyle(
         name='Descricao',
@@ -170,104 +251,17 @@ def criar_relatorio(resultados, nome_arquivo, cidade="Ponta Grossa", estado="PR"
         spaceBefore=6,
         spaceAfter=6
     ))
-    
-    # Seção de Parâmetros
-    elementos.append(Paragraph("<b>PARÂMETROS DA SIMULAÇÃO</b>", estilos['Heading2']))
-    elementos.append(Spacer(1, 0.5*cm))
-
-    if dados_entrada:
-        # Tabela de Entradas
-        # Modificar as descrições para usar Paragraph
-        entradas = [
-            ['Parâmetro', 'Valor', 'Descrição'],
-            [
-                'Valores Históricos do Dólar', 
-                '\n'.join([f'R$ {valor:.2f}'.replace('.', ',') for valor in dados_entrada['dollar_values']]), 
-                Paragraph('Cotações diárias do dólar dos últimos dias utilizadas como base para a projeção', estilos['Descricao'])
-            ],
-            [
-                'Reservas Iniciais', 
-                f"US$ {dados_entrada['initial_reserves']:,.2f} bilhões".replace('.', ','), 
-                Paragraph('Quantidade inicial de reservas cambiais disponíveis para intervenção no mercado', estilos['Descricao'])
-            ],
-            [
-                'Taxa de Queima Diária', 
-                f"US$ {dados_entrada['burn_rate']:,.2f} bilhões/dia".replace('.', ','), 
-                Paragraph('Volume médio de reservas utilizado diariamente para conter a valorização do dólar', estilos['Descricao'])
-            ],
-            [
-                'Dias para Previsão', 
-                str(dados_entrada['days_to_predict']), 
-                Paragraph('Período futuro analisado pela simulação em dias corridos', estilos['Descricao'])
-            ],
-            [
-                'Sentimento de Mercado', 
-                f"{dados_entrada['market_sentiment']:.2f}".replace('.', ','), 
-                Paragraph('Índice que influencia a eficácia das intervenções:<br/>'
-                        '-1 = Pessimismo extremo<br/>'
-                        '0 = Neutralidade<br/>'
-                        '+1 = Otimismo elevado', estilos['Descricao'])
-            ],
-            [
-                'Estratégia Adotada', 
-                dados_entrada['strategy'].capitalize(), 
-                Paragraph(traduzir_estrategia(dados_entrada['strategy']), estilos['Descricao'])
-            ]
-        ]
-
-        tabela_entradas = Table(entradas, colWidths=[4*cm, 4*cm, 8*cm])
-        tabela_entradas.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#4F81BD')),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-            ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('GRID', (0,0), (-1,-1), 1, colors.black),
-            ('FONTSIZE', (0,0), (-1,-1), 9),
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('LEFTPADDING', (2,1), (2,-1), 8),  # Espaço à esquerda na coluna descrição
-            ('RIGHTPADDING', (2,1), (2,-1), 8), # Espaço à direita na coluna descrição
-        ]))
-        
-        elementos.append(tabela_entradas)
-        elementos.append(Spacer(1, 1*cm))
+    return estilos
 
-    # Resultados por Estratégia
-    for estrategia, (df, _) in resultados.items():
-        # Título da estratégia
-        elementos.append(Paragraph(f"<b>Estratégia: {estrategia.capitalize()}</b>", estilos['Heading2']))
-        
-        # Tabela de resultados
-        dados_tabela = [['Dia', 'Valor do Dólar (R$)', 'Reservas (Bilhões USD)']]
-        for _, linha in df.iterrows():
-            dados_tabela.append([
-                str(int(linha['Day'])),
-                formatar_moeda(linha['Dollar Value (R$)']),
-                locale.format_string('%.2f', linha['Reserves (Billion USD)'], grouping=True)
-            ])
-        
-        tabela = Table(dados_tabela, colWidths=[2*cm, 4*cm, 4*cm])
-        tabela.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#4F81BD')),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('GRID', (0,0), (-1,-1), 1, colors.black),
-            ('FONTSIZE', (0,0), (-1,-1), 10)
-        ]))
-        
-        elementos.append(tabela)
-        elementos.append(Spacer(1, 0.5*cm))
-        
-        # Descrição detalhada da estratégia
-        descricao = DESCRICOES_ESTRATEGIAS.get(estrategia, [])
-        for item in descricao:
-            elementos.append(Paragraph(item, estilos['DetalhesEstrategia']))
-        
-        elementos.append(Spacer(1, 1*cm))
-        salvar_estrategia_png(df[['Day', 'Dollar Value (R$)', 'Reserves (Billion USD)']], estrategia)
+INTRODUCAO = """
+    <para>
+    Conforme solicitado, apresento o relatório completo da simulação cambial realizada 
+    para avaliar o impacto de diferentes estratégias de intervenção no mercado financeiro. 
+    O estudo contempla projeções para os próximos dias e análise detalhada das reservas cambiais.
+    </para>
+    """
 
-    # Conclusão
-    conclusao = """
+CONCLUSAO = """
     <para>
     <b>PARECER FINAL:</b><br/><br/>
     A análise comparativa demonstra que a estratégia <b>agressiva</b> apresentou maior eficácia 
@@ -276,13 +270,206 @@ def criar_relatorio(resultados, nome_arquivo, cidade="Ponta Grossa", estado="PR"
     monitoramento diário do sentimento de mercado para ajustes dinâmicos na política cambial.
     </para>
     """
-    
-    elementos.append(Paragraph(conclusao, estilos['Conclusao']))
 
-    # Assinatura
-    elementos.append(Spacer(1, 2*cm))
-    elementos.append(Paragraph("Atenciosamente,", estilos['BodyText']))
-    elementos.append(Paragraph("<b>João da Silva</b>", estilos['BodyText']))
-    elementos.append(Paragraph("Analista Financeiro Sênior", estilos['BodyText']))
+# Descrições da tabela de parâmetros (a da estratégia adotada vem do registro)
+DESCRICOES_PARAMETROS = {
+    'dollar_values': 'Cotações diárias do dólar dos últimos dias utilizadas como base para a projeção',
+    'initial_reserves': 'Quantidade inicial de reservas cambiais disponíveis para intervenção no mercado',
+    'burn_rate': 'Volume médio de reservas utilizado diariamente para conter a valorização do dólar',
+    'days_to_predict': 'Período futuro analisado pela simulação em dias corridos',
+    'market_sentiment': ('Índice que influencia a eficácia das intervenções:<br/>'
+                         '-1 = Pessimismo extremo<br/>'
+                         '0 = Neutralidade<br/>'
+                         '+1 = Otimismo elevado')
+}
+
+ESTILO_TABELA_ENTRADAS = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#4F81BD')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('LEFTPADDING', (2,1), (2,-1), 8),  # Espaço à esquerda na coluna descrição
+    ('RIGHTPADDING', (2,1), (2,-1), 8), # Espaço à direita na coluna descrição
+])
 
-    doc.build(elementos)
\ No newline at end of file
+# Parágrafos analisados mantidos por modelo (LRU): a chave inclui textos datados, como o
+# cabeçalho, que mudam ao longo de um lote longo
+LIMITE_PARAGRAFOS = 256
+
+class ModeloRelatorio:
+    """Partes fixas do relatório, preparadas uma vez e reaproveitadas em cada PDF.
+
+    Estilos, endereçamento e parágrafos de texto fixo (introdução, conclusão, assinatura,
+    descrições de parâmetros e estratégias) são analisados uma única vez; cada relatório
+    recebe cópias rasas deles e só monta a tabela de parâmetros e as tabelas de resultados.
+    """
+
+    def __init__(self, cidade="Ponta Grossa", estado="PR"):
+        self.cidade = cidade
+        self.estado = estado
+        self.estilos = criar_estilos()
+        self._paragrafos = OrderedDict()
+
+        # Endereçamento
+        self._enderecamento = Table([
+            ["DE: Analista Financeiro Chefe", "PARA: Administrador Financeiro"],
+            ["Departamento de Análise Econômica", "Diretoria Executiva"],
+            ["Banco Central do Brasil", "Comitê de Política Monetária"]
+        ], colWidths=[8*cm, 8*cm])
+        self._enderecamento.setStyle(TableStyle([
+            ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,-1), 12),
+            ('VALIGN', (0,0), (-1,-1), 'TOP'),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 10),
+        ]))
+
+    def paragrafo(self, texto, estilo):
+        """Cópia de um parágrafo de texto fixo, analisado só na primeira vez"""
+        chave = (texto, estilo)
+        if chave in self._paragrafos:
+            self._paragrafos.move_to_end(chave)
+        else:
+            self._paragrafos[chave] = Paragraph(texto, self.estilos[estilo])
+            if len(self._paragrafos) > LIMITE_PARAGRAFOS:
+                self._paragrafos.popitem(last=False)
+        return copy(self._paragrafos[chave])
+
+    def elementos_iniciais(self, dados_entrada=None):
+        """Cabeçalho, endereçamento, introdução e tabela de parâmetros"""
+        # Cabeçalho com local e data
+        hoje = datetime.now()
+        data = f"{hoje.day:02d} de {MESES[hoje.month - 1]} de {hoje.year}"
+        elementos = [
+            self.paragrafo(f"{self.cidade}/{self.estado}, {data}", 'Cabecalho'),
+            Spacer(1, 1*cm),
+            copy(self._enderecamento),
+            Spacer(1, 1.5*cm),
+            self.paragrafo("Prezado Sr. Administrador,", 'Saudacao'),
+            self.paragrafo(INTRODUCAO, 'Corpo'),
+            Spacer(1, 1*cm),
+            # Seção de Parâmetros
+            self.paragrafo("<b>PARÂMETROS DA SIMULAÇÃO</b>", 'Heading2'),
+            Spacer(1, 0.5*cm)
+        ]
+
+        if dados_entrada:
+            def descricao(campo):
+                return self.paragrafo(DESCRICOES_PARAMETROS[campo], 'Descricao')
+
+            entradas = [
+                ['Parâmetro', 'Valor', 'Descrição'],
+                ['Valores Históricos do Dólar', texto_historico(dados_entrada['dollar_values']),
+                 descricao('dollar_values')],
+                ['Reservas Iniciais', f"US$ {dados_entrada['initial_reserves']:,.2f} bilhões".replace('.', ','),
+                 descricao('initial_reserves')],
+                ['Taxa de Queima Diária', f"US$ {dados_entrada['burn_rate']:,.2f} bilhões/dia".replace('.', ','),
+                 descricao('burn_rate')],
+                ['Dias para Previsão', str(dados_entrada['days_to_predict']), descricao('days_to_predict')],
+                ['Sentimento de Mercado', f"{dados_entrada['market_sentiment']:.2f}".replace('.', ','),
+                 descricao('market_sentiment')],
+                ['Estratégia Adotada', dados_entrada['strategy'].capitalize(),
+                 self.paragrafo(traduzir_estrategia(dados_entrada['strategy']), 'Descricao')]
+            ]
+            tabela_entradas = Table(entradas, colWidths=[4*cm, 4*cm, 8*cm])
+            tabela_entradas.setStyle(ESTILO_TABELA_ENTRADAS)
+            elementos.append(tabela_entradas)
+            elementos.append(Spacer(1, 1*cm))
+        return elementos
+
+    def secoes_estrategias(self, resultados, modo, linhas_por_tabela):
+        """Resultados por estratégia, gerados sob demanda durante a montagem das páginas"""
+        for estrategia, (df, _) in resultados.items():
+            # Título da estratégia
+            yield self.paragrafo(f"<b>Estratégia: {estrategia.capitalize()}</b>", 'Heading2')
+            
+            # Tabela de resultados (completa em blocos ou amostrada com estatísticas)
+            if modo == 'resumo':
+                yield Paragraph(resumo_estatistico(df), self.estilos['DetalhesEstrategia'])
+                yield from tabelas_resultados(amostrar_resultados(df, linhas_por_tabela), linhas_por_tabela)
+            else:
+                yield from tabelas_resultados(df, linhas_por_tabela)
+            yield Spacer(1, 0.5*cm)
+            
+            # Descrição detalhada da estratégia
+            for item in descrever_estrategia(estrategia):
+                yield self.paragrafo(item, 'DetalhesEstrategia')
+            
+            yield Spacer(1, 1*cm)
+
+    def elementos_finais(self):
+        """Conclusão e assinatura"""
+        return [
+            self.paragrafo(CONCLUSAO, 'Conclusao'),
+            Spacer(1, 2*cm),
+            self.paragrafo("Atenciosamente,", 'BodyText'),
+            self.paragrafo("<b>João da Silva</b>", 'BodyText'),
+            self.paragrafo("Analista Financeiro Sênior", 'BodyText')
+        ]
+
+    def montar(self, resultados, nome_arquivo, dados_entrada=None, modo='completo',
+               linhas_por_tabela=LINHAS_POR_TABELA):
+        """Monta o PDF diretamente em nome_arquivo"""
+        doc = SimpleDocTemplate(nome_arquivo, pagesize=A4,
+                                leftMargin=2*cm, rightMargin=2*cm,
+                                topMargin=2*cm, bottomMargin=2*cm)
+        elementos = chain(self.elementos_iniciais(dados_entrada),
+                          self.secoes_estrategias(resultados, modo, linhas_por_tabela),
+                          self.elementos_finais())
+        with instrumentacao.medir('doc.build', modo=modo):
+            doc.build(_ElementosSobDemanda(elementos))
+
+    def criar(self, resultados, nome_arquivo, dados_entrada=None, modo='completo',
+              linhas_por_tabela=LINHAS_POR_TABELA):
+        """Gera o PDF com escrita atômica"""
+        if modo not in ('completo', 'resumo'):
+            raise ValueError(f"Modo de relatório inválido: {modo}")
+        with escrita_atomica(nome_arquivo) as temporario:
+            self.montar(resultados, temporario, dados_entrada, modo, linhas_por_tabela)
+
+# Um modelo por local, por processo (os workers do lote preparam o seu uma única vez)
+_MODELOS = {}
+
+def modelo_relatorio(cidade="Ponta Grossa", estado="PR"):
+    chave = (cidade, estado)
+    if chave not in _MODELOS:
+        _MODELOS[chave] = ModeloRelatorio(cidade, estado)
+    return _MODELOS[chave]
+
+# Relatórios por bloco do lote: limita a memória dos resultados enviados aos processos
+RELATORIOS_POR_BLOCO = 256
+
+def _criar_relatorio_lote(item):
+    resultados, nome_arquivo, dados_entrada, cidade, estado, modo, linhas_por_tabela = item
+    modelo_relatorio(cidade, estado).criar(resultados, nome_arquivo, dados_entrada, modo, linhas_por_tabela)
+    return nome_arquivo
+
+def criar_relatorios_lote(trabalhos, cidade="Ponta Grossa", estado="PR", modo='completo',
+                          linhas_por_tabela=LINHAS_POR_TABELA, workers=None):
+    """Gera muitos PDFs no mesmo processo (ou pool), reaproveitando o modelo do relatório.
+
+    trabalhos: iterável de (resultados, nome_arquivo, dados_entrada), consumido em blocos.
+    Um único pool atende o lote inteiro, de modo que cada processo prepara o modelo uma vez.
+    Retorna {'relatorios', 'segundos', 'relatorios_por_segundo'}.
+    """
+    workers = configuracoes.WORKERS if workers is None else workers
+    inicio = time.perf_counter()
+    total = 0
+    trabalhos = iter(trabalhos)
+    with instrumentacao.medir('criar_relatorios_lote', modo=modo), paralelo.pool(workers) as executor:
+        while True:
+            bloco = [(resultados, nome_arquivo, dados_entrada, cidade, estado, modo, linhas_por_tabela)
+                     for resultados, nome_arquivo, dados_entrada in islice(trabalhos, RELATORIOS_POR_BLOCO)]
+            if not bloco:
+                break
+            paralelo.mapear(_criar_relatorio_lote, bloco, workers,
+                            chunksize=max(1, len(bloco) // (4 * max(workers, 1))), executor=executor)
+            total += len(bloco)
+    segundos = time.perf_counter() - inicio
+    return {
+        'relatorios': total,
+        'segundos': segundos,
+        'relatorios_por_segundo': total / segundos if segundos > 0 else 0.0
+    }
@@ -1,35 +1,141 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from src import simulacao, interface_grafica
-import gerar_relatorio
+import os
+from functools import partial
+
+import numpy as np
+from src import (simulacao, estrategias as registro, paralelo, cache, configuracoes, instrumentacao, decimacao,
+                 armazenamento, exportacao)
+from src.resultados import ResultadosSimulacao
+
+# Tkinter, pandas, matplotlib e reportlab são importados apenas quando usados,
+# para que o modo sem interface (linha de comando / lote) inicie rapidamente.
+
+# Gráficos: pontos desenhados por série e limite para exibir marcadores
+MAX_PONTOS_GRAFICO = 2000
+LIMITE_MARCADORES = 200
+
+ETAPAS = ('Previsão do dólar', 'Simulação das reservas', 'Relatório PDF e gráficos')
+
+class SimulacaoCancelada(Exception):
+    """Execução interrompida a pedido do usuário"""
 
 def executar_simulacao(**dados):
     """Controla o fluxo principal da simulação para todas as estratégias"""
-    resultados = {}
-    
     try:
-        validar_dados_entrada(dados)
-        
-        # Simular todas as estratégias
-        for estrategia in ['moderada', 'agressiva', 'inatividade', 'padrão']:
-            df, mensagem = processar_estrategia(estrategia, dados)
-            resultados[estrategia] = (df, mensagem)
-            
-        # Capturar dados de entrada para o relatório
-        dados_entrada_relatorio = {
-            'dollar_values': dados['dollar_values'],
-            'initial_reserves': dados['initial_reserves'],
-            'burn_rate': dados['burn_rate'],
-            'days_to_predict': dados['days_to_predict'],
-            'market_sentiment': dados['market_sentiment'],
-            'strategy': dados.get('strategy', 'padrão')
-        }
-        
-        gerar_saidas(resultados, dados_entrada_relatorio)  # Passa os dados
+        executar_etapas(dados)
         
     except Exception as e:
+        from src import interface_grafica
         interface_grafica.mostrar_erro_direto(f"Falha na simulação: {str(e)}")
 
+def executar_etapas(dados, progresso=None, cancelamento=None):
+    """Executa a simulação completa, avisando progresso(texto) a cada etapa.
+    
+    Se cancelamento (threading.Event) for acionado, a execução para antes da
+    etapa seguinte com SimulacaoCancelada. Com a instrumentação ligada, os tempos
+    desta execução são gravados em configuracoes.ARQUIVO_INSTRUMENTACAO; com SIMULADOR_PERFIL,
+    o perfil cProfile da execução é gravado nesse arquivo.
+    """
+    # Na interface o processo atende várias execuções: cada JSON traz só a atual
+    instrumentacao.limpar()
+    with instrumentacao.perfilar(configuracoes.ARQUIVO_PERFIL):
+        try:
+            _executar_etapas(dados, progresso, cancelamento)
+        finally:
+            if instrumentacao.ativa():
+                instrumentacao.salvar_json(configuracoes.ARQUIVO_INSTRUMENTACAO)
+
+def _executar_etapas(dados, progresso, cancelamento):
+    def iniciar_etapa(indice):
+        if cancelamento is not None and cancelamento.is_set():
+            raise SimulacaoCancelada("Simulação cancelada pelo usuário")
+        if progresso is not None:
+            progresso(f"Etapa {indice + 1}/{len(ETAPAS)}: {ETAPAS[indice]}...")
+    
+    validar_dados_entrada(dados)
+    dados_entrada = dados_entrada_relatorio(dados)
+    
+    # Execuções idênticas reaproveitam resultados e arquivos já gerados
+    if configuracoes.CACHE_EXECUCOES:
+        chave = cache.chave_execucao(dados_entrada, registro.nomes_estrategias())
+        resultados = cache.carregar(chave)
+        if resultados is not None:
+            cache.restaurar_artefatos(chave)
+            armazenar(dados_entrada, resultados)
+            exportar(resultados)
+            return
+    
+    iniciar_etapa(0)
+    with instrumentacao.medir(ETAPAS[0]):
+        valores_previstos = simulacao.prever_dolar(dados['dollar_values'], dados['days_to_predict'])
+    iniciar_etapa(1)
+    with instrumentacao.medir(ETAPAS[1]):
+        resultados = simular(dados, valores_previstos=valores_previstos)
+    armazenar(dados_entrada, resultados)
+    iniciar_etapa(2)
+    with instrumentacao.medir(ETAPAS[2]):
+        gerar_saidas(resultados, dados_entrada, progresso=progresso, cancelamento=cancelamento,
+                     chave_cache=chave if configuracoes.CACHE_EXECUCOES else None)
+
+def armazenar(dados_entrada, resultados):
+    """Acrescenta a execução ao armazém de resultados, se habilitado"""
+    if not configuracoes.ARMAZENAR_RESULTADOS:
+        return
+    with instrumentacao.medir('armazenamento'):
+        with armazenamento.ArmazemResultados() as armazem:
+            armazem.salvar(dados_entrada, resultados)
+
+def exportar(resultados, caminho=None):
+    """Grava as séries numéricas em Arrow/Parquet/NPZ (configuracoes.ARQUIVO_EXPORTACAO), se habilitado"""
+    caminho = configuracoes.ARQUIVO_EXPORTACAO if caminho is None else caminho
+    if caminho:
+        exportacao.exportar_resultados(resultados, caminho)
+
+def simular(dados, dtype=np.float64, valores_previstos=None):
+    """Executa o núcleo numérico para todas as estratégias, sem gerar arquivos"""
+    validar_dados_entrada(dados)
+    
+    # Previsão única compartilhada por todas as estratégias
+    if valores_previstos is None:
+        with instrumentacao.medir('prever_dolar'):
+            valores_previstos = simulacao.prever_dolar(
+                dados['dollar_values'],
+                dados['days_to_predict']
+            )
+    
+    # Simular todas as estratégias (em paralelo quando configurado; ordem preservada)
+    estrategias = list(registro.nomes_estrategias())
+    funcao = partial(calcular_estrategia, dados=dados, valores_previstos=valores_previstos)
+    if instrumentacao.ativa():
+        # Medições feitas nos processos filhos voltam junto com os resultados
+        saidas = []
+        for saida, novos in paralelo.mapear(instrumentacao.medido(funcao), estrategias):
+            saidas.append(saida)
+            instrumentacao.incorporar(novos)
+    else:
+        saidas = paralelo.mapear(funcao, estrategias)
+    
+    # Todas as estratégias em matrizes contíguas (só a janela prevista; o histórico
+    # fica como referência única); DataFrames só sob demanda
+    resultados = ResultadosSimulacao.vazio(
+        estrategias, dados['days_to_predict'] + 1, dtype, historico=dados['dollar_values']
+    )
+    for estrategia, (tendencia, reservas) in zip(estrategias, saidas):
+        with instrumentacao.medir('criar_dataset', estrategia=estrategia):
+            mensagem = mensagem_estrategia(tendencia, estrategia, dados['market_sentiment'])
+            resultados.preencher(estrategia, tendencia, reservas, mensagem)
+    return resultados
+
+def dados_entrada_relatorio(dados):
+    """Captura os dados de entrada para o relatório"""
+    return {
+        'dollar_values': dados['dollar_values'],
+        'initial_reserves': dados['initial_reserves'],
+        'burn_rate': dados['burn_rate'],
+        'days_to_predict': dados['days_to_predict'],
+        'market_sentiment': dados['market_sentiment'],
+        'strategy': dados.get('strategy', 'padrão')
+    }
+
 def validar_dados_entrada(dados):
     """Valida os dados de entrada antes da execução"""
     if len(dados['dollar_values']) < 2:
@@ -37,90 +143,175 @@ def validar_dados_entrada(dados):
     if dados['days_to_predict'] <= 0:
         raise ValueError("O número de dias para previsão deve ser positivo")
 
-def processar_estrategia(estrategia, dados):
+def processar_estrategia(estrategia, dados, valores_previstos=None):
     """Processa uma estratégia individual desde previsão até geração de resultados"""
-    # Previsão de valores futuros
-    valores_previstos = simulacao.prever_dolar(
-        dados['dollar_values'],
-        dados['days_to_predict']
-    )
+    tendencia, reservas = calcular_estrategia(estrategia, dados, valores_previstos)
+    return criar_dataset(tendencia, reservas, estrategia, dados['market_sentiment'])
+
+def calcular_estrategia(estrategia, dados, valores_previstos=None):
+    """Calcula as séries do dólar e das reservas de uma estratégia nos dias 0..N, como ndarrays.
+
+    O dia 0 traz a última cotação observada; o histórico não é copiado para a série.
+    """
+    # Previsão de valores futuros (reaproveitada quando já calculada para a execução)
+    if valores_previstos is None:
+        valores_previstos = simulacao.prever_dolar(
+            dados['dollar_values'],
+            dados['days_to_predict']
+        )
     
     # Ajuste de valores com estratégia e sentimento
-    valores_ajustados = simulacao.ajustar_dolar(
-        valores_previstos,
-        estrategia,
-        dados['market_sentiment']
-    )
+    with instrumentacao.medir('ajustar_dolar', estrategia=estrategia):
+        valores_ajustados = simulacao.ajustar_dolar_vetorizado(
+            valores_previstos,
+            estrategia,
+            dados['market_sentiment']
+        )
     
-    # Combinação de dados históricos + previstos
-    tendencia_completa = dados['dollar_values'] + valores_ajustados
+    # Última cotação observada (dia 0) + previstos
+    tendencia_completa = np.concatenate(([float(dados['dollar_values'][-1])], valores_ajustados))
     
     # Simulação das reservas
-    reservas = simulacao.simular_reservas(
-        dados['initial_reserves'],
-        dados['burn_rate'],
-        dados['days_to_predict'],
-        estrategia,
-        dados['market_sentiment']
-    )
+    with instrumentacao.medir('simular_reservas', estrategia=estrategia):
+        reservas = simulacao.simular_reservas_vetorizado(
+            dados['initial_reserves'],
+            dados['burn_rate'],
+            dados['days_to_predict'],
+            estrategia,
+            dados['market_sentiment']
+        )
     
     # Ajuste crítico para igualar tamanho dos arrays
     reservas = equalizar_tamanho_arrays(reservas, len(tendencia_completa))
     
-    return criar_dataset(tendencia_completa, reservas, estrategia, dados['market_sentiment'])
+    return tendencia_completa, reservas
 
 def equalizar_tamanho_arrays(reservas, tamanho_alvo):
     """Garante sincronia entre dados do dólar e reservas"""
-    if not reservas:
-        return [0] * tamanho_alvo
-    
-    ultimo_valor = reservas[-1]
-    while len(reservas) < tamanho_alvo:
-        reservas.append(ultimo_valor)
-    return reservas[:tamanho_alvo]
+    reservas = np.asarray(reservas, dtype=np.float64)
+    saida = np.zeros(tamanho_alvo)
+    n = min(len(reservas), tamanho_alvo)
+    saida[:n] = reservas[:n]
+    if n:
+        saida[n:] = reservas[n - 1]
+    return saida
 
-def criar_dataset(tendencia, reservas, estrategia, sentimento):
-    """Cria estrutura de dados final para análise com colunas padronizadas"""
+def mensagem_estrategia(tendencia, estrategia, sentimento):
+    """Resumo textual de uma estratégia"""
     status_sentimento = (
         'positivo' if sentimento > 0 else
         'negativo' if sentimento < 0 else 
         'neutro'
     )
     
-    mensagem = (
+    return (
         f"Estratégia: {estrategia.capitalize()}\n"
         f"Sentimento: {status_sentimento}\n"
         f"Variação Dólar: {tendencia[0]:.2f} → {tendencia[-1]:.2f}"
     )
+
+def criar_dataset(tendencia, reservas, estrategia, sentimento):
+    """Cria estrutura de dados final para análise com colunas padronizadas"""
+    resultados = ResultadosSimulacao.vazio([estrategia], len(tendencia))
+    resultados.preencher(estrategia, tendencia, reservas, mensagem_estrategia(tendencia, estrategia, sentimento))
+    return resultados[estrategia]
+
+def gerar_saidas(resultados, dados_entrada, workers=None, progresso=None, cancelamento=None, chave_cache=None):
+    """Coordena a geração de todos os outputs do sistema como um grafo de tarefas.
+    
+    Relatório PDF, gráfico comparativo e imagens de cada estratégia são independentes;
+    com configuracoes.WORKERS_SAIDAS > 1 rodam em processos separados e o tempo total
+    fica próximo ao da tarefa mais lenta (por padrão, em série no processo atual). Com chave_cache, a execução é guardada no cache
+    depois que todos os arquivos estiverem prontos. Cada arquivo é gravado em um
+    temporário e renomeado, então execuções concorrentes não deixam arquivos corrompidos.
+    """
+    import gerar_relatorio
+    
+    workers = configuracoes.WORKERS_SAIDAS if workers is None else workers
+    tarefas = {
+        'Relatório PDF': (partial(gerar_relatorios, resultados, dados_entrada, gerar_imagens=False), ()),
+        'Gráfico comparativo': (partial(plotar_graficos, resultados), ())
+    }
+    for df, estrategia in gerar_relatorio.itens_estrategias_png(resultados):
+        tarefas[f'Tabela {estrategia}'] = (partial(gerar_relatorio.salvar_estrategia_png, df, estrategia), ())
+    if chave_cache is not None:
+        tarefas['Cache'] = (
+            partial(cache.salvar, chave_cache, resultados, artefatos_gerados(resultados)), tuple(tarefas)
+        )
+    if configuracoes.ARQUIVO_EXPORTACAO:
+        # Fora do cache: a exportação depende da configuração atual, não só dos parâmetros
+        tarefas['Exportação'] = (partial(exportar, resultados, configuracoes.ARQUIVO_EXPORTACAO), ())
+    
+    instrumentar = instrumentacao.ativa()
+    if instrumentar:
+        # Cada tarefa é medida no processo que a executa
+        tarefas = {
+            nome: (instrumentacao.medido(funcao, nome), dependencias)
+            for nome, (funcao, dependencias) in tarefas.items()
+        }
+    
+    def concluido(nome):
+        if progresso is not None:
+            progresso(f"Concluído: {nome}")
     
-    # Dataframe com nomes de colunas padronizados em inglês
-    return pd.DataFrame({
-        'Day': range(len(tendencia)),
-        'Dollar Value (R$)': [round(v, 2) for v in tendencia],
-        'Reserves (Billion USD)': [round(r, 2) for r in reservas]
-    }), mensagem
+    try:
+        saidas = paralelo.executar_grafo(tarefas, workers, ao_concluir=concluido, cancelamento=cancelamento)
+    except paralelo.GrafoCancelado as erro:
+        raise SimulacaoCancelada("Simulação cancelada pelo usuário") from erro
+    if instrumentar:
+        for _, novos in saidas.values():
+            instrumentacao.incorporar(novos)
 
-def gerar_saidas(resultados, dados_entrada):
-    """Coordena a geração de todos os outputs do sistema"""
-    gerar_relatorios(resultados, dados_entrada)
-    plotar_graficos(resultados)
+def artefatos_gerados(resultados):
+    """Arquivos produzidos por gerar_saidas no diretório de trabalho"""
+    return ['relatorio_simulacao.pdf', 'analise_completa.png'] + [
+        f'estrategia_{estrategia}.png' for estrategia in resultados
+    ]
 
-def gerar_relatorios(resultados, dados_entrada):
+def gerar_relatorios(resultados, dados_entrada, nome_arquivo='relatorio_simulacao.pdf', modo='completo',
+                     gerar_imagens=True):
     """Gerencia a criação de documentos PDF"""
+    import gerar_relatorio
+    
     gerar_relatorio.criar_relatorio(
         resultados, 
-        'relatorio_simulacao.pdf',
-        dados_entrada=dados_entrada  # Passa os dados capturados
+        nome_arquivo,
+        dados_entrada=dados_entrada,  # Passa os dados capturados
+        modo=modo,
+        gerar_imagens=gerar_imagens
     )
 
-def plotar_graficos(resultados):
-    """Produz visualizações gráficas da simulação com colunas corretas"""
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+def plotar_graficos(resultados, nome_arquivo='analise_completa.png', max_pontos=MAX_PONTOS_GRAFICO,
+                    limite_marcadores=LIMITE_MARCADORES, rasterizar=False, metodo='min_max'):
+    """Produz visualizações gráficas da simulação com colunas corretas
+    
+    Séries longas são reduzidas antes do desenho (metodo='min_max' preserva picos e vales;
+    'lttb' segue a forma com menos pontos) e perdem os marcadores acima de limite_marcadores
+    pontos, mantendo o tempo do gráfico quase constante com o horizonte. rasterizar=True
+    converte as linhas densas em imagem em formatos vetoriais (.pdf/.svg).
+    """
+    # Figura sem pyplot (canvas Agg): pode ser gerada fora da thread da interface
+    from matplotlib.figure import Figure
+    from src.utils import escrita_atomica
+    
+    def series(metrica):
+        for estrategia in resultados:
+            x, y = resultados.dias, resultados.serie(estrategia, metrica)
+            if max_pontos and len(x) > max_pontos:
+                if metodo == 'lttb':
+                    x, y = decimacao.decimar_lttb(x, y, max_pontos)
+                else:
+                    x, y = decimacao.decimar_min_max(x, y, max_pontos // 2)
+            densa = len(x) > limite_marcadores
+            yield estrategia, x, y, densa
+    
+    fig = Figure(figsize=(14, 10))
+    ax1, ax2 = fig.subplots(2, 1)
     
-    # Gráfico de Reservas
-    for estrategia, (df, _) in resultados.items():
-        ax1.plot(df['Day'], df['Reserves (Billion USD)'], 
-                marker='o', linewidth=1.5, label=estrategia.capitalize())
+    # Gráfico de Reservas (visões das matrizes de resultados, sem DataFrames)
+    for estrategia, x, y, densa in series('reservas'):
+        ax1.plot(x, y, marker=None if densa else 'o', linewidth=1.5, label=estrategia.capitalize(),
+                 rasterized=rasterizar and densa)
     
     ax1.set_title('Evolução das Reservas Cambiais', fontsize=14, pad=15)
     ax1.set_ylabel('Bilhões USD', fontsize=12)
@@ -128,19 +319,21 @@ def plotar_graficos(resultados):
     ax1.legend()
     
     # Gráfico do Dólar
-    for estrategia, (df, _) in resultados.items():
-        ax2.plot(df['Day'], df['Dollar Value (R$)'], 
-                linestyle='--', marker='s', linewidth=1.5, label=estrategia.capitalize())
+    for estrategia, x, y, densa in series('dolar'):
+        ax2.plot(x, y, linestyle='--', marker=None if densa else 's', linewidth=1.5,
+                 label=estrategia.capitalize(), rasterized=rasterizar and densa)
     
     ax2.set_title('Variação do Valor do Dólar', fontsize=14, pad=15)
     ax2.set_xlabel('Dias', fontsize=12)
     ax2.set_ylabel('Valor (R$)', fontsize=12)
     ax2.grid(True, linestyle='--', alpha=0.6)
     
-    plt.tight_layout()
-    plt.savefig('analise_completa.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    formato = os.path.splitext(nome_arquivo)[1].lstrip('.').lower() or 'png'
+    with escrita_atomica(nome_arquivo) as temporario, instrumentacao.medir('savefig', arquivo=nome_arquivo):
+        fig.savefig(temporario, format=formato, dpi=300, bbox_inches='tight')
 
 if __name__ == "__main__":
-    app = interface_grafica.criar_interface(executar_simulacao)
+    from src import interface_grafica
+    app = interface_grafica.criar_interface(executar_etapas)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""Armazém persistente (SQLite) com os parâmetros e as trajetórias de cada execução.
+
+Cada execução vira uma linha em `execucoes` (parâmetros, hash dos parâmetros, data/hora
+UTC e o sha256 do histórico do dólar, guardado uma única vez em `historicos`) e uma
+linha por estratégia em `estrategias` com um resumo
+indexado (dia de esgotamento, reservas finais e mínimas, dólar final) e as trajetórias
+da janela prevista em BLOBs float64 (dólar nos dias 1..N, reservas nos dias 0..N). O
+resumo e as trajetórias vêm de lote.simular_lote, sem arredondamento, tanto em salvar
+quanto em salvar_cenarios. Consultas filtram apenas pelas colunas de resumo, sem ler
+as trajetórias; caminhos() carrega as séries de uma execução quando necessário.
+
+Exemplo (execuções pessimistas em que a agressiva esgotou as reservas antes do dia 30):
+    with ArmazemResultados() as armazem:
+        for linha in armazem.consultar(estrategia='agressiva', sentimento_menor_que=0, esgotado_antes_de=30):
+            ...
+"""
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+from src import configuracoes, lote
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    criado_em TEXT NOT NULL,
+    initial_reserves REAL NOT NULL,
+    burn_rate REAL NOT NULL,
+    days_to_predict INTEGER NOT NULL,
+    market_sentiment REAL NOT NULL,
+    strategy TEXT,
+    previsor TEXT NOT NULL,
+    n_historico INTEGER NOT NULL,
+    resumo_historico TEXT NOT NULL REFERENCES historicos(resumo)
+);
+CREATE TABLE IF NOT EXISTS historicos (
+    resumo TEXT PRIMARY KEY,
+    valores BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS estrategias (
+    execucao_id INTEGER NOT NULL REFERENCES execucoes(id) ON DELETE CASCADE,
+    estrategia TEXT NOT NULL,
+    dia_esgotamento INTEGER,
+    reserva_final REAL,
+    reserva_minima REAL,
+    dolar_final REAL,
+    dolar BLOB,
+    reservas BLOB,
+    PRIMARY KEY (execucao_id, estrategia)
+);
+CREATE INDEX IF NOT EXISTS idx_execucoes_hash ON execucoes(hash);
+CREATE INDEX IF NOT EXISTS idx_execucoes_criado_em ON execucoes(criado_em);
+CREATE INDEX IF NOT EXISTS idx_execucoes_sentimento ON execucoes(market_sentiment);
+CREATE INDEX IF NOT EXISTS idx_estrategias_esgotamento ON estrategias(estrategia, dia_esgotamento);
+"""
+
+COLUNAS_EXECUCAO = ('id', 'hash', 'criado_em', 'initial_reserves', 'burn_rate', 'days_to_predict',
+                    'market_sentiment', 'strategy', 'previsor', 'n_historico')
+COLUNAS_RESUMO = ('estrategia', 'dia_esgotamento', 'reserva_final', 'reserva_minima', 'dolar_final')
+COLUNAS_CONSULTA = COLUNAS_EXECUCAO + COLUNAS_RESUMO
+INSERIR_EXECUCAO = ("INSERT INTO execucoes (id, hash, criado_em, initial_reserves, burn_rate, days_to_predict, "
+                    "market_sentiment, strategy, previsor, n_historico, resumo_historico) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+INSERIR_ESTRATEGIA = "INSERT INTO estrategias VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+def resumo_historico(dollar_values):
+    """sha256 do histórico em float64 (ordem de bytes nativa)"""
+    return hashlib.sha256(memoryview(np.ascontiguousarray(dollar_values, dtype=np.float64))).hexdigest()
+
+def hash_parametros(dados, resumo=None):
+    """Hash canônico dos parâmetros da simulação e do previsor; resumo evita recalcular o do histórico"""
+    canonico = {
+        'previsor': configuracoes.PREVISOR,
+        'dollar_values': resumo or resumo_historico(dados['dollar_values']),
+        'initial_reserves': float(dados['initial_reserves']),
+        'burn_rate': float(dados['burn_rate']),
+        'days_to_predict': int(dados['days_to_predict']),
+        'market_sentiment': float(dados['market_sentiment'])
+    }
+    texto = json.dumps(canonico, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def _agora():
+    return datetime.now(timezone.utc).isoformat(timespec='microseconds')
+
+def _linhas_estrategias(execucao_id, calculado, minimas, i):
+    """Linhas de `estrategias` para o cenário i de lote.simular_lote"""
+    dias = int(calculado['days_to_predict'][i])
+    esgotamento = calculado['dia_esgotamento']
+    for j, estrategia in enumerate(calculado['estrategias']):
+        dolar = calculado['dolar'][i, j, :dias] if 'dolar' in calculado else None
+        yield (
+            execucao_id, estrategia,
+            int(esgotamento[i, j]) if esgotamento[i, j] >= 0 else None,
+            float(calculado['reserva_final'][i, j]), float(minimas[i, j]),
+            float(dolar[-1]) if dolar is not None else None,
+            dolar.tobytes() if dolar is not None else None,
+            calculado['reservas'][i, j, :dias + 1].tobytes()
+        )
+
+class ArmazemResultados:
+    def __init__(self, caminho=None):
+        self.caminho = caminho or configuracoes.ARQUIVO_RESULTADOS
+        # isolation_level=None: as transações são abertas explicitamente com BEGIN IMMEDIATE
+        self.conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self.conexao.execute('PRAGMA foreign_keys=ON')
+        self.conexao.executescript(ESQUEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+    def fechar(self):
+        self.conexao.close()
+
+    def _guardar_historico(self, dollar_values):
+        valores = np.ascontiguousarray(dollar_values, dtype=np.float64)
+        resumo = resumo_historico(valores)
+        self.conexao.execute("INSERT OR IGNORE INTO historicos VALUES (?, ?)", (resumo, valores.tobytes()))
+        return resumo, len(valores)
+
+    def _proximo_id(self):
+        # Chamado dentro de BEGIN IMMEDIATE: nenhum outro processo grava até o commit
+        return self.conexao.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM execucoes").fetchone()[0]
+
+    def salvar(self, dados, resultados, momento=None):
+        """Grava uma execução (dados de entrada e ResultadosSimulacao); retorna o id"""
+        return self.salvar_lote([(dados, resultados)], momento)[0]
+
+    def salvar_lote(self, execucoes, momento=None):
+        """Grava várias execuções [(dados, resultados), ...] em uma única transação.
+
+        Os resultados informam as estratégias; resumo e trajetórias são recalculados pelo
+        motor em lote (sem o arredondamento a 2 casas), de modo que coincidem com os de
+        salvar_cenarios para os mesmos parâmetros.
+        """
+        momento = momento or _agora()
+        ids = []
+        with self.conexao:
+            self.conexao.execute('BEGIN IMMEDIATE')
+            execucao_id = self._proximo_id()
+            linhas_execucoes, linhas_estrategias = [], []
+            for dados, resultados in execucoes:
+                resumo, n_historico = self._guardar_historico(dados['dollar_values'])
+                dias = int(dados['days_to_predict'])
+                linhas_execucoes.append((
+                    execucao_id, hash_parametros(dados, resumo), momento, float(dados['initial_reserves']),
+                    float(dados['burn_rate']), dias, float(dados['market_sentiment']),
+                    dados.get('strategy', 'padrão'), configuracoes.PREVISOR, n_historico, resumo
+                ))
+                calculado = lote.simular_lote(dados['initial_reserves'], dados['burn_rate'],
+                                              dados['market_sentiment'], dias,
+                                              dollar_values=dados['dollar_values'], estrategias=tuple(resultados))
+                minimas = np.nanmin(calculado['reservas'], axis=2)
+                linhas_estrategias.extend(_linhas_estrategias(execucao_id, calculado, minimas, 0))
+                ids.append(execucao_id)
+                execucao_id += 1
+            self.conexao.executemany(INSERIR_EXECUCAO, linhas_execucoes)
+            self.conexao.executemany(INSERIR_ESTRATEGIA, linhas_estrategias)
+        return ids
+
+    def salvar_cenarios(self, calculado, dollar_values, momento=None, tamanho_transacao=10000):
+        """Grava o resultado de lote.simular_lote (um cenário por execução) em transações de
+        tamanho_transacao cenários; os resumos vêm dos vetores do lote, sem laço por dia."""
+        momento = momento or _agora()
+        n_cenarios = len(calculado['initial_reserves'])
+        minimas = np.nanmin(calculado['reservas'], axis=2)
+        ids = []
+        for inicio in range(0, n_cenarios, tamanho_transacao):
+            fim = min(inicio + tamanho_transacao, n_cenarios)
+            with self.conexao:
+                self.conexao.execute('BEGIN IMMEDIATE')
+                resumo, n_historico = self._guardar_historico(dollar_values)
+                primeiro = self._proximo_id()
+                linhas_execucoes, linhas_estrategias = [], []
+                for i in range(inicio, fim):
+                    execucao_id = primeiro + i - inicio
+                    dias = int(calculado['days_to_predict'][i])
+                    dados = {
+                        'initial_reserves': float(calculado['initial_reserves'][i]),
+                        'burn_rate': float(calculado['burn_rate'][i]),
+                        'days_to_predict': dias,
+                        'market_sentiment': float(calculado['market_sentiment'][i])
+                    }
+                    linhas_execucoes.append((
+                        execucao_id, hash_parametros(dados, resumo), momento, dados['initial_reserves'],
+                        dados['burn_rate'], dias, dados['market_sentiment'], None, configuracoes.PREVISOR,
+                        n_historico, resumo
+                    ))
+                    linhas_estrategias.extend(_linhas_estrategias(execucao_id, calculado, minimas, i))
+                    ids.append(execucao_id)
+                self.conexao.executemany(INSERIR_EXECUCAO, linhas_execucoes)
+                self.conexao.executemany(INSERIR_ESTRATEGIA, linhas_estrategias)
+        return ids
+
+    def consultar(self, estrategia=None, hash=None, previsor=None, desde=None, ate=None,
+                  sentimento_menor_que=None, sentimento_maior_que=None,
+                  esgotado_antes_de=None, esgotado=None, limite=None):
+        """Gera dicionários com parâmetros e resumo por estratégia, sem carregar as trajetórias.
+
+        esgotado_antes_de=N seleciona esgotamentos até o dia N - 1; esgotado=True/False
+        filtra execuções com ou sem esgotamento no horizonte. desde/ate comparam a data/hora
+        ISO (UTC) de gravação.
+        """
+        condicoes, parametros = [], []
+        filtros = [
+            ('s.estrategia = ?', estrategia), ('e.hash = ?', hash), ('e.previsor = ?', previsor),
+            ('e.criado_em >= ?', desde), ('e.criado_em <= ?', ate),
+            ('e.market_sentiment < ?', sentimento_menor_que), ('e.market_sentiment > ?', sentimento_maior_que),
+            ('s.dia_esgotamento < ?', esgotado_antes_de)
+        ]
+        for condicao, valor in filtros:
+            if valor is not None:
+                condicoes.append(condicao)
+                parametros.append(valor)
+        if esgotado is not None:
+            condicoes.append('s.dia_esgotamento IS NOT NULL' if esgotado else 's.dia_esgotamento IS NULL')
+
+        colunas = [f'e.{c}' for c in COLUNAS_EXECUCAO] + [f's.{c}' for c in COLUNAS_RESUMO]
+        sql = f"SELECT {', '.join(colunas)} FROM execucoes e JOIN estrategias s ON s.execucao_id = e.id"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += " ORDER BY e.criado_em, e.id"
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(int(limite))
+        for linha in self.conexao.execute(sql, parametros):
+            yield dict(zip(COLUNAS_CONSULTA, linha))
+
+    def caminhos(self, execucao_id, estrategia):
+        """Trajetórias (dolar, reservas) gravadas de uma estratégia em uma execução"""
+        linha = self.conexao.execute(
+            "SELECT dolar, reservas FROM estrategias WHERE execucao_id = ? AND estrategia = ?",
+            (execucao_id, estrategia)
+        ).fetchone()
+        if linha is None:
+            raise KeyError((execucao_id, estrategia))
+        dolar, reservas = linha
+        return (np.frombuffer(dolar, dtype=np.float64) if dolar is not None else None,
+                np.frombuffer(reservas, dtype=np.float64))
+
+    def historico(self, execucao_id):
+        """Histórico do dólar usado em uma execução"""
+        linha = self.conexao.execute(
+            "SELECT h.valores FROM execucoes e JOIN historicos h ON h.resumo = e.resumo_historico WHERE e.id = ?",
+            (execucao_id,)
+        ).fetchone()
+        if linha is None:
+            raise KeyError(execucao_id)
+        return np.frombuffer(linha[0], dtype=np.float64)
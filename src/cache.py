@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+
+import numpy as np
+from src import configuracoes, estrategias as registro
+from src.resultados import ResultadosSimulacao
+from src.utils import escrita_atomica, permissoes_padrao
+
+_RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_versao_codigo = None
+# Sonda fixa (burn_rate × dias) para a impressão digital dos kernels das estratégias
+_SONDA_QUEIMA = np.array([[-2.0], [0.0], [0.7], [3.0], [25.0]])
+_SONDA_DIAS = np.arange(0, 400, 7, dtype=np.float64)
+# Pastas de DIRETORIO_CACHE que dividem o limite LIMITE_CACHE_MB, com remoção LRU
+SUBDIRETORIOS_LRU = ('execucoes', 'png', 'historicos')
+
+def versao_codigo():
+    """Impressão digital do código-fonte do simulador: alterações no código invalidam o cache"""
+    global _versao_codigo
+    if _versao_codigo is None:
+        h = hashlib.sha256()
+        arquivos = [os.path.join(_RAIZ_PROJETO, nome) for nome in ('main.py', 'gerar_relatorio.py')]
+        pasta_src = os.path.join(_RAIZ_PROJETO, 'src')
+        arquivos += sorted(os.path.join(pasta_src, nome) for nome in os.listdir(pasta_src) if nome.endswith('.py'))
+        for caminho in arquivos:
+            with open(caminho, 'rb') as arquivo:
+                h.update(arquivo.read())
+        _versao_codigo = h.hexdigest()
+    return _versao_codigo
+
+def impressao_estrategia(estrategia):
+    """Impressão digital de uma estratégia registrada: identificação e bytecode dos kernels,
+    saída deles em uma sonda fixa e os textos do relatório"""
+    h = hashlib.sha256()
+    for kernel in (estrategia.queima, estrategia.fator_dolar):
+        h.update(f"{getattr(kernel, '__module__', '')}.{getattr(kernel, '__qualname__', type(kernel).__name__)}".encode())
+        codigo = getattr(kernel, '__code__', None)
+        if codigo is not None:
+            h.update(codigo.co_code)
+    # A saída cobre fechamentos e parâmetros que o bytecode não mostra
+    queima = estrategia.queima(_SONDA_QUEIMA, _SONDA_DIAS[None, :])
+    fator = estrategia.fator_dolar(_SONDA_DIAS)
+    h.update(np.ascontiguousarray(np.broadcast_to(queima, (len(_SONDA_QUEIMA), len(_SONDA_DIAS))), dtype=np.float64))
+    h.update(np.ascontiguousarray(np.broadcast_to(fator, _SONDA_DIAS.shape), dtype=np.float64))
+    h.update(json.dumps([estrategia.descricao, estrategia.traducao], ensure_ascii=False).encode('utf-8'))
+    return h.hexdigest()
+
+def chave_execucao(dados, estrategias):
+    """Hash canônico dos parâmetros, das estratégias registradas (nome e kernels), da data do relatório
+    e da versão do código"""
+    canonico = {
+        # Resumo do histórico, que pode ter milhões de cotações (ex.: carregado de arquivo)
+        'dollar_values': hashlib.sha256(
+            memoryview(np.ascontiguousarray(dados['dollar_values'], dtype=np.float64))
+        ).hexdigest(),
+        'initial_reserves': float(dados['initial_reserves']),
+        'burn_rate': float(dados['burn_rate']),
+        'days_to_predict': int(dados['days_to_predict']),
+        'market_sentiment': float(dados['market_sentiment']),
+        'strategy': dados.get('strategy', 'padrão'),
+        # Uma estratégia substituída sob o mesmo nome muda a chave
+        'estrategias': [[nome, impressao_estrategia(registro.obter_estrategia(nome))] for nome in estrategias],
+        'previsor': configuracoes.PREVISOR,
+        # O PDF é datado: artefatos de outro dia não são reaproveitados
+        'data': date.today().isoformat(),
+        'versao': versao_codigo()
+    }
+    texto = json.dumps(canonico, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def _diretorio_execucoes():
+    return os.path.join(configuracoes.DIRETORIO_CACHE, 'execucoes')
+
+def carregar(chave):
+    """Retorna os resultados em cache (ResultadosSimulacao) ou None"""
+    diretorio = os.path.join(_diretorio_execucoes(), chave)
+    try:
+        with open(os.path.join(diretorio, 'mensagens.json'), encoding='utf-8') as arquivo:
+            mensagens = json.load(arquivo)
+        with np.load(os.path.join(diretorio, 'resultados.npz')) as matrizes:
+            dolar = matrizes['dolar']
+            reservas = matrizes['reservas']
+    except (OSError, ValueError, KeyError):
+        return None
+
+    resultados = ResultadosSimulacao([e for e, _ in mensagens], dolar, reservas, mensagens, dolar.dtype)
+    os.utime(diretorio)  # marca o uso recente para a remoção LRU
+    return resultados
+
+def restaurar_artefatos(chave, destino='.'):
+    """Copia os arquivos gerados na execução original para o diretório de destino.
+
+    Cada cópia é atômica, como na geração: uma execução concorrente nunca vê um
+    relatório ou imagem pela metade.
+    """
+    pasta = os.path.join(_diretorio_execucoes(), chave, 'artefatos')
+    for nome in os.listdir(pasta):
+        with escrita_atomica(os.path.join(destino, nome)) as temporario:
+            shutil.copyfile(os.path.join(pasta, nome), temporario)
+
+def salvar(chave, resultados, artefatos=()):
+    """Guarda resultados numéricos e artefatos de uma execução e aplica o limite de tamanho do cache"""
+    os.makedirs(_diretorio_execucoes(), exist_ok=True)
+    temporario = tempfile.mkdtemp(dir=_diretorio_execucoes(), prefix='.tmp-')
+    try:
+        permissoes_padrao(temporario, 0o777)  # mkdtemp cria o diretório só com acesso do dono
+        np.savez(os.path.join(temporario, 'resultados.npz'),
+                 dolar=resultados.dolar, reservas=resultados.reservas)
+        with open(os.path.join(temporario, 'mensagens.json'), 'w', encoding='utf-8') as arquivo:
+            json.dump([[estrategia, resultados.mensagens[estrategia]] for estrategia in resultados],
+                      arquivo, ensure_ascii=False)
+        os.makedirs(os.path.join(temporario, 'artefatos'))
+        for caminho in artefatos:
+            if os.path.exists(caminho):
+                shutil.copyfile(caminho, os.path.join(temporario, 'artefatos', os.path.basename(caminho)))
+
+        destino = os.path.join(_diretorio_execucoes(), chave)
+        if os.path.exists(destino):
+            shutil.rmtree(destino, ignore_errors=True)
+        os.replace(temporario, destino)
+    except OSError:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+    remover_excedente()
+
+def _tamanho(diretorio):
+    return sum(
+        os.path.getsize(os.path.join(raiz, nome))
+        for raiz, _, nomes in os.walk(diretorio) for nome in nomes
+    )
+
+def marcar_uso(caminho):
+    """Marca o uso recente de uma entrada para a remoção LRU; False se ela não existe"""
+    try:
+        os.utime(caminho)
+    except FileNotFoundError:
+        return False
+    return True
+
+def _entradas_lru():
+    """(último uso, tamanho, caminho) de cada entrada das pastas do cache com limite de tamanho"""
+    entradas = []
+    for subdiretorio in SUBDIRETORIOS_LRU:
+        raiz = os.path.join(configuracoes.DIRETORIO_CACHE, subdiretorio)
+        if not os.path.isdir(raiz):
+            continue
+        for nome in os.listdir(raiz):
+            caminho = os.path.join(raiz, nome)
+            if nome.startswith('.'):
+                continue  # gravações em andamento
+            try:
+                tamanho = _tamanho(caminho) if os.path.isdir(caminho) else os.path.getsize(caminho)
+                entradas.append((os.path.getmtime(caminho), tamanho, caminho))
+            except OSError:
+                continue  # removida por outro processo durante a varredura
+    return entradas
+
+def remover_excedente(limite_bytes=None, manter=()):
+    """Remove as entradas menos usadas recentemente até o cache caber no limite.
+
+    O limite vale para as execuções e os demais caches em disco (SUBDIRETORIOS_LRU) somados;
+    os caminhos em manter (ex.: o arquivo recém-gravado) nunca são removidos.
+    """
+    if limite_bytes is None:
+        limite_bytes = configuracoes.LIMITE_CACHE_MB * 1024 * 1024
+    manter = {os.path.abspath(caminho) for caminho in manter}
+    entradas = _entradas_lru()
+
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= limite_bytes:
+            break
+        if os.path.abspath(caminho) in manter:
+            continue
+        if os.path.isdir(caminho):
+            shutil.rmtree(caminho, ignore_errors=True)
+        else:
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue  # ex.: arquivo mapeado em memória no Windows
+        total -= tamanho
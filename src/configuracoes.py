@@ -0,0 +1,45 @@
+import os
+
+# Paralelismo: número de processos (0 ou 1 = execução serial) e tamanho dos blocos de cenários
+WORKERS = int(os.environ.get('SIMULADOR_WORKERS', '0'))
+TAMANHO_BLOCO = int(os.environ.get('SIMULADOR_TAMANHO_BLOCO', '10000'))
+
+# Modelo de previsão do dólar (src/previsores.py): 'linear', 'janela:60', 'holt:0.5,0.1', 'ar:3'
+PREVISOR = os.environ.get('SIMULADOR_PREVISOR', 'linear')
+
+# Cache em disco de artefatos gerados (imagens, resultados)
+DIRETORIO_CACHE = os.environ.get(
+    'SIMULADOR_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'simulador_alta_dolar')
+)
+
+# Cache de execuções completas (parâmetros idênticos reaproveitam resultados e arquivos);
+# LIMITE_CACHE_MB vale para todo o cache em disco (execuções, imagens das tabelas e históricos convertidos)
+CACHE_EXECUCOES = os.environ.get('SIMULADOR_CACHE_EXECUCOES', '1') != '0'
+LIMITE_CACHE_MB = int(os.environ.get('SIMULADOR_LIMITE_CACHE_MB', '500'))
+
+# Armazém de resultados (SQLite): parâmetros e trajetórias de cada execução, para consultas entre execuções
+ARMAZENAR_RESULTADOS = os.environ.get('SIMULADOR_ARMAZENAR_RESULTADOS', '1') != '0'
+ARQUIVO_RESULTADOS = os.environ.get('SIMULADOR_RESULTADOS', 'resultados.sqlite')
+
+# Exportação das séries numéricas (src/exportacao.py): .arrow, .parquet ou .npz ('' = desligada)
+ARQUIVO_EXPORTACAO = os.environ.get('SIMULADOR_EXPORTAR', '')
+
+# Pipeline de saídas: processos para gerar PDF, gráfico e imagens ao mesmo tempo (0 ou 1 = serial, o padrão)
+WORKERS_SAIDAS = int(os.environ.get('SIMULADOR_WORKERS_SAIDAS', '0'))
+
+# Instrumentação (tempo e memória por etapa/estratégia) e perfil cProfile opcional
+INSTRUMENTACAO = os.environ.get('SIMULADOR_INSTRUMENTACAO', '0') != '0'
+# Pico de alocações por bloco com tracemalloc (lento: deixe desligado ao comparar tempos)
+INSTRUMENTACAO_MEMORIA = os.environ.get('SIMULADOR_INSTRUMENTACAO_MEMORIA', '0') != '0'
+ARQUIVO_INSTRUMENTACAO = os.environ.get('SIMULADOR_INSTRUMENTACAO_JSON', 'instrumentacao.json')
+ARQUIVO_PERFIL = os.environ.get('SIMULADOR_PERFIL', '')
+
+# Serviço HTTP local (python -m src.servico): endereço, micro-lotes e limites de fila
+SERVICO_HOST = os.environ.get('SIMULADOR_SERVICO_HOST', '127.0.0.1')
+SERVICO_PORTA = int(os.environ.get('SIMULADOR_SERVICO_PORTA', '8765'))
+SERVICO_LOTE_MAXIMO = int(os.environ.get('SIMULADOR_SERVICO_LOTE_MAXIMO', '256'))
+SERVICO_JANELA_LOTE_MS = float(os.environ.get('SIMULADOR_SERVICO_JANELA_LOTE_MS', '2'))
+SERVICO_MAX_PENDENTES = int(os.environ.get('SIMULADOR_SERVICO_MAX_PENDENTES', '4096'))
+SERVICO_MAX_RELATORIOS = int(os.environ.get('SIMULADOR_SERVICO_MAX_RELATORIOS', '8'))
+SERVICO_MAX_DIAS = int(os.environ.get('SIMULADOR_SERVICO_MAX_DIAS', '100000'))
@@ -0,0 +1,125 @@
+"""Consultas analíticas sobre as reservas, em O(1) por estratégia, sem simular os caminhos.
+
+As estratégias embutidas queimam um valor constante (padrão, agressiva, inatividade) ou
+linearmente decrescente até zero (moderada), sempre multiplicado por
+(1 - 0.1 * market_sentiment). A queima acumulada tem então forma fechada e as
+consultas se reduzem a divisões ou a uma equação de segundo grau. A fórmula vem de
+Estrategia.forma_fechada, de modo que uma estratégia substituída no registro perde a
+forma fechada. Casos sem ela (queima negativa ou estratégias sem fórmula) usam o motor
+de simulação.
+
+Em empates exatos (reservas zerando exatamente em um dia) a simulação pode deixar um
+resíduo de arredondamento (~1e-15) e apontar o dia seguinte; aqui vale o valor exato.
+"""
+import math
+
+import numpy as np
+from src import estrategias, simulacao
+
+def _forma_fechada(strategy):
+    # Nomes não registrados seguem a estratégia padrão registrada, como na simulação
+    return estrategias.obter_estrategia(strategy).forma_fechada
+
+def _tem_formula(strategy):
+    return _forma_fechada(strategy) is not None
+
+def _tem_forma_fechada(strategy, burn_rate):
+    return burn_rate >= 0 and _tem_formula(strategy)
+
+def _dias_com_queima(burn_rate):
+    """Número de dias em que a queima moderada (burn_rate - 0.1 * dia) ainda é positiva"""
+    return math.ceil(burn_rate * 10) if burn_rate > 0 else 0
+
+def queima_acumulada(burn_rate, dias, strategy, market_sentiment):
+    """Queima total nos primeiros dias simulados (sem o piso de zero das reservas)"""
+    fator = 1 - market_sentiment * 0.1
+    forma = _forma_fechada(strategy)
+    if forma is None:
+        queima = simulacao.queima_programada(strategy, burn_rate, np.arange(dias, dtype=np.float64))
+        return fator * float(np.sum(queima))
+    if forma == 'decrescente':
+        m = min(dias, _dias_com_queima(burn_rate))
+        return fator * (m * burn_rate - 0.05 * m * (m - 1))
+    return fator * forma * burn_rate * dias
+
+def reservas_no_dia(initial_reserves, burn_rate, dia, strategy, market_sentiment):
+    """Reservas ao final do dia informado (dia 0 = reservas iniciais)"""
+    if dia == 0:
+        return float(initial_reserves)
+    if not _tem_forma_fechada(strategy, burn_rate):
+        return float(simulacao.simular_reservas_vetorizado(
+            initial_reserves, burn_rate, dia, strategy, market_sentiment)[-1])
+    return max(initial_reserves - queima_acumulada(burn_rate, dia, strategy, market_sentiment), 0.0)
+
+def dia_esgotamento(initial_reserves, burn_rate, strategy, market_sentiment, horizonte=None):
+    """Primeiro dia em que as reservas chegam a zero, ou None se não se esgotam (no horizonte, se informado)"""
+    if not _tem_forma_fechada(strategy, burn_rate):
+        if horizonte is None:
+            if not _tem_formula(strategy):
+                raise ValueError("Informe o horizonte para estratégias sem forma fechada")
+            # Queima negativa nas estratégias embutidas: as reservas não diminuem e só
+            # podem estar zeradas já no primeiro dia
+            horizonte = 1
+        reservas = simulacao.simular_reservas_vetorizado(
+            initial_reserves, burn_rate, horizonte, strategy, market_sentiment)
+        zerados = np.flatnonzero(reservas[1:] <= 0)
+        return int(zerados[0]) + 1 if zerados.size else None
+
+    fator = 1 - market_sentiment * 0.1
+    forma = _forma_fechada(strategy)
+    if initial_reserves <= 0:
+        dia = 1
+    elif forma == 'decrescente':
+        n = _dias_com_queima(burn_rate)
+        if fator * (n * burn_rate - 0.05 * n * (n - 1)) < initial_reserves:
+            return None
+        # Menor d com fator * (d * b - 0.05 * d * (d - 1)) >= reservas
+        b = burn_rate + 0.05
+        discriminante = max(b * b - 0.2 * initial_reserves / fator, 0.0)
+        dia = max(math.ceil((b - math.sqrt(discriminante)) / 0.1 - 1e-9), 1)
+    else:
+        queima = fator * forma * burn_rate
+        if queima <= 0:
+            return None
+        dia = max(math.ceil(initial_reserves / queima - 1e-9), 1)
+
+    if horizonte is not None and dia > horizonte:
+        return None
+    return dia
+
+def taxa_maxima_sustentavel(initial_reserves, dias, strategy, market_sentiment, tolerancia=1e-9):
+    """Limite de burn_rate para as reservas durarem dias: taxas menores chegam positivas ao final"""
+    if not _tem_formula(strategy):
+        return _buscar_taxa_maxima(initial_reserves, dias, strategy, market_sentiment, tolerancia)
+
+    fator = 1 - market_sentiment * 0.1
+    alvo = initial_reserves / fator  # queima acumulada (sem o fator de sentimento) que esgota as reservas
+
+    forma = _forma_fechada(strategy)
+    if forma == 'decrescente':
+        # Com todos os dias queimando (b > 0.1 * (dias - 1)) a queima acumulada é dias * b - 0.05 * dias * (dias - 1)
+        taxa = alvo / dias + 0.05 * (dias - 1)
+        if taxa > 0.1 * (dias - 1):
+            return taxa
+        # Caso contrário só ceil(10b) dias queimam: no limite b = m / 10 a queima acumulada é 0.05 * m * (m + 1)
+        m = max(math.ceil((-1 + math.sqrt(1 + 80 * alvo)) / 2), 1)
+        return (alvo + 0.05 * m * (m - 1)) / m
+    return math.inf if forma == 0 else alvo / (forma * dias)
+
+def _buscar_taxa_maxima(initial_reserves, dias, strategy, market_sentiment, tolerancia):
+    """Busca binária sobre o motor de simulação (supõe queima crescente com burn_rate)"""
+    def sobrevive(taxa):
+        return reservas_no_dia(initial_reserves, taxa, dias, strategy, market_sentiment) > 0
+
+    inferior, superior = 0.0, 1.0
+    while sobrevive(superior):
+        if superior > 1e12:
+            return math.inf
+        inferior, superior = superior, superior * 2
+    while superior - inferior > tolerancia * superior:
+        meio = (inferior + superior) / 2
+        if sobrevive(meio):
+            inferior = meio
+        else:
+            superior = meio
+    return superior
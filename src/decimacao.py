@@ -0,0 +1,48 @@
+"""Redução de séries longas para desenho, preservando a forma e os extremos visíveis.
+
+decimar_min_max mantém, em cada balde de pontos consecutivos, o mínimo e o máximo (além
+do primeiro e do último ponto): picos e vales nunca somem do gráfico. decimar_lttb
+(Largest-Triangle-Three-Buckets) escolhe um ponto por balde maximizando a área do
+triângulo com os vizinhos, o que segue melhor a forma da curva com menos pontos.
+"""
+import numpy as np
+
+def decimar_min_max(x, y, n_baldes):
+    """Índices do primeiro, do último e do mínimo e máximo de cada balde, em ordem"""
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_baldes + 2:
+        return np.asarray(x), y
+    tamanho = -(-n // n_baldes)
+    blocos = np.pad(y, (0, tamanho * n_baldes - n), mode='edge').reshape(n_baldes, tamanho)
+    inicio = np.arange(n_baldes) * tamanho
+    indices = np.concatenate((
+        [0, n - 1],
+        np.minimum(inicio + blocos.argmin(axis=1), n - 1),
+        np.minimum(inicio + blocos.argmax(axis=1), n - 1)
+    ))
+    indices = np.unique(indices)
+    return np.asarray(x)[indices], y[indices]
+
+def decimar_lttb(x, y, n_pontos):
+    """Reduz a série a n_pontos com Largest-Triangle-Three-Buckets"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_pontos or n_pontos < 3:
+        return x, y
+    limites = np.linspace(1, n - 1, n_pontos - 1).astype(np.int64)
+    escolhidos = np.empty(n_pontos, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(n_pontos - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        # Média do balde seguinte como terceiro vértice do triângulo
+        proximo_fim = limites[i + 2] if i + 2 < len(limites) else n
+        media_x = x[fim:proximo_fim].mean()
+        media_y = y[fim:proximo_fim].mean()
+        areas = np.abs((x[anterior] - media_x) * (y[inicio:fim] - y[anterior]) -
+                       (x[anterior] - x[inicio:fim]) * (media_y - y[anterior]))
+        anterior = inicio + int(areas.argmax())
+        escolhidos[i + 1] = anterior
+    return x[escolhidos], y[escolhidos]
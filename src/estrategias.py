@@ -0,0 +1,135 @@
+"""Registro das estratégias de intervenção cambial.
+
+Cada estratégia fornece dois kernels vetorizados, resolvidos uma única vez por
+execução, e os textos usados no relatório:
+
+- queima(burn_rate, dias): queima diária bruta (antes do sentimento), com broadcast
+  entre burn_rate e o vetor de dias;
+- fator_dolar(dias): multiplicador aplicado ao dólar previsto em cada dia;
+- derivada_queima(burn_rate, dias) (opcional): derivada da queima em relação ao
+  burn_rate, usada na análise de sensibilidade (src/sensibilidade.py);
+- forma_fechada (opcional): 'decrescente' para max(burn_rate - 0.1 * dia, 0) ou o
+  multiplicador de uma queima constante (fator × burn_rate). Só as estratégias embutidas
+  a informam; src/consultas.py usa a simulação para as demais.
+
+Novas estratégias são incluídas com registrar_estrategia e passam a aparecer na
+simulação, na interface e no relatório. Em execução paralela com processos criados
+por spawn (Windows), registre-as em um módulo importado também pelos processos filhos.
+"""
+import numpy as np
+
+class Estrategia:
+    def __init__(self, nome, queima, fator_dolar, descricao=(), traducao='', derivada_queima=None,
+                 forma_fechada=None):
+        self.nome = nome
+        self.queima = queima
+        self.fator_dolar = fator_dolar
+        self.descricao = list(descricao)
+        self.traducao = traducao
+        self.derivada_queima = derivada_queima
+        self.forma_fechada = forma_fechada
+
+_REGISTRO = {}
+
+def registrar_estrategia(nome, queima, fator_dolar, descricao=(), traducao='', derivada_queima=None,
+                         forma_fechada=None):
+    """Registra (ou substitui) uma estratégia"""
+    estrategia = Estrategia(nome, queima, fator_dolar, descricao, traducao, derivada_queima, forma_fechada)
+    _REGISTRO[nome] = estrategia
+    return estrategia
+
+def remover_estrategia(nome):
+    _REGISTRO.pop(nome, None)
+
+def obter_estrategia(nome):
+    """Estratégia registrada; nomes desconhecidos seguem a estratégia padrão, como no laço original"""
+    return _REGISTRO.get(nome) or _REGISTRO['padrão']
+
+def nomes_estrategias():
+    """Nomes das estratégias registradas, na ordem de registro"""
+    return tuple(_REGISTRO)
+
+def _forma(burn_rate, dias):
+    return np.broadcast_shapes(np.shape(burn_rate), np.shape(dias))
+
+def _queima_moderada(burn_rate, dias):
+    return np.maximum(np.asarray(burn_rate, dtype=np.float64) - 0.1 * dias, 0)
+
+def _queima_agressiva(burn_rate, dias):
+    return np.broadcast_to(np.asarray(burn_rate, dtype=np.float64) * 1.5, _forma(burn_rate, dias)).copy()
+
+def _queima_nula(burn_rate, dias):
+    return np.zeros(_forma(burn_rate, dias))
+
+def _queima_constante(burn_rate, dias):
+    return np.broadcast_to(np.asarray(burn_rate, dtype=np.float64), _forma(burn_rate, dias)).copy()
+
+def _derivada_moderada(burn_rate, dias):
+    # Derivada de max(b - 0.1 * dia, 0): 1 enquanto a queima é positiva
+    return (np.asarray(burn_rate, dtype=np.float64) - 0.1 * dias > 0).astype(np.float64)
+
+def _derivada_constante(fator):
+    def derivada(burn_rate, dias):
+        return np.full(_forma(burn_rate, dias), fator)
+    return derivada
+
+def _fator_moderada(dias):
+    return 1 + 0.001 * dias
+
+def _fator_agressiva(dias):
+    return 1 - 0.002 * dias
+
+def _fator_inatividade(dias):
+    return 1 + 0.003 * dias
+
+def _fator_neutro(dias):
+    return np.ones_like(dias)
+
+registrar_estrategia(
+    'moderada', _queima_moderada, _fator_moderada,
+    descricao=[
+        "• Redução gradual de intervenções",
+        "• Equilíbrio entre controle e reservas",
+        "• Redução média de reservas: 8-12% em 14 dias",
+        "• Recomendação: Cenário padrão recomendado"
+    ],
+    traducao='Ações graduais buscando equilíbrio entre reservas e controle cambial',
+    derivada_queima=_derivada_moderada,
+    forma_fechada='decrescente'
+)
+registrar_estrategia(
+    'agressiva', _queima_agressiva, _fator_agressiva,
+    descricao=[
+        "• Intervenção intensiva com alto gasto de reservas",
+        "• Controle cambial imediato",
+        "• Redução média de reservas: 15-20% em 14 dias",
+        "• Recomendação: Uso em crises agudas"
+    ],
+    traducao='Intervenção intensiva com alto gasto de reservas para controle imediato',
+    derivada_queima=_derivada_constante(1.5),
+    forma_fechada=1.5
+)
+registrar_estrategia(
+    'inatividade', _queima_nula, _fator_inatividade,
+    descricao=[
+        "• Nenhuma intervenção governamental",
+        "• Valorização livre do dólar",
+        "• Reservas mantidas integralmente",
+        "• Recomendação: Contextos estáveis"
+    ],
+    traducao='Nenhuma intervenção governamental no mercado cambial',
+    derivada_queima=_derivada_constante(0.0),
+    forma_fechada=0.0
+)
+registrar_estrategia(
+    'padrão', _queima_constante, _fator_neutro,
+    descricao=[
+        "• Política cambial convencional",
+        "• Manutenção de taxas fixas",
+        "• Redução linear de reservas",
+        "• Recomendação: Situações previsíveis"
+    ],
+    traducao='Manutenção da política cambial vigente sem alterações',
+    derivada_queima=_derivada_constante(1.0),
+    forma_fechada=1.0
+)
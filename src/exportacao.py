@@ -0,0 +1,487 @@
+"""Exportação dos resultados numéricos em formatos colunares: Arrow IPC, Parquet ou NPZ.
+
+O formato vem da extensão do arquivo: .arrow/.feather/.ipc (Arrow IPC em arquivo),
+.parquet/.pq (ambos requerem pyarrow) ou .npz (somente NumPy, sem compressão).
+
+Layouts:
+- execução (ResultadosSimulacao): tabela longa (estrategia, dia, dolar, reservas); no
+  NPZ, as matrizes estratégia × dia;
+- lote de cenários (src.lote): uma linha por cenário e estratégia com os parâmetros, o
+  resumo e as trajetórias em listas de tamanho fixo; no NPZ, os vetores e matrizes do lote;
+- Monte Carlo: uma linha por estratégia e percentil com as séries diárias; os escalares
+  e as contagens de esgotamento vão nos metadados (no NPZ, em matrizes).
+
+Lotes grandes são gravados em blocos por EscritorLote (ou exportar_cenarios, que
+simula e grava bloco a bloco), sem juntar o lote inteiro na memória. Os leitores mapeiam
+os arquivos em memória: Arrow IPC é lido sem cópia, os membros do NPZ viram np.memmap e o
+Parquet é aberto com memory_map=True (a decodificação das colunas ainda aloca).
+"""
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+from src import configuracoes, lote
+from src.resultados import ResultadosSimulacao
+from src.utils import escrita_atomica
+
+FORMATOS = {'.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow',
+            '.parquet': 'parquet', '.pq': 'parquet', '.npz': 'npz'}
+# Linhas por lote de registros (Arrow) ou grupo de linhas (Parquet)
+LINHAS_POR_BLOCO = 1 << 20
+CHAVE_METADADOS = b'simulador'
+CAMPOS_CENARIO = ('initial_reserves', 'burn_rate', 'market_sentiment', 'days_to_predict')
+
+def formato(caminho):
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao not in FORMATOS:
+        raise ValueError(f"Formato de exportação não suportado: {extensao or caminho} "
+                         f"(use {', '.join(FORMATOS)})")
+    return FORMATOS[extensao]
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as erro:
+        raise ValueError("A exportação em Arrow/Parquet requer o pacote pyarrow") from erro
+    return pa
+
+def _estrategias_arrow(pa, indices, estrategias):
+    """Coluna de estratégias codificada em dicionário (mesmo dicionário em todos os blocos)"""
+    return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(list(estrategias), pa.string()))
+
+def _lista_fixa(pa, matriz):
+    """Matriz (linhas × largura) como lista de tamanho fixo, sem cópia"""
+    matriz = np.ascontiguousarray(matriz, dtype=np.float64)
+    return pa.FixedSizeListArray.from_arrays(pa.array(matriz.ravel()), matriz.shape[1])
+
+class _EscritorArrow:
+    """Grava lotes de registros em Arrow IPC (arquivo) ou Parquet"""
+
+    def __init__(self, caminho, schema, tipo):
+        self.pa = _pyarrow()
+        self.tipo = tipo
+        if tipo == 'parquet':
+            import pyarrow.parquet as pq
+            self._escritor = pq.ParquetWriter(caminho, schema)
+        else:
+            self._arquivo = self.pa.OSFile(caminho, 'wb')
+            self._escritor = self.pa.ipc.new_file(self._arquivo, schema)
+
+    def escrever(self, lote_registros):
+        if self.tipo == 'parquet':
+            self._escritor.write_batch(lote_registros, row_group_size=LINHAS_POR_BLOCO)
+        else:
+            self._escritor.write_batch(lote_registros)
+
+    def fechar(self):
+        self._escritor.close()
+        if self.tipo != 'parquet':
+            self._arquivo.close()
+
+class _EscritorNpz:
+    """Grava um NPZ sem compressão acrescentando blocos ao longo do primeiro eixo.
+
+    Cada vetor é acumulado em um arquivo cru temporário; fechar() monta o NPZ copiando
+    esses arquivos em blocos, com os cabeçalhos .npy já com as formas finais.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._diretorio = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(caminho)), prefix='.npz-')
+        self._vetores = {}  # nome: (arquivo aberto, dtype, forma sem o primeiro eixo, linhas)
+        self._fixos = {}
+
+    def fixo(self, nome, valor):
+        """Vetor gravado uma única vez (ex.: nomes das estratégias, metadados)"""
+        self._fixos[nome] = np.asarray(valor)
+
+    def acrescentar(self, nome, bloco):
+        bloco = np.ascontiguousarray(bloco)
+        if nome not in self._vetores:
+            arquivo = open(os.path.join(self._diretorio, f'{nome}.raw'), 'wb')
+            self._vetores[nome] = [arquivo, bloco.dtype, bloco.shape[1:], 0]
+        registro = self._vetores[nome]
+        if bloco.dtype != registro[1] or bloco.shape[1:] != registro[2]:
+            raise ValueError(f"Bloco de {nome} com tipo ou forma diferente dos anteriores")
+        bloco.tofile(registro[0])
+        registro[3] += len(bloco)
+
+    def fechar(self):
+        try:
+            with zipfile.ZipFile(self.caminho, 'w', zipfile.ZIP_STORED, allowZip64=True) as destino:
+                for nome, valor in self._fixos.items():
+                    with destino.open(f'{nome}.npy', 'w', force_zip64=True) as membro:
+                        np.lib.format.write_array(membro, valor, allow_pickle=False)
+                for nome, (arquivo, dtype, forma, linhas) in self._vetores.items():
+                    arquivo.close()
+                    with destino.open(f'{nome}.npy', 'w', force_zip64=True) as membro:
+                        np.lib.format.write_array_header_2_0(membro, {
+                            'descr': np.lib.format.dtype_to_descr(dtype),
+                            'fortran_order': False,
+                            'shape': (linhas,) + tuple(forma)
+                        })
+                        with open(arquivo.name, 'rb') as cru:
+                            shutil.copyfileobj(cru, membro, 16 << 20)
+        finally:
+            for arquivo, *_ in self._vetores.values():
+                arquivo.close()
+            shutil.rmtree(self._diretorio, ignore_errors=True)
+
+def _gravar_npz(caminho, vetores):
+    with escrita_atomica(caminho) as temporario:
+        # np.savez grava sem compressão; o nome temporário já termina em .npz
+        np.savez(temporario, **vetores)
+
+def ler_npz(caminho):
+    """Vetores de um NPZ sem compressão, mapeados em memória (np.memmap) sem cópia"""
+    vetores = {}
+    with zipfile.ZipFile(caminho) as arquivo_zip, open(caminho, 'rb') as arquivo:
+        for membro in arquivo_zip.infolist():
+            nome = membro.filename[:-4] if membro.filename.endswith('.npy') else membro.filename
+            if membro.compress_type != zipfile.ZIP_STORED:
+                vetores[nome] = np.load(arquivo_zip.open(membro), allow_pickle=False)
+                continue
+            # Cabeçalho local do zip: 30 bytes fixos + nome + campo extra
+            arquivo.seek(membro.header_offset + 26)
+            tamanho_nome, tamanho_extra = struct.unpack('<HH', arquivo.read(4))
+            arquivo.seek(membro.header_offset + 30 + tamanho_nome + tamanho_extra)
+            versao = np.lib.format.read_magic(arquivo)
+            if versao == (1, 0):
+                forma, fortran, dtype = np.lib.format.read_array_header_1_0(arquivo)
+            else:
+                forma, fortran, dtype = np.lib.format.read_array_header_2_0(arquivo)
+            if dtype.hasobject or 0 in forma or not forma:
+                arquivo.seek(membro.header_offset + 30 + tamanho_nome + tamanho_extra)
+                vetores[nome] = np.lib.format.read_array(arquivo, allow_pickle=False)
+                continue
+            vetores[nome] = np.memmap(caminho, dtype=dtype, mode='r', offset=arquivo.tell(), shape=forma,
+                                      order='F' if fortran else 'C')
+    return vetores
+
+def _metadados_npz(metadados):
+    return np.array(json.dumps(metadados, ensure_ascii=False))
+
+def _ler_metadados_npz(vetores):
+    return json.loads(str(vetores.pop('metadados')[()]))
+
+def exportar_resultados(resultados, caminho):
+    """Grava as séries de todas as estratégias de uma execução (ResultadosSimulacao)"""
+    tipo = formato(caminho)
+    metadados = {'tipo': 'resultados', 'estrategias': list(resultados.estrategias),
+                 'mensagens': resultados.mensagens}
+    if tipo == 'npz':
+        _gravar_npz(caminho, {'estrategias': np.array(resultados.estrategias), 'dias': resultados.dias,
+                              'dolar': resultados.dolar, 'reservas': resultados.reservas,
+                              'metadados': _metadados_npz(metadados)})
+        return
+
+    pa = _pyarrow()
+    schema = pa.schema([
+        ('estrategia', pa.dictionary(pa.int32(), pa.string())),
+        ('dia', pa.int64()),
+        ('dolar', pa.float64()),
+        ('reservas', pa.float64())
+    ], metadata={CHAVE_METADADOS: json.dumps(metadados, ensure_ascii=False)})
+    n_dias = len(resultados.dias)
+    with escrita_atomica(caminho) as temporario:
+        escritor = _EscritorArrow(temporario, schema, tipo)
+        try:
+            for i, estrategia in enumerate(resultados.estrategias):
+                for inicio in range(0, n_dias, LINHAS_POR_BLOCO):
+                    fatia = slice(inicio, inicio + LINHAS_POR_BLOCO)
+                    dias = resultados.dias[fatia]
+                    escritor.escrever(pa.record_batch([
+                        _estrategias_arrow(pa, np.full(len(dias), i, dtype=np.int32), resultados.estrategias),
+                        pa.array(dias, pa.int64()),
+                        pa.array(resultados.dolar[i, fatia]),
+                        pa.array(resultados.reservas[i, fatia])
+                    ], schema=schema))
+        finally:
+            escritor.fechar()
+
+class EscritorLote:
+    """Grava resultados de lote.simular_lote bloco a bloco no arquivo indicado.
+
+    n_dias fixa a largura das trajetórias (maior horizonte do lote); por padrão vem do
+    primeiro bloco, e blocos mais curtos são completados com NaN.
+    """
+
+    def __init__(self, caminho, estrategias, n_dias=None, com_dolar=None):
+        self.caminho = caminho
+        self.tipo = formato(caminho)
+        self.estrategias = tuple(estrategias)
+        self.n_dias = n_dias
+        self.com_dolar = com_dolar
+        self.n_cenarios = 0
+        self._contexto = escrita_atomica(caminho)
+        self._temporario = self._contexto.__enter__()
+        self._escritor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreio):
+        self.fechar(descartar=tipo_erro is not None)
+
+    def _abrir(self):
+        metadados = {'tipo': 'lote', 'estrategias': list(self.estrategias), 'n_dias': self.n_dias}
+        if self.tipo == 'npz':
+            self._escritor = _EscritorNpz(self._temporario)
+            self._escritor.fixo('estrategias', np.array(self.estrategias))
+            self._escritor.fixo('metadados', _metadados_npz(metadados))
+            return
+        pa = self.pa = _pyarrow()
+        campos = [
+            ('cenario', pa.int64()),
+            ('estrategia', pa.dictionary(pa.int32(), pa.string())),
+            ('initial_reserves', pa.float64()),
+            ('burn_rate', pa.float64()),
+            ('market_sentiment', pa.float64()),
+            ('days_to_predict', pa.int64()),
+            ('reserva_final', pa.float64()),
+            ('dia_esgotamento', pa.int64()),
+            ('reservas', pa.list_(pa.float64(), self.n_dias + 1))
+        ]
+        if self.com_dolar:
+            campos.append(('dolar', pa.list_(pa.float64(), self.n_dias)))
+        self.schema = pa.schema(campos, metadata={CHAVE_METADADOS: json.dumps(metadados, ensure_ascii=False)})
+        self._escritor = _EscritorArrow(self._temporario, self.schema, self.tipo)
+
+    def _completar(self, matriz, largura):
+        """Completa com NaN (ou recusa) trajetórias de um bloco com horizonte diferente"""
+        if matriz.shape[2] > largura:
+            raise ValueError(f"Bloco com horizonte maior que n_dias={self.n_dias}")
+        if matriz.shape[2] < largura:
+            matriz = np.pad(matriz, ((0, 0), (0, 0), (0, largura - matriz.shape[2])), constant_values=np.nan)
+        return matriz
+
+    def escrever(self, calculado):
+        """Acrescenta um bloco de cenários (dicionário devolvido por lote.simular_lote)"""
+        if tuple(calculado['estrategias']) != self.estrategias:
+            raise ValueError("O bloco tem estratégias diferentes das do arquivo")
+        if self._escritor is None:
+            if self.n_dias is None:
+                self.n_dias = calculado['reservas'].shape[2] - 1
+            if self.com_dolar is None:
+                self.com_dolar = 'dolar' in calculado
+            self._abrir()
+        reservas = self._completar(calculado['reservas'], self.n_dias + 1)
+        dolar = self._completar(calculado['dolar'], self.n_dias) if self.com_dolar else None
+        n = len(calculado['initial_reserves'])
+
+        if self.tipo == 'npz':
+            for campo in CAMPOS_CENARIO + ('reserva_final', 'dia_esgotamento'):
+                self._escritor.acrescentar(campo, calculado[campo])
+            self._escritor.acrescentar('reservas', reservas)
+            if self.com_dolar:
+                self._escritor.acrescentar('dolar', dolar)
+        else:
+            pa = self.pa
+            n_estrategias = len(self.estrategias)
+            # Linhas em ordem cenário × estratégia, como as matrizes (S, E, ...)
+            colunas = [
+                pa.array(np.repeat(np.arange(self.n_cenarios, self.n_cenarios + n), n_estrategias)),
+                _estrategias_arrow(pa, np.tile(np.arange(n_estrategias, dtype=np.int32), n), self.estrategias)
+            ]
+            colunas += [pa.array(np.repeat(np.asarray(calculado[campo]), n_estrategias)) for campo in CAMPOS_CENARIO]
+            colunas += [pa.array(np.asarray(calculado['reserva_final'], dtype=np.float64).ravel()),
+                        pa.array(np.asarray(calculado['dia_esgotamento'], dtype=np.int64).ravel()),
+                        _lista_fixa(pa, reservas.reshape(n * n_estrategias, -1))]
+            if self.com_dolar:
+                colunas.append(_lista_fixa(pa, dolar.reshape(n * n_estrategias, -1)))
+            escrever = self._escritor.escrever
+            lote_registros = pa.record_batch(colunas, schema=self.schema)
+            for inicio in range(0, len(lote_registros), LINHAS_POR_BLOCO):
+                escrever(lote_registros.slice(inicio, LINHAS_POR_BLOCO))
+        self.n_cenarios += n
+
+    def fechar(self, descartar=False):
+        if self._temporario is None:
+            return
+        try:
+            if self._escritor is not None:
+                self._escritor.fechar()
+            elif not descartar:
+                raise ValueError("Nenhum bloco foi gravado")
+        except BaseException as erro:
+            self._contexto.__exit__(type(erro), erro, erro.__traceback__)
+            raise
+        else:
+            if descartar:
+                self._contexto.__exit__(RuntimeError, RuntimeError(), None)
+            else:
+                self._contexto.__exit__(None, None, None)
+        finally:
+            self._temporario = None
+
+def exportar_lote(calculado, caminho):
+    """Grava o resultado completo de lote.simular_lote (ou paralelo.simular_lote_paralelo)"""
+    with EscritorLote(caminho, calculado['estrategias']) as escritor:
+        escritor.escrever(calculado)
+
+def exportar_cenarios(caminho, initial_reserves, burn_rate, market_sentiment, days_to_predict,
+                      dollar_values=None, estrategias=None, tamanho_bloco=None):
+    """Simula os cenários em blocos e grava cada bloco assim que calculado; retorna o número de cenários"""
+    tamanho_bloco = configuracoes.TAMANHO_BLOCO if tamanho_bloco is None else tamanho_bloco
+    vetores = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(initial_reserves, dtype=np.float64)),
+        np.atleast_1d(np.asarray(burn_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(market_sentiment, dtype=np.float64)),
+        np.atleast_1d(np.asarray(days_to_predict, dtype=np.int64))
+    )
+    if len(vetores[0]) == 0:
+        raise ValueError("Nenhum cenário para exportar")
+    escritor = None
+    try:
+        for inicio in range(0, len(vetores[0]), tamanho_bloco):
+            bloco = [v[inicio:inicio + tamanho_bloco] for v in vetores]
+            calculado = lote.simular_lote(*bloco, dollar_values=dollar_values, estrategias=estrategias)
+            if escritor is None:
+                escritor = EscritorLote(caminho, calculado['estrategias'], n_dias=int(vetores[3].max()),
+                                        com_dolar=dollar_values is not None)
+            escritor.escrever(calculado)
+    except BaseException:
+        if escritor is not None:
+            escritor.fechar(descartar=True)
+        raise
+    escritor.fechar()
+    return escritor.n_cenarios
+
+def exportar_monte_carlo(resultado, caminho):
+    """Grava os percentis diários, as contagens de esgotamento e os escalares de simular_monte_carlo"""
+    tipo = formato(caminho)
+    estrategias = list(resultado['estrategias'])
+    metadados = {
+        'tipo': 'monte_carlo',
+        'estrategias': estrategias,
+        'percentis': [float(p) for p in resultado['percentis']],
+        'n_caminhos': int(resultado['n_caminhos']),
+        'prob_esgotamento': resultado['prob_esgotamento'],
+        'fora_da_faixa': {e: int(v) for e, v in resultado['fora_da_faixa'].items()}
+    }
+    dolar = np.stack([resultado['dolar'][e] for e in estrategias])
+    reservas = np.stack([resultado['reservas'][e] for e in estrategias])
+    esgotamento = np.stack([resultado['esgotamento'][e] for e in estrategias])
+    if tipo == 'npz':
+        _gravar_npz(caminho, {'estrategias': np.array(estrategias), 'percentis': np.asarray(resultado['percentis']),
+                              'dias': resultado['dias'], 'dolar': dolar, 'reservas': reservas,
+                              'esgotamento': esgotamento, 'metadados': _metadados_npz(metadados)})
+        return
+
+    pa = _pyarrow()
+    metadados['esgotamento'] = {e: esgotamento[i].tolist() for i, e in enumerate(estrategias)}
+    n_dias = len(resultado['dias'])
+    n_percentis = len(resultado['percentis'])
+    schema = pa.schema([
+        ('estrategia', pa.dictionary(pa.int32(), pa.string())),
+        ('percentil', pa.float64()),
+        ('dolar', pa.list_(pa.float64(), n_dias)),
+        ('reservas', pa.list_(pa.float64(), n_dias))
+    ], metadata={CHAVE_METADADOS: json.dumps(metadados, ensure_ascii=False)})
+    registros = pa.record_batch([
+        _estrategias_arrow(pa, np.repeat(np.arange(len(estrategias), dtype=np.int32), n_percentis), estrategias),
+        pa.array(np.tile(np.asarray(resultado['percentis'], dtype=np.float64), len(estrategias))),
+        _lista_fixa(pa, dolar.reshape(-1, n_dias)),
+        _lista_fixa(pa, reservas.reshape(-1, n_dias))
+    ], schema=schema)
+    with escrita_atomica(caminho) as temporario:
+        escritor = _EscritorArrow(temporario, schema, tipo)
+        try:
+            escritor.escrever(registros)
+        finally:
+            escritor.fechar()
+
+def ler(caminho):
+    """Abre o arquivo mapeado em memória: pyarrow.Table (Arrow/Parquet) ou dicionário de np.memmap (NPZ)"""
+    tipo = formato(caminho)
+    if tipo == 'npz':
+        return ler_npz(caminho)
+    pa = _pyarrow()
+    if tipo == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(caminho, memory_map=True)
+    with pa.memory_map(caminho, 'r') as origem:
+        return pa.ipc.open_file(origem).read_all()
+
+def _metadados_tabela(tabela):
+    return json.loads(tabela.schema.metadata[CHAVE_METADADOS])
+
+def _coluna(tabela, nome, largura=None):
+    """Coluna como ndarray: sem cópia quando há um único bloco; listas fixas viram matrizes"""
+    blocos = tabela.column(nome).chunks
+    if largura is not None:
+        blocos = [bloco.flatten() for bloco in blocos]
+    partes = [bloco.to_numpy(zero_copy_only=False) for bloco in blocos]
+    valores = partes[0] if len(partes) == 1 else np.concatenate(partes)
+    return valores.reshape(-1, largura) if largura is not None else valores
+
+def _abrir(caminho, tipo_esperado):
+    dados = ler(caminho)
+    if isinstance(dados, dict):
+        metadados = _ler_metadados_npz(dados)
+    else:
+        metadados = _metadados_tabela(dados)
+    if metadados['tipo'] != tipo_esperado:
+        raise ValueError(f"{caminho} contém resultados do tipo '{metadados['tipo']}', não '{tipo_esperado}'")
+    return dados, metadados
+
+def ler_resultados(caminho):
+    """ResultadosSimulacao gravado por exportar_resultados"""
+    dados, metadados = _abrir(caminho, 'resultados')
+    estrategias = metadados['estrategias']
+    if isinstance(dados, dict):
+        dolar, reservas = dados['dolar'], dados['reservas']
+    else:
+        dolar = _coluna(dados, 'dolar').reshape(len(estrategias), -1)
+        reservas = _coluna(dados, 'reservas').reshape(len(estrategias), -1)
+    return ResultadosSimulacao(estrategias, dolar, reservas, metadados['mensagens'])
+
+def ler_lote(caminho):
+    """Dicionário no formato de lote.simular_lote (matrizes cenário × estratégia × dia)"""
+    dados, metadados = _abrir(caminho, 'lote')
+    estrategias = tuple(metadados['estrategias'])
+    if isinstance(dados, dict):
+        dados.pop('estrategias', None)
+        return {'estrategias': estrategias, **dados}
+
+    n_estrategias = len(estrategias)
+    n_dias = metadados['n_dias']
+    resultado = {'estrategias': estrategias}
+    for campo in CAMPOS_CENARIO:
+        resultado[campo] = _coluna(dados, campo)[::n_estrategias]
+    resultado['reservas'] = _coluna(dados, 'reservas', n_dias + 1).reshape(-1, n_estrategias, n_dias + 1)
+    resultado['reserva_final'] = _coluna(dados, 'reserva_final').reshape(-1, n_estrategias)
+    resultado['dia_esgotamento'] = _coluna(dados, 'dia_esgotamento').reshape(-1, n_estrategias)
+    if 'dolar' in dados.column_names:
+        resultado['dolar'] = _coluna(dados, 'dolar', n_dias).reshape(-1, n_estrategias, n_dias)
+    return resultado
+
+def ler_monte_carlo(caminho):
+    """Dicionário no formato de monte_carlo.simular_monte_carlo"""
+    dados, metadados = _abrir(caminho, 'monte_carlo')
+    estrategias = metadados['estrategias']
+    n_percentis = len(metadados['percentis'])
+    if isinstance(dados, dict):
+        dias = dados['dias']
+        dolar, reservas, esgotamento = dados['dolar'], dados['reservas'], dados['esgotamento']
+    else:
+        n_dias = dados.schema.field('dolar').type.list_size
+        dias = np.arange(1, n_dias + 1)
+        dolar = _coluna(dados, 'dolar', n_dias).reshape(len(estrategias), n_percentis, n_dias)
+        reservas = _coluna(dados, 'reservas', n_dias).reshape(len(estrategias), n_percentis, n_dias)
+        esgotamento = np.array([metadados['esgotamento'][e] for e in estrategias], dtype=np.int64)
+    return {
+        'estrategias': estrategias,
+        'percentis': tuple(metadados['percentis']),
+        'dias': dias,
+        'dolar': {e: dolar[i] for i, e in enumerate(estrategias)},
+        'reservas': {e: reservas[i] for i, e in enumerate(estrategias)},
+        'esgotamento': {e: esgotamento[i] for i, e in enumerate(estrategias)},
+        'prob_esgotamento': metadados['prob_esgotamento'],
+        'fora_da_faixa': metadados['fora_da_faixa'],
+        'n_caminhos': metadados['n_caminhos']
+    }
@@ -0,0 +1,162 @@
+"""Carga em massa de históricos do dólar a partir de arquivos CSV, Parquet ou binários.
+
+Arquivos binários (.npy, ou vetores crus .bin/.raw/.f64/.f32) são mapeados em memória
+e entregues sem cópia. CSV e Parquet são lidos em blocos e convertidos uma única vez
+para um vetor float64 cru em DIRETORIO_CACHE/historicos (chave: caminho, tamanho, data
+de modificação e opções de leitura); leituras seguintes apenas mapeiam esse arquivo.
+Essas cópias entram no limite LIMITE_CACHE_MB do cache, com remoção LRU: versões
+antigas de um histórico atualizado diariamente deixam de ser usadas e são removidas.
+A memória usada na conversão é limitada pelo tamanho do bloco, não pelo arquivo.
+Cotações NaN ou infinitas (inclusive células vazias) são recusadas com ValueError,
+verificadas bloco a bloco.
+
+O resultado é um ndarray somente leitura (np.memmap) que simulacao.prever_dolar
+consome sem copiar.
+"""
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+from src import cache, configuracoes
+from src.utils import escrita_atomica
+
+TAMANHO_BLOCO_LEITURA = 1_000_000
+EXTENSOES_BINARIAS = {'.bin': np.float64, '.raw': np.float64, '.f64': np.float64, '.f32': np.float32}
+
+def carregar_historico(caminho, coluna=None, separador=None, decimal=None, dtype=None,
+                       tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+    """Carrega as cotações do arquivo, escolhendo o leitor pela extensão.
+
+    coluna: nome ou índice da coluna com as cotações (CSV/Parquet); por padrão, a última.
+    separador/decimal: detectados na primeira linha do CSV quando não informados.
+    dtype: tipo dos vetores binários crus (padrão pela extensão, float64 para .bin/.raw).
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.npy':
+        valores = np.load(caminho, mmap_mode='r')
+    elif extensao in EXTENSOES_BINARIAS:
+        valores = ler_binario(caminho, dtype or EXTENSOES_BINARIAS[extensao])
+    elif extensao in ('.parquet', '.pq'):
+        valores = ler_parquet(caminho, coluna, tamanho_bloco)
+    else:
+        valores = ler_csv(caminho, coluna, separador, decimal, tamanho_bloco)
+
+    if valores.ndim != 1:
+        raise ValueError(f"O histórico deve ser um vetor, mas {caminho} tem forma {valores.shape}")
+    if extensao == '.npy' or extensao in EXTENSOES_BINARIAS:
+        # Vetores mapeados não passam pela conversão: a verificação percorre o mapa em blocos
+        for inicio in range(0, len(valores), tamanho_bloco):
+            _verificar_finitos(valores[inicio:inicio + tamanho_bloco], caminho, inicio)
+    return valores
+
+def _verificar_finitos(bloco, caminho, inicio):
+    finitos = np.isfinite(bloco)
+    if not finitos.all():
+        posicao = inicio + int(np.argmin(finitos))
+        raise ValueError(f"{caminho}: cotação inválida (NaN ou infinita) na posição {posicao}")
+
+def ler_binario(caminho, dtype=np.float64):
+    """Mapeia em memória um vetor cru de floats (ordem de bytes nativa)"""
+    if os.path.getsize(caminho) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(caminho, dtype=dtype, mode='r')
+
+def _chave_conversao(caminho, opcoes):
+    estado = os.stat(caminho)
+    descricao = json.dumps([os.path.abspath(caminho), estado.st_size, estado.st_mtime_ns, opcoes],
+                           ensure_ascii=False, default=str)
+    return hashlib.sha256(descricao.encode('utf-8')).hexdigest()
+
+def _convertido(caminho, opcoes, blocos):
+    """Grava os blocos (gerador de ndarrays) como vetor float64 cru no cache e o mapeia em memória"""
+    diretorio = os.path.join(configuracoes.DIRETORIO_CACHE, 'historicos')
+    destino = os.path.join(diretorio, f'{_chave_conversao(caminho, opcoes)}.f64')
+    if not cache.marcar_uso(destino):
+        os.makedirs(diretorio, exist_ok=True)
+        with escrita_atomica(destino) as temporario:
+            with open(temporario, 'wb') as arquivo:
+                posicao = 0
+                for bloco in blocos():
+                    bloco = np.ascontiguousarray(bloco, dtype=np.float64)
+                    _verificar_finitos(bloco, caminho, posicao)
+                    bloco.tofile(arquivo)
+                    posicao += len(bloco)
+        cache.remover_excedente(manter=(destino,))
+    return ler_binario(destino)
+
+def _numerico(campo):
+    try:
+        float(campo.strip().replace(',', '.'))
+        return True
+    except ValueError:
+        return False
+
+def detectar_formato_csv(caminho):
+    """(separador, decimal, tem_cabecalho, n_colunas) a partir das primeiras linhas do arquivo.
+
+    ';' e tabulação têm prioridade como separadores (padrão pt-BR, com vírgula decimal).
+    Sem eles, uma linha com vírgula e ponto usa ',' como separador e '.' como decimal;
+    uma linha só com vírgula é tratada como coluna única com vírgula decimal ('5,23').
+    """
+    with open(caminho, encoding='utf-8-sig') as arquivo:
+        primeira = arquivo.readline().strip()
+        segunda = arquivo.readline().strip()
+    cabecalho = not _numerico(re.split(r'[;,\t]', primeira)[-1])
+    dados = segunda if cabecalho else primeira
+
+    if ';' in primeira or '\t' in primeira:
+        separador = ';' if ';' in primeira else '\t'
+        decimal = ',' if ',' in dados else '.'
+    elif ',' in (primeira if cabecalho else dados) and (cabecalho or '.' in dados):
+        separador, decimal = ',', '.'
+    else:
+        # Coluna única: o separador informado ao leitor nunca aparece no arquivo
+        separador = ';'
+        decimal = ',' if ',' in dados else '.'
+    return separador, decimal, cabecalho, len(primeira.split(separador))
+
+def ler_csv(caminho, coluna=None, separador=None, decimal=None, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+    """Lê a coluna de cotações de um CSV em blocos (aceita vírgula decimal, ex.: '5,23;...')"""
+    import pandas as pd
+
+    separador_detectado, decimal_detectado, cabecalho, n_colunas = detectar_formato_csv(caminho)
+    separador = separador or separador_detectado
+    decimal = decimal or decimal_detectado
+    if coluna is None:
+        coluna = n_colunas - 1
+    if isinstance(coluna, str) and not cabecalho:
+        raise ValueError(f"{caminho} não tem cabeçalho; informe a coluna pelo índice")
+
+    def blocos():
+        leitor = pd.read_csv(
+            caminho, sep=separador, decimal=decimal, thousands='.' if decimal == ',' else None,
+            header=0 if cabecalho else None, usecols=[coluna], chunksize=tamanho_bloco,
+            encoding='utf-8-sig', engine='c'
+        )
+        with leitor:
+            for bloco in leitor:
+                yield pd.to_numeric(bloco.iloc[:, 0], errors='raise').to_numpy(dtype=np.float64)
+
+    return _convertido(caminho, ['csv', coluna, separador, decimal], blocos)
+
+def ler_parquet(caminho, coluna=None, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+    """Lê a coluna de cotações de um Parquet por lotes (requer pyarrow)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as erro:
+        raise ValueError("A leitura de Parquet requer o pacote pyarrow") from erro
+
+    arquivo = pq.ParquetFile(caminho)
+    nomes = arquivo.schema_arrow.names
+    if coluna is None:
+        coluna = nomes[-1]
+    elif not isinstance(coluna, str):
+        coluna = nomes[coluna]
+
+    def blocos():
+        for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=[coluna]):
+            yield lote.column(0).to_numpy(zero_copy_only=False)
+
+    return _convertido(caminho, ['parquet', coluna], blocos)
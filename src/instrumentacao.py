@@ -0,0 +1,190 @@
+"""Instrumentação dos trechos críticos: tempo de parede, tempo de CPU e memória.
+
+Desligada por padrão (SIMULADOR_INSTRUMENTACAO=1 ou ativar() ligam). Desligada,
+medir() devolve sempre o mesmo contexto nulo e o custo é o de uma chamada de função.
+Ligada, cada bloco medido gera um registro com etapa, rótulos (ex.: estratégia),
+wall_s, cpu_s e rss_pico_bytes (pico de memória residente do processo até o fim do
+bloco, via resource.getrusage; None onde o módulo não existe, como no Windows).
+Blocos aninhados indicam o bloco pai.
+
+O pico de alocações de cada bloco (memoria_pico_bytes, pelo tracemalloc, incluindo as
+do NumPy) é opcional (SIMULADOR_INSTRUMENTACAO_MEMORIA=1 ou ativar(memoria=True)): o
+tracemalloc multiplica o tempo de trechos com muitas alocações e distorce wall_s e
+cpu_s, então fica fora das medições de tempo usadas para acompanhar regressões.
+
+Trabalho executado em outros processos é medido com medido(), que devolve os
+registros do processo filho junto com o resultado para serem incorporados aqui.
+"""
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from functools import partial
+
+from src import configuracoes
+from src.utils import escrita_atomica
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_NULO = nullcontext()
+_ativa = configuracoes.INSTRUMENTACAO
+_memoria = configuracoes.INSTRUMENTACAO_MEMORIA
+_registros = []
+_pilha = []
+
+def ativa():
+    return _ativa
+
+def ativar(memoria=None):
+    """Liga a instrumentação; memoria=True liga também o pico de alocações por bloco (tracemalloc)"""
+    global _ativa, _memoria
+    _ativa = True
+    if memoria is not None:
+        _memoria = memoria
+
+def desativar():
+    global _ativa
+    _ativa = False
+    if tracemalloc.is_tracing() and not _pilha:
+        tracemalloc.stop()
+
+def _rss_pico():
+    """Pico de memória residente do processo em bytes (ru_maxrss vem em KiB no Linux)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+def limpar():
+    """Descarta os registros acumulados"""
+    _registros.clear()
+
+def registros():
+    return list(_registros)
+
+def medir(etapa, **rotulos):
+    """Contexto que mede o bloco como etapa; sem efeito quando a instrumentação está desligada"""
+    if not _ativa:
+        return _NULO
+    return _medir(etapa, rotulos)
+
+@contextmanager
+def _medir(etapa, rotulos):
+    if _memoria:
+        with _rastrear_alocacoes(etapa, rotulos):
+            yield
+        return
+    _pilha.append({'etapa': etapa})
+    inicio_parede = time.perf_counter()
+    inicio_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - inicio_parede
+        cpu = time.process_time() - inicio_cpu
+        _pilha.pop()
+        _registrar(etapa, rotulos, wall, cpu)
+
+def _registrar(etapa, rotulos, wall, cpu, **extras):
+    _registros.append({
+        'etapa': etapa,
+        **rotulos,
+        'pai': _pilha[-1]['etapa'] if _pilha else None,
+        'wall_s': wall,
+        'cpu_s': cpu,
+        'rss_pico_bytes': _rss_pico(),
+        **extras,
+        'pid': os.getpid()
+    })
+
+@contextmanager
+def _rastrear_alocacoes(etapa, rotulos):
+    iniciou = not tracemalloc.is_tracing()
+    if iniciou:
+        tracemalloc.start()
+    atual, pico = tracemalloc.get_traced_memory()
+    if _pilha and 'pico' in _pilha[-1]:
+        _pilha[-1]['pico'] = max(_pilha[-1]['pico'], pico)
+    tracemalloc.reset_peak()
+    quadro = {'etapa': etapa, 'pico': atual}
+    _pilha.append(quadro)
+    inicio_parede = time.perf_counter()
+    inicio_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - inicio_parede
+        cpu = time.process_time() - inicio_cpu
+        _, pico = tracemalloc.get_traced_memory()
+        if iniciou:
+            # Sem blocos abertos, o rastreamento (e seu custo) não continua ligado
+            tracemalloc.stop()
+        _pilha.pop()
+        quadro['pico'] = max(quadro['pico'], pico)
+        if _pilha and 'pico' in _pilha[-1]:
+            _pilha[-1]['pico'] = max(_pilha[-1]['pico'], quadro['pico'])
+        _registrar(etapa, rotulos, wall, cpu, memoria_pico_bytes=quadro['pico'] - atual)
+
+def incorporar(novos):
+    """Acrescenta registros produzidos em outro processo"""
+    _registros.extend(novos)
+
+def medido(funcao, etapa=None, **rotulos):
+    """Envolve funcao para execução em outro processo: a chamada retorna (resultado, registros do filho).
+
+    Com etapa, a chamada inteira também é medida; sem ela, só os blocos internos.
+    """
+    return partial(_executar_medido, funcao, etapa, rotulos, _memoria)
+
+def _executar_medido(funcao, etapa, rotulos, memoria, *args, **kwargs):
+    global _ativa, _memoria
+    anteriores = len(_registros)
+    estado, _ativa = _ativa, True
+    estado_memoria, _memoria = _memoria, memoria
+    try:
+        with medir(etapa, **rotulos) if etapa else _NULO:
+            resultado = funcao(*args, **kwargs)
+    finally:
+        _ativa, _memoria = estado, estado_memoria
+    novos = _registros[anteriores:]
+    del _registros[anteriores:]
+    return resultado, novos
+
+def resumo():
+    """Totais por etapa: chamadas, wall_s, cpu_s e maiores picos de memória registrados"""
+    totais = {}
+    for registro in _registros:
+        total = totais.setdefault(registro['etapa'], {'chamadas': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+        total['chamadas'] += 1
+        total['wall_s'] += registro['wall_s']
+        total['cpu_s'] += registro['cpu_s']
+        for campo in ('rss_pico_bytes', 'memoria_pico_bytes'):
+            if registro.get(campo) is not None:
+                total[campo] = max(total.get(campo, 0), registro[campo])
+    return totais
+
+def salvar_json(caminho):
+    """Grava registros e resumo em JSON"""
+    with escrita_atomica(caminho) as temporario:
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump({'registros': _registros, 'resumo': resumo()}, arquivo, ensure_ascii=False, indent=2)
+
+@contextmanager
+def perfilar(caminho):
+    """Executa o bloco sob cProfile e grava as estatísticas (pstats) em caminho; caminho vazio não perfila"""
+    if not caminho:
+        yield
+        return
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield
+    finally:
+        perfil.disable()
+        perfil.dump_stats(caminho)
@@ -1,9 +1,28 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import os
+import queue
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src import estrategias as registro, ingestao
+
+# Intervalo (ms) de consulta ao andamento da simulação em segundo plano
+INTERVALO_ACOMPANHAMENTO = 100
+
+_executor = None
+
+def _obter_executor():
+    """Executor de uma thread: as simulações rodam fora da thread do Tk, uma de cada vez"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='simulacao')
+    return _executor
 
 def criar_interface(callback):
+    """Cria a janela principal. callback(dados, progresso, cancelamento) executa a simulação
+    em segundo plano, chamando progresso(texto) a cada etapa e verificando cancelamento
+    (threading.Event) entre as etapas."""
     root = tk.Tk()
     root.title("Simulador Econômico - Entrada de Dados")
     root.geometry("700x550")
@@ -51,7 +70,7 @@ def criar_interface(callback):
     # Componentes da interface
     labels = [
         ("Valores históricos do dólar (separados por vírgula):", 'dollar_values',
-         "Ex: 5.00,5.05,5.10,5.15 (valores em reais)"),
+         "Ex: 5.00,5.05,5.10,5.15 (valores em reais) ou arquivo CSV/Parquet/binário"),
         
         ("Reservas iniciais (bilhões USD):", 'initial_reserves',
          "Ex: 200.00 (valor numérico sem símbolos)"),
@@ -89,17 +108,20 @@ def criar_interface(callback):
             entrada = ttk.Entry(container)
             entrada.grid(row=i*2, column=1, padx=10, pady=5, sticky='ew')
             campos[nome] = entrada
+            if nome == 'dollar_values':
+                ttk.Button(container, text="Arquivo...", command=lambda e=entrada: escolher_arquivo(e)).grid(
+                    row=i*2, column=2, padx=5)
         
         ttk.Label(container, text=exemplo, style="Exemplo.TLabel").grid(
             row=i*2+1, column=1, padx=10, sticky='w')
 
     # Combobox para estratégias
     ttk.Label(container, text="Estratégia:").grid(row=10, column=0, sticky='w')
-    estrategias = ttk.Combobox(container, values=['moderada', 'agressiva', 'inatividade', 'padrão'])
+    estrategias = ttk.Combobox(container, values=list(registro.nomes_estrategias()))
     estrategias.grid(row=10, column=1, padx=10, pady=5, sticky='ew')
     estrategias.set('padrão')
     campos['strategy'] = estrategias
-    ttk.Label(container, text="Ex: moderada (opções: moderada, agressiva, inatividade, padrão)", 
+    ttk.Label(container, text=f"Ex: moderada (opções: {', '.join(registro.nomes_estrategias())})", 
              style="Exemplo.TLabel").grid(row=11, column=1, padx=10, sticky='w')
 
     # Botões
@@ -109,10 +131,28 @@ def criar_interface(callback):
     btn_executar = ttk.Button(
         botoes_frame, 
         text="Executar Simulação", 
-        command=lambda: validar_entradas(campos, callback, status_var, btn_executar, btn_nova, btn_imprimir)
+        command=lambda: validar_entradas(campos, callback, status_var, btn_executar, btn_nova, btn_imprimir,
+                                         root, btn_cancelar, execucao)
     )
     btn_executar.pack(side='left', padx=5)
     
+    # Cancelamento da execução em andamento
+    execucao = {'cancelamento': None}
+    
+    def cancelar_simulacao():
+        if execucao['cancelamento'] is not None:
+            execucao['cancelamento'].set()
+            status_var.set("Cancelando ao fim da etapa atual...")
+            btn_cancelar.config(state="disabled")
+    
+    btn_cancelar = ttk.Button(
+        botoes_frame, 
+        text="Cancelar", 
+        command=cancelar_simulacao,
+        state="disabled"
+    )
+    btn_cancelar.pack(side='left', padx=5)
+    
     btn_nova = ttk.Button(
         botoes_frame, 
         text="Nova Simulação", 
@@ -137,12 +177,35 @@ def criar_interface(callback):
     
     return root
 
-def validar_entradas(campos, callback, status_var, btn_executar, btn_nova, btn_imprimir):
+def escolher_arquivo(entrada):
+    """Preenche o campo do histórico com o caminho de um arquivo de cotações"""
+    caminho = filedialog.askopenfilename(
+        title="Histórico do dólar",
+        filetypes=[("Cotações", "*.csv *.txt *.parquet *.npy *.bin *.f64 *.f32"), ("Todos os arquivos", "*")]
+    )
+    if caminho:
+        entrada.delete(0, tk.END)
+        entrada.insert(0, caminho)
+
+def _executar_com_historico(callback, dados, progresso, cancelamento):
+    """Carrega o histórico informado como arquivo (na thread de trabalho) e executa a simulação"""
+    if isinstance(dados['dollar_values'], str):
+        progresso("Carregando histórico do dólar...")
+        dados = dict(dados, dollar_values=ingestao.carregar_historico(dados['dollar_values']))
+    return callback(dados, progresso, cancelamento)
+
+def validar_entradas(campos, callback, status_var, btn_executar, btn_nova, btn_imprimir,
+                     root, btn_cancelar, execucao):
     try:
-        dollar_values = [
-            float(valor.strip().replace(',', '.')) 
-            for valor in campos['dollar_values'].get().split(',')
-        ]
+        texto_historico = campos['dollar_values'].get().strip()
+        if os.path.isfile(texto_historico):
+            # Arquivos são lidos em segundo plano, junto com a simulação
+            dollar_values = texto_historico
+        else:
+            dollar_values = [
+                float(valor.strip().replace(',', '.')) 
+                for valor in texto_historico.split(',')
+            ]
         
         dados = {
             'dollar_values': dollar_values,
@@ -153,17 +216,48 @@ def validar_entradas(campos, callback, status_var, btn_executar, btn_nova, btn_i
             'strategy': campos['strategy'].get().lower()
         }
         
-        callback(**dados)
-        
-        # Atualizar interface após sucesso
-        btn_executar.config(state="disabled")
-        btn_nova.config(state="normal")
-        btn_imprimir.config(state="normal")
-        status_var.set("Simulação concluída! Relatório PDF e gráficos gerados na pasta raiz.")
-        
     except ValueError as e:
         messagebox.showerror("Erro", f"Dados inválidos: {str(e)}")
         btn_executar.config(state="normal")
+        return
+    
+    # Executar em segundo plano; a thread do Tk apenas acompanha o andamento
+    mensagens = queue.Queue()
+    cancelamento = threading.Event()
+    execucao['cancelamento'] = cancelamento
+    btn_executar.config(state="disabled")
+    btn_cancelar.config(state="normal")
+    status_var.set("Iniciando simulação...")
+    futuro = _obter_executor().submit(_executar_com_historico, callback, dados, mensagens.put, cancelamento)
+    
+    def acompanhar():
+        while not mensagens.empty():
+            if not cancelamento.is_set():
+                status_var.set(mensagens.get_nowait())
+            else:
+                mensagens.get_nowait()
+        
+        if not futuro.done():
+            root.after(INTERVALO_ACOMPANHAMENTO, acompanhar)
+            return
+        
+        execucao['cancelamento'] = None
+        btn_cancelar.config(state="disabled")
+        erro = futuro.exception()
+        if erro is None:
+            # Atualizar interface após sucesso
+            btn_nova.config(state="normal")
+            btn_imprimir.config(state="normal")
+            status_var.set("Simulação concluída! Relatório PDF e gráficos gerados na pasta raiz.")
+        elif cancelamento.is_set():
+            btn_executar.config(state="normal")
+            status_var.set("Simulação cancelada.")
+        else:
+            btn_executar.config(state="normal")
+            status_var.set("")
+            mostrar_erro_direto(f"Falha na simulação: {str(erro)}")
+    
+    root.after(INTERVALO_ACOMPANHAMENTO, acompanhar)
 
 def mostrar_erro_direto(mensagem):
     messagebox.showerror("Erro Crítico", mensagem)
\ No newline at end of file
@@ -0,0 +1,78 @@
+import numpy as np
+from src import estrategias as registro, simulacao
+
+def grade_cenarios(initial_reserves, burn_rate, market_sentiment, days_to_predict):
+    """Gera o produto cartesiano dos eixos de parâmetros, achatado em vetores de cenários."""
+    eixos = np.meshgrid(
+        np.atleast_1d(np.asarray(initial_reserves, dtype=np.float64)),
+        np.atleast_1d(np.asarray(burn_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(market_sentiment, dtype=np.float64)),
+        np.atleast_1d(np.asarray(days_to_predict, dtype=np.int64)),
+        indexing='ij'
+    )
+    return {
+        'initial_reserves': eixos[0].ravel(),
+        'burn_rate': eixos[1].ravel(),
+        'market_sentiment': eixos[2].ravel(),
+        'days_to_predict': eixos[3].ravel()
+    }
+
+def simular_lote(initial_reserves, burn_rate, market_sentiment, days_to_predict,
+                 dollar_values=None, estrategias=None):
+    """Simula todos os cenários e estratégias em uma única passagem (cenário × estratégia × dia).
+
+    Os parâmetros aceitam escalares ou vetores (combinados por broadcast). Cenários com
+    horizonte menor que o máximo recebem NaN nos dias excedentes. O resultado é colunar:
+    um dicionário de ndarrays indexados por cenário e estratégia.
+    """
+    reservas_ini, queima_base, sentimento, horizonte = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(initial_reserves, dtype=np.float64)),
+        np.atleast_1d(np.asarray(burn_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(market_sentiment, dtype=np.float64)),
+        np.atleast_1d(np.asarray(days_to_predict, dtype=np.int64))
+    )
+    if np.any(horizonte <= 0):
+        raise ValueError("O número de dias para previsão deve ser positivo")
+
+    estrategias = tuple(estrategias or registro.nomes_estrategias())
+    n_dias = int(horizonte.max())
+    dias = np.arange(n_dias, dtype=np.float64)
+    ativo = dias[None, :] < horizonte[:, None]  # cenário × dia
+
+    # Queima diária: cenário × estratégia × dia
+    queima = np.empty((len(reservas_ini), len(estrategias), n_dias))
+    kernels = [registro.obter_estrategia(estrategia) for estrategia in estrategias]
+    for j, kernel in enumerate(kernels):
+        queima[:, j, :] = kernel.queima(queima_base[:, None], dias[None, :])
+    queima *= (1 - sentimento * 0.1)[:, None, None]
+    queima *= ativo[:, None, :]
+
+    # Saldo acumulado com piso em zero: o mesmo kernel de simular_reservas, com as
+    # reservas iniciais como primeiro termo da soma (resultado idêntico ao da execução única)
+    reservas = simulacao.saldo_com_piso(reservas_ini[:, None], queima)
+
+    # Dia do esgotamento e saldo final, calculados antes de mascarar os dias excedentes
+    zerado = reservas[:, :, 1:] <= 0
+    dia_esgotamento = np.where(zerado.any(axis=2), zerado.argmax(axis=2) + 1, -1)
+    reserva_final = reservas[:, :, -1].copy()
+    reservas[:, :, 1:][~np.broadcast_to(ativo[:, None, :], queima.shape)] = np.nan
+
+    resultado = {
+        'estrategias': estrategias,
+        'initial_reserves': reservas_ini.copy(),
+        'burn_rate': queima_base.copy(),
+        'market_sentiment': sentimento.copy(),
+        'days_to_predict': horizonte.copy(),
+        'reservas': reservas,
+        'reserva_final': reserva_final,
+        'dia_esgotamento': dia_esgotamento
+    }
+
+    if dollar_values is not None:
+        previsao = simulacao.prever_dolar(dollar_values, n_dias)
+        fatores = np.stack([kernel.fator_dolar(dias) for kernel in kernels])
+        dolar = (previsao * fatores)[None, :, :] * (1 + sentimento * 0.01)[:, None, None]
+        dolar[~np.broadcast_to(ativo[:, None, :], dolar.shape)] = np.nan
+        resultado['dolar'] = dolar
+
+    return resultado
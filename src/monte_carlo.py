@@ -0,0 +1,133 @@
+import numpy as np
+from src import estrategias as registro, simulacao
+
+PERCENTIS = (5, 25, 50, 75, 95)
+
+class _HistogramaDiario:
+    """Histograma por dia com faixas fixas, para estimar percentis com memória limitada.
+
+    As faixas são definidas pelo primeiro bloco (com margem); valores fora delas são
+    acumulados nas classes extremas e contados em fora_da_faixa. Com piso, os valores
+    iguais a ele são contados à parte e os percentis que caem nessa massa valem
+    exatamente o piso (ex.: reservas esgotadas), sem interpolação.
+    """
+
+    def __init__(self, amostra, n_classes, margem=0.25, piso=None):
+        minimo = np.nanmin(amostra, axis=0)
+        maximo = np.nanmax(amostra, axis=0)
+        folga = np.maximum((maximo - minimo) * margem, 1e-9 + np.abs(maximo) * 1e-6)
+        self.inicio = minimo - folga
+        self.largura = (maximo + folga - self.inicio) / n_classes
+        self.n_classes = n_classes
+        self.contagens = np.zeros((amostra.shape[1], n_classes), dtype=np.int64)
+        self.fora_da_faixa = 0
+        self.piso = piso
+        self.no_piso = np.zeros(amostra.shape[1], dtype=np.int64)
+
+    def acumular(self, bloco):
+        classes = np.floor((bloco - self.inicio) / self.largura)
+        self.fora_da_faixa += int(np.count_nonzero((classes < 0) | (classes >= self.n_classes)))
+        classes = np.clip(classes, 0, self.n_classes - 1).astype(np.int64)
+        classes += np.arange(bloco.shape[1]) * self.n_classes
+        self.contagens += np.bincount(classes.ravel(), minlength=self.contagens.size).reshape(self.contagens.shape)
+        if self.piso is not None:
+            self.no_piso += np.count_nonzero(bloco <= self.piso, axis=0)
+
+    def percentis(self, percentis):
+        """Percentis por dia, interpolando linearmente dentro da classe"""
+        acumulado = np.cumsum(self.contagens, axis=1)
+        total = acumulado[:, -1:]
+        saida = np.empty((len(percentis), self.contagens.shape[0]))
+        for i, p in enumerate(percentis):
+            alvo = total[:, 0] * p / 100
+            classe = np.minimum((acumulado < alvo[:, None]).sum(axis=1), self.n_classes - 1)
+            linhas = np.arange(len(classe))
+            antes = np.where(classe > 0, acumulado[linhas, classe - 1], 0)
+            na_classe = np.maximum(self.contagens[linhas, classe], 1)
+            fracao = np.clip((alvo - antes) / na_classe, 0, 1)
+            saida[i] = self.inicio + (classe + fracao) * self.largura
+            if self.piso is not None:
+                saida[i] = np.where(alvo <= self.no_piso, self.piso, np.maximum(saida[i], self.piso))
+        return saida
+
+def _caminhos_dolar(gerador, dollar_values, days_to_predict, n, metodo, base):
+    """Gera n caminhos estocásticos do dólar (n × dias)"""
+    historico = np.asarray(dollar_values, dtype=np.float64)
+    if metodo == 'gbm':
+        # A deriva fica na tendência (base); os choques logarítmicos têm média zero
+        retornos = np.diff(np.log(historico))
+        volatilidade = retornos.std(ddof=1) if len(retornos) > 1 else 0.0
+        choques = gerador.standard_normal((n, days_to_predict))
+        choques *= volatilidade
+        np.cumsum(choques, axis=1, out=choques)
+        return base * np.exp(choques)
+    if metodo == 'bootstrap':
+        inclinacao, intercepto = simulacao.ajustar_tendencia(historico)
+        residuos = historico - (intercepto + inclinacao * np.arange(len(historico)))
+        return base + residuos[gerador.integers(0, len(residuos), (n, days_to_predict))]
+    raise ValueError(f"Método de Monte Carlo desconhecido: {metodo}")
+
+def simular_monte_carlo(dollar_values, initial_reserves, burn_rate, days_to_predict, market_sentiment,
+                        n_caminhos=10000, metodo='gbm', semente=None, tamanho_bloco=20000,
+                        percentis=PERCENTIS, n_classes=1000, estrategias=None):
+    """Simula n_caminhos trajetórias do dólar e das reservas para cada estratégia.
+
+    metodo='gbm' aplica à previsão de prever_dolar choques lognormais de mediana 1, com a
+    volatilidade dos retornos logarítmicos do histórico; metodo='bootstrap' reamostra os
+    resíduos em torno da tendência linear e os soma à própria tendência linear, qualquer
+    que seja configuracoes.PREVISOR (os resíduos só são coerentes com o modelo que os gerou).
+    A queima de reservas de cada caminho é a queima programada da estratégia escalada
+    pela razão entre o dólar simulado e a previsão (mais pressão cambial, mais
+    intervenção); com volatilidade zero no GBM, as faixas de reservas coincidem com
+    simular_reservas (a menos da largura das classes do histograma).
+
+    Os caminhos são gerados em blocos de tamanho_bloco com um Generator semeado, e
+    apenas histogramas diários são mantidos, de modo que a memória não cresce com
+    n_caminhos. Retorna faixas de percentis por dia e a distribuição do dia de
+    esgotamento das reservas (índice 0 = não esgotadas no horizonte).
+    """
+    if days_to_predict <= 0:
+        raise ValueError("O número de dias para previsão deve ser positivo")
+    estrategias = tuple(estrategias or registro.nomes_estrategias())
+    gerador = np.random.default_rng(semente)
+    dias = np.arange(days_to_predict, dtype=np.float64)
+    base = simulacao.prever_dolar(dollar_values, days_to_predict,
+                                  previsor='linear' if metodo == 'bootstrap' else None)
+    kernels = {e: registro.obter_estrategia(e) for e in estrategias}
+    fatores = {e: kernels[e].fator_dolar(dias) * (1 + market_sentiment * 0.01) for e in estrategias}
+    queimas = {e: kernels[e].queima(burn_rate, dias) * (1 - market_sentiment * 0.1) for e in estrategias}
+
+    hist_dolar, hist_reservas = {}, {}
+    esgotamento = {e: np.zeros(days_to_predict + 1, dtype=np.int64) for e in estrategias}
+    restantes = n_caminhos
+    while restantes > 0:
+        n = min(tamanho_bloco, restantes)
+        restantes -= n
+        caminhos = _caminhos_dolar(gerador, dollar_values, days_to_predict, n, metodo, base)
+        pressao = np.maximum(caminhos / base, 0)
+
+        for e in estrategias:
+            dolar = caminhos * fatores[e]
+            saldo = simulacao.saldo_com_piso(initial_reserves, queimas[e] * pressao)[:, 1:]
+
+            if e not in hist_dolar:
+                hist_dolar[e] = _HistogramaDiario(dolar, n_classes)
+                hist_reservas[e] = _HistogramaDiario(saldo, n_classes, piso=0.0)
+            hist_dolar[e].acumular(dolar)
+            hist_reservas[e].acumular(saldo)
+
+            zerado = saldo <= 0
+            dia = np.where(zerado.any(axis=1), zerado.argmax(axis=1) + 1, 0)
+            esgotamento[e] += np.bincount(dia, minlength=days_to_predict + 1)
+
+    return {
+        'estrategias': estrategias,
+        'percentis': tuple(percentis),
+        'dias': np.arange(1, days_to_predict + 1),
+        'dolar': {e: hist_dolar[e].percentis(percentis) for e in estrategias},
+        'reservas': {e: hist_reservas[e].percentis(percentis) for e in estrategias},
+        'esgotamento': esgotamento,
+        'prob_esgotamento': {e: float(1 - esgotamento[e][0] / n_caminhos) for e in estrategias},
+        'fora_da_faixa': {e: hist_dolar[e].fora_da_faixa + hist_reservas[e].fora_da_faixa for e in estrategias},
+        'n_caminhos': n_caminhos
+    }
@@ -0,0 +1,131 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+
+import numpy as np
+from src import configuracoes, lote
+
+@contextmanager
+def pool(workers=None):
+    """Pool de processos compartilhado por várias chamadas de mapear (None quando workers <= 1)"""
+    workers = configuracoes.WORKERS if workers is None else workers
+    if workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield executor
+
+def mapear(funcao, itens, workers=None, chunksize=1, executor=None):
+    """Aplica funcao a cada item, em um pool de processos quando workers > 1.
+
+    Os resultados voltam na ordem dos itens, independentemente da ordem de conclusão.
+    Com executor (de pool()), os itens vão para esse pool, cujos processos são
+    reaproveitados entre chamadas; sem ele, cada chamada abre e fecha o seu.
+    """
+    itens = list(itens)
+    if executor is not None:
+        return list(executor.map(funcao, itens, chunksize=chunksize))
+    workers = configuracoes.WORKERS if workers is None else workers
+    if workers <= 1 or len(itens) <= 1:
+        return [funcao(item) for item in itens]
+    with ProcessPoolExecutor(max_workers=min(workers, len(itens))) as executor:
+        return list(executor.map(funcao, itens, chunksize=chunksize))
+
+def _simular_bloco(argumentos):
+    parametros, opcoes = argumentos
+    return lote.simular_lote(**parametros, **opcoes)
+
+def simular_lote_paralelo(initial_reserves, burn_rate, market_sentiment, days_to_predict,
+                          dollar_values=None, estrategias=None, workers=None, tamanho_bloco=None):
+    """Divide os cenários em blocos, simula cada bloco em um processo e junta os resultados em ordem."""
+    tamanho_bloco = configuracoes.TAMANHO_BLOCO if tamanho_bloco is None else tamanho_bloco
+    vetores = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(initial_reserves, dtype=np.float64)),
+        np.atleast_1d(np.asarray(burn_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(market_sentiment, dtype=np.float64)),
+        np.atleast_1d(np.asarray(days_to_predict, dtype=np.int64))
+    )
+    nomes = ('initial_reserves', 'burn_rate', 'market_sentiment', 'days_to_predict')
+    opcoes = {'dollar_values': dollar_values}
+    if estrategias is not None:
+        opcoes['estrategias'] = tuple(estrategias)
+
+    blocos = [
+        ({nome: vetor[inicio:inicio + tamanho_bloco] for nome, vetor in zip(nomes, vetores)}, opcoes)
+        for inicio in range(0, len(vetores[0]), tamanho_bloco)
+    ]
+    parciais = mapear(_simular_bloco, blocos, workers)
+    if len(parciais) == 1:
+        return parciais[0]
+
+    # Os blocos podem ter horizontes máximos diferentes: completa com NaN até o maior
+    resultado = {'estrategias': parciais[0]['estrategias']}
+    for chave, valor in parciais[0].items():
+        if chave == 'estrategias':
+            continue
+        if valor.ndim == 3:
+            largura = max(p[chave].shape[2] for p in parciais)
+            resultado[chave] = np.concatenate([
+                np.pad(p[chave], ((0, 0), (0, 0), (0, largura - p[chave].shape[2])), constant_values=np.nan)
+                for p in parciais
+            ])
+        else:
+            resultado[chave] = np.concatenate([p[chave] for p in parciais])
+    return resultado
+
+class GrafoCancelado(Exception):
+    """Cancelamento solicitado durante executar_grafo"""
+
+def executar_grafo(tarefas, workers=None, ao_concluir=None, cancelamento=None):
+    """Executa tarefas com dependências, em paralelo quando workers > 1.
+
+    tarefas: {nome: (funcao, dependencias)}; cada tarefa começa assim que suas
+    dependências terminam. ao_concluir(nome) é chamado na thread chamadora a cada
+    conclusão. Se cancelamento (threading.Event) for acionado, nenhuma tarefa nova é
+    iniciada. Retorna {nome: resultado}; a primeira falha interrompe o grafo e é propagada.
+    """
+    workers = configuracoes.WORKERS if workers is None else workers
+    pendentes = dict(tarefas)
+    resultados = {}
+
+    def prontas():
+        return [nome for nome, (_, dependencias) in pendentes.items()
+                if all(dependencia in resultados for dependencia in dependencias)]
+
+    def verificar_cancelamento():
+        if cancelamento is not None and cancelamento.is_set():
+            raise GrafoCancelado("Execução do grafo de tarefas cancelada")
+
+    if workers <= 1:
+        while pendentes:
+            disponiveis = prontas()
+            if not disponiveis:
+                raise ValueError(f"Dependências circulares ou ausentes: {', '.join(pendentes)}")
+            for nome in disponiveis:
+                verificar_cancelamento()
+                funcao, _ = pendentes.pop(nome)
+                resultados[nome] = funcao()
+                if ao_concluir is not None:
+                    ao_concluir(nome)
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tarefas) or 1)) as executor:
+        em_execucao = {}
+        try:
+            while pendentes or em_execucao:
+                verificar_cancelamento()
+                for nome in prontas():
+                    funcao, _ = pendentes.pop(nome)
+                    em_execucao[executor.submit(funcao)] = nome
+                if not em_execucao:
+                    raise ValueError(f"Dependências circulares ou ausentes: {', '.join(pendentes)}")
+                concluidas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                for futuro in concluidas:
+                    nome = em_execucao.pop(futuro)
+                    resultados[nome] = futuro.result()
+                    if ao_concluir is not None:
+                        ao_concluir(nome)
+        except BaseException:
+            for futuro in em_execucao:
+                futuro.cancel()
+            raise
+    return resultados
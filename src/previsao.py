@@ -0,0 +1,126 @@
+from collections import deque
+
+import numpy as np
+
+class PrevisorIncremental:
+    """Regressão linear incremental sobre cotações do dólar, atualizada em O(1) por nova cotação.
+
+    Mantém contagem (ponderada), médias e somas de produtos centrados (forma estável das
+    somas n, Σx, Σy, Σxy, Σx²). Opcionalmente aplica decaimento exponencial aos pesos
+    antigos (0 < decaimento < 1) ou restringe o ajuste a uma janela deslizante de cotações.
+    Sem decaimento nem janela, prever() equivale a simulacao.prever_dolar sobre o histórico.
+    """
+
+    def __init__(self, dollar_values=None, decaimento=None, janela=None):
+        if decaimento is not None and not 0 < decaimento < 1:
+            raise ValueError("O decaimento deve estar entre 0 e 1")
+        if janela is not None and janela < 2:
+            raise ValueError("A janela deve conter pelo menos 2 cotações")
+        if decaimento is not None and janela is not None:
+            raise ValueError("Use decaimento ou janela, não ambos")
+        self.decaimento = decaimento
+        self.janela = janela
+        self._valores = deque() if janela is not None else None
+        self.total = 0  # índice do próximo dia (cotações já recebidas)
+        self._zerar()
+        if dollar_values is not None:
+            self.estender(dollar_values)
+
+    def _zerar(self):
+        self.peso = 0.0
+        self.media_x = 0.0
+        self.media_y = 0.0
+        self.cxx = 0.0
+        self.cxy = 0.0
+
+    def atualizar(self, valor):
+        """Incorpora uma nova cotação."""
+        x = float(self.total)
+        y = float(valor)
+        if self.decaimento is not None:
+            self.peso *= self.decaimento
+            self.cxx *= self.decaimento
+            self.cxy *= self.decaimento
+
+        self.peso += 1.0
+        dx = x - self.media_x
+        self.media_x += dx / self.peso
+        self.media_y += (y - self.media_y) / self.peso
+        self.cxx += dx * (x - self.media_x)
+        self.cxy += dx * (y - self.media_y)
+        self.total += 1
+
+        if self._valores is not None:
+            self._valores.append(y)
+            if len(self._valores) > self.janela:
+                self._remover(self.total - len(self._valores), self._valores.popleft())
+
+    def _remover(self, x, y):
+        """Retira do ajuste a cotação mais antiga da janela."""
+        x = float(x)
+        restante = self.peso - 1.0
+        media_x = self.media_x - (x - self.media_x) / restante
+        media_y = self.media_y - (y - self.media_y) / restante
+        self.cxx -= (x - media_x) * (x - self.media_x)
+        self.cxy -= (x - media_x) * (y - self.media_y)
+        self.peso = restante
+        self.media_x = media_x
+        self.media_y = media_y
+
+    def estender(self, valores):
+        """Incorpora um bloco de cotações de uma vez, combinando as estatísticas do bloco em O(len(valores))."""
+        y = np.asarray(valores, dtype=np.float64).ravel()
+        if self._valores is not None:
+            if len(y) >= self.janela:
+                # O bloco substitui toda a janela: recomeça o ajuste com as últimas cotações
+                self.total += len(y) - self.janela
+                y = y[-self.janela:]
+                self._valores.clear()
+                self._zerar()
+            for valor in y:
+                self.atualizar(valor)
+            return
+        if len(y) == 0:
+            return
+
+        x = np.arange(self.total, self.total + len(y), dtype=np.float64)
+        if self.decaimento is not None:
+            pesos = self.decaimento ** np.arange(len(y) - 1, -1, -1, dtype=np.float64)
+            fator = self.decaimento ** len(y)
+            self.peso *= fator
+            self.cxx *= fator
+            self.cxy *= fator
+        else:
+            pesos = np.ones(len(y))
+
+        peso_b = pesos.sum()
+        media_xb = np.dot(pesos, x) / peso_b
+        media_yb = np.dot(pesos, y) / peso_b
+        cxx_b = np.dot(pesos, (x - media_xb) ** 2)
+        cxy_b = np.dot(pesos, (x - media_xb) * (y - media_yb))
+
+        # Combinação das estatísticas (fórmula de Chan et al.)
+        peso = self.peso + peso_b
+        dx = media_xb - self.media_x
+        dy = media_yb - self.media_y
+        self.cxx += cxx_b + dx * dx * self.peso * peso_b / peso
+        self.cxy += cxy_b + dx * dy * self.peso * peso_b / peso
+        self.media_x += dx * peso_b / peso
+        self.media_y += dy * peso_b / peso
+        self.peso = peso
+        self.total += len(y)
+
+    @property
+    def inclinacao(self):
+        return self.cxy / self.cxx if self.cxx > 0 else 0.0
+
+    @property
+    def intercepto(self):
+        return self.media_y - self.inclinacao * self.media_x
+
+    def prever(self, days_to_predict):
+        """Preve os próximos days_to_predict valores a partir da tendência atual."""
+        if self.peso == 0:
+            raise ValueError("Nenhuma cotação foi informada ao previsor")
+        futuro_X = np.arange(self.total, self.total + days_to_predict)
+        return self.intercepto + self.inclinacao * futuro_X
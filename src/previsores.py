@@ -0,0 +1,380 @@
+"""Modelos de previsão do dólar com interface comum e ajuste em lote.
+
+Todo previsor aceita um histórico (vetor) ou vários (matriz S×n, um histórico por linha)
+e os ajusta em uma única chamada vetorizada:
+
+- PrevisorLinear: tendência linear sobre todo o histórico (o mesmo de simulacao.prever_dolar);
+- PrevisorJanela(janela): tendência linear sobre as últimas `janela` cotações;
+- PrevisorHolt(alfa, beta): suavização exponencial dupla de Holt (nível e tendência);
+- PrevisorAR(ordem): autorregressivo AR(p) com intercepto, por mínimos quadrados.
+
+Os parâmetros ajustados usam a posição no histórico a partir de 0, de modo que prever()
+continua a série a partir de n. avaliar() e comparar() fazem o backtest em janelas
+deslizantes do histórico: os modelos lineares e o AR obtêm as somas de cada janela por
+diferença de somas acumuladas (O(n) no total, independente do tamanho da janela) e o
+Holt aplica os pesos do filtro por correlação; só o erro de previsão é acumulado.
+
+criar_previsor('ar:3') / 'janela:60' / 'holt:0.5,0.1' / 'linear' constrói um previsor
+a partir do texto usado em configuracoes.PREVISOR.
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Janelas processadas por vez no backtest (limita a memória dos temporários)
+BLOCO_JANELAS = 16384
+
+def _como_matriz(historicos):
+    y = np.asarray(historicos, dtype=np.float64)
+    if y.ndim not in (1, 2):
+        raise ValueError("Os históricos devem ser um vetor ou uma matriz (um histórico por linha)")
+    return y.reshape(1, -1) if y.ndim == 1 else y, y.ndim == 1
+
+def _tendencia(y):
+    """(inclinação, intercepto) de cada linha de y em forma fechada, com x = 0..n-1"""
+    n = y.shape[1]
+    media_x = (n - 1) / 2
+    sxx = n * (n * n - 1) / 12
+    media_y = y.mean(axis=1)
+    inclinacao = (y - media_y[:, None]) @ (np.arange(n) - media_x) / sxx if sxx else np.zeros(len(y))
+    return inclinacao, media_y - inclinacao * media_x
+
+def _somas_janela(acumulada, inicios, tamanho):
+    """Soma de cada janela [inicio, inicio + tamanho) a partir da soma acumulada com zero inicial"""
+    return acumulada[inicios + tamanho] - acumulada[inicios]
+
+def _acumulada(valores):
+    acumulada = np.zeros(len(valores) + 1)
+    np.cumsum(valores, out=acumulada[1:])
+    return acumulada
+
+class Previsor(ABC):
+    """Interface comum: _ajustar(Y) devolve os parâmetros de cada linha de Y e
+    _prever(parametros, n, dias) as previsões (S×dias) dos dias n..n+dias-1.
+    Subclasses sem um dos dois não podem ser instanciadas."""
+    nome = ''
+    minimo = 2
+    # Atributos que entram na especificação, na ordem dos argumentos de criar_previsor
+    argumentos = ()
+
+    @property
+    def especificacao(self):
+        """Texto aceito por criar_previsor, com os parâmetros (ex.: 'holt:0.2,0.1')"""
+        valores = ','.join(str(getattr(self, argumento)) for argumento in self.argumentos)
+        return f'{self.nome}:{valores}' if valores else self.nome
+
+    def __repr__(self):
+        return f"criar_previsor('{self.especificacao}')"
+
+    def ajustar(self, historicos):
+        """Parâmetros ajustados para um histórico ou para cada linha de uma matriz"""
+        y, _ = _como_matriz(historicos)
+        if y.shape[1] < self.minimo:
+            raise ValueError(f"O previsor {self.nome} requer pelo menos {self.minimo} cotações")
+        return self._ajustar(y)
+
+    def prever(self, historicos, days_to_predict):
+        """Previsões dos próximos days_to_predict dias (vetor, ou matriz S×dias para S históricos)"""
+        y, vetor = _como_matriz(historicos)
+        previsto = self._prever(self.ajustar(y), y.shape[1], days_to_predict)
+        return previsto[0] if vetor else previsto
+
+    def ajustar_janelas(self, historico, janela, inicios):
+        """Parâmetros para cada janela historico[inicio:inicio + janela] (coordenadas da janela).
+
+        Implementação genérica: ajusta as janelas em blocos de BLOCO_JANELAS linhas.
+        Os previsores deste módulo a substituem por versões com somas acumuladas.
+        """
+        janelas = sliding_window_view(np.asarray(historico, dtype=np.float64), janela)
+        partes = [self._ajustar(janelas[inicios[i:i + BLOCO_JANELAS]])
+                  for i in range(0, len(inicios), BLOCO_JANELAS)]
+        return tuple(np.concatenate(componente) for componente in zip(*partes))
+
+    @abstractmethod
+    def _ajustar(self, y):
+        """Parâmetros ajustados de cada linha de y"""
+
+    @abstractmethod
+    def _prever(self, parametros, n, dias):
+        """Previsões (S×dias) dos dias n..n+dias-1"""
+
+class PrevisorLinear(Previsor):
+    nome = 'linear'
+
+    def _ajustar(self, y):
+        if y.shape[0] == 1:
+            # Histórico único: ajuste em blocos e em cache, idêntico a prever_dolar
+            from src import simulacao
+            inclinacao, intercepto = simulacao.ajustar_tendencia(y[0])
+            return np.array([inclinacao]), np.array([intercepto])
+        return _tendencia(y)
+
+    def _prever(self, parametros, n, dias):
+        inclinacao, intercepto = parametros
+        return intercepto[:, None] + inclinacao[:, None] * np.arange(n, n + dias)
+
+    def _janela_efetiva(self, janela):
+        return janela
+
+    def ajustar_janelas(self, historico, janela, inicios):
+        # Somas de y e t·y por janela via somas acumuladas; t e y centrados na série
+        # inteira para reduzir o cancelamento nas diferenças de somas grandes
+        y = np.asarray(historico, dtype=np.float64)
+        m = self._janela_efetiva(janela)
+        deslocamento = janela - m
+        centro_t = (len(y) - 1) / 2
+        centro_y = y.mean()
+        t = np.arange(len(y)) - centro_t
+        yc = y - centro_y
+
+        inicio_ajuste = inicios + deslocamento
+        soma_y = _somas_janela(_acumulada(yc), inicio_ajuste, m)
+        soma_ty = _somas_janela(_acumulada(t * yc), inicio_ajuste, m)
+        # Média de t na janela [a, a + m): a + (m - 1)/2 - centro_t
+        media_t = inicio_ajuste + (m - 1) / 2 - centro_t
+        sxx = m * (m * m - 1) / 12
+        inclinacao = (soma_ty - media_t * soma_y) / sxx if sxx else np.zeros(len(inicios))
+        # Intercepto no início da janela (posição 0 da janela de tamanho `janela`)
+        media_local = deslocamento + (m - 1) / 2
+        intercepto = soma_y / m + centro_y - inclinacao * media_local
+        return inclinacao, intercepto
+
+class PrevisorJanela(PrevisorLinear):
+    nome = 'janela'
+    argumentos = ('janela',)
+
+    def __init__(self, janela=60):
+        if janela < 2:
+            raise ValueError("A janela deve conter pelo menos 2 cotações")
+        self.janela = int(janela)
+
+    def _ajustar(self, y):
+        n = y.shape[1]
+        m = min(self.janela, n)
+        inclinacao, intercepto = _tendencia(y[:, n - m:])
+        # Da posição 0 da janela para a posição 0 do histórico
+        return inclinacao, intercepto - inclinacao * (n - m)
+
+    def _janela_efetiva(self, janela):
+        return min(self.janela, janela)
+
+class PrevisorHolt(Previsor):
+    """Holt: l[t] = α·y[t] + (1-α)(l[t-1] + b[t-1]); b[t] = β(l[t] - l[t-1]) + (1-β)b[t-1],
+    com l[0] = y[0] e b[0] = y[1] - y[0]. Previsão h dias à frente: l + h·b.
+
+    A recursão é linear em y, então o estado final é y @ W, com W (n×2) dependente só de
+    α, β e n: os pesos vêm das potências da matriz de transição (por duplicação) e o
+    ajuste de muitos históricos é uma única multiplicação de matrizes. Pesos abaixo de
+    1e-18 (cotações muito antigas) são descartados.
+    """
+    nome = 'holt'
+    argumentos = ('alfa', 'beta')
+
+    def __init__(self, alfa=0.5, beta=0.1):
+        if not (0 < alfa <= 1 and 0 <= beta <= 1):
+            raise ValueError("Use 0 < alfa <= 1 e 0 <= beta <= 1")
+        self.alfa = float(alfa)
+        self.beta = float(beta)
+        self._pesos = {}
+
+    def pesos(self, n):
+        """Matriz W (n×2) tal que [nível, tendência] finais = y @ W"""
+        if n in self._pesos:
+            return self._pesos[n]
+        a, b = self.alfa, self.beta
+        transicao = np.array([[1 - a, 1 - a], [-a * b, 1 - a * b]])
+        entrada = np.array([a, a * b])
+
+        # potencias[k] = transicao^k, k = 0..n-1, por blocos que dobram de tamanho
+        potencias = np.eye(2)[None]
+        passo = transicao
+        while len(potencias) < n and np.abs(potencias[-1]).max() > 1e-18:
+            potencias = np.concatenate((potencias, potencias @ passo))[:n]
+            passo = passo @ passo
+        k = len(potencias)
+
+        pesos = np.zeros((n, 2))
+        # y[t] (t >= 1) entra com transicao^(n-1-t) @ entrada
+        efetivos = min(k, n - 1)
+        pesos[n - efetivos:] = (potencias[:efetivos] @ entrada)[::-1]
+        if n - 1 < k:
+            # Estado inicial [y0, y1 - y0], ainda relevante em históricos curtos
+            inicial = potencias[n - 1]
+            pesos[0] += inicial @ np.array([1.0, -1.0])
+            pesos[1] += inicial @ np.array([0.0, 1.0])
+        if len(self._pesos) >= 8:
+            self._pesos.pop(next(iter(self._pesos)))
+        self._pesos[n] = pesos
+        return pesos
+
+    def _ajustar(self, y):
+        pesos = self.pesos(y.shape[1])
+        usados = np.flatnonzero(np.abs(pesos).max(axis=1) > 0)
+        inicio = usados[0] if len(usados) else 0
+        estado = y[:, inicio:] @ pesos[inicio:]
+        return estado[:, 0], estado[:, 1]
+
+    def _prever(self, parametros, n, dias):
+        nivel, tendencia = parametros
+        return nivel[:, None] + tendencia[:, None] * np.arange(1, dias + 1)
+
+    def ajustar_janelas(self, historico, janela, inicios):
+        y = np.asarray(historico, dtype=np.float64)
+        pesos = self.pesos(janela)
+        nivel = np.correlate(y, pesos[:, 0], mode='valid')[inicios]
+        tendencia = np.correlate(y, pesos[:, 1], mode='valid')[inicios]
+        return nivel, tendencia
+
+class PrevisorAR(Previsor):
+    """AR(p): y[t] = c + φ1·y[t-1] + ... + φp·y[t-p], ajustado por mínimos quadrados.
+
+    As equações normais de cada histórico são montadas com as somas dos produtos
+    defasados e resolvidas em lote (pseudo-inversa quando alguma série é constante).
+    """
+    nome = 'ar'
+    argumentos = ('ordem',)
+
+    def __init__(self, ordem=2):
+        if ordem < 1:
+            raise ValueError("A ordem do AR deve ser pelo menos 1")
+        self.ordem = int(ordem)
+        self.minimo = 2 * self.ordem + 2
+
+    def _resolver(self, contagem, somas, produtos):
+        """somas[..., i] = Σ y[t-i] e produtos[..., i, j] = Σ y[t-i]·y[t-j] (i, j = 0..p)"""
+        p = self.ordem
+        normal = np.empty(produtos.shape[:-2] + (p + 1, p + 1))
+        normal[..., 0, 0] = contagem
+        normal[..., 0, 1:] = somas[..., 1:]
+        normal[..., 1:, 0] = somas[..., 1:]
+        normal[..., 1:, 1:] = produtos[..., 1:, 1:]
+        direita = np.concatenate((somas[..., :1], produtos[..., 0, 1:]), axis=-1)
+        try:
+            coeficientes = np.linalg.solve(normal, direita[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            # Alguma janela constante (sistema singular): solução de norma mínima
+            coeficientes = (np.linalg.pinv(normal) @ direita[..., None])[..., 0]
+        return coeficientes[..., 0], coeficientes[..., 1:]
+
+    def _ajustar(self, y):
+        p = self.ordem
+        n = y.shape[1]
+        # Centrar cada série melhora o condicionamento; o intercepto é corrigido depois
+        media = y.mean(axis=1)
+        yc = y - media[:, None]
+        defasadas = [yc[:, p - i:n - i] for i in range(p + 1)]
+        somas = np.stack([d.sum(axis=1) for d in defasadas], axis=-1)
+        produtos = np.empty((len(y), p + 1, p + 1))
+        for i in range(p + 1):
+            for j in range(i, p + 1):
+                produtos[:, i, j] = produtos[:, j, i] = np.einsum('st,st->s', defasadas[i], defasadas[j])
+        intercepto, phi = self._resolver(n - p, somas, produtos)
+        intercepto = intercepto + media * (1 - phi.sum(axis=1))
+        return intercepto, phi, y[:, n - p:][:, ::-1].copy()
+
+    def ajustar_janelas(self, historico, janela, inicios):
+        p = self.ordem
+        y = np.asarray(historico, dtype=np.float64)
+        centro = y.mean()
+        yc = y - centro
+        # Termo t da janela [s, s + janela) vai de s + p a s + janela - 1
+        inicios_termos = inicios + p
+        tamanho = janela - p
+        somas = np.stack([
+            _somas_janela(_acumulada(np.roll(yc, i)), inicios_termos, tamanho) for i in range(p + 1)
+        ], axis=-1)
+        produtos = np.empty((len(inicios), p + 1, p + 1))
+        for i in range(p + 1):
+            for j in range(i, p + 1):
+                # Produto y[t-i]·y[t-j] indexado por t (as posições t < max(i, j) não são usadas)
+                produto = np.zeros(len(y))
+                produto[j:] = yc[j - i:len(y) - i] * yc[:len(y) - j]
+                produtos[:, i, j] = produtos[:, j, i] = _somas_janela(_acumulada(produto), inicios_termos, tamanho)
+        intercepto, phi = self._resolver(tamanho, somas, produtos)
+        intercepto = intercepto + centro * (1 - phi.sum(axis=1))
+        finais = inicios + janela
+        ultimos = np.stack([y[finais - 1 - i] for i in range(p)], axis=1)
+        return intercepto, phi, ultimos
+
+    def _prever(self, parametros, n, dias):
+        intercepto, phi, ultimos = parametros
+        p = self.ordem
+        # Série estendida em ordem cronológica: p últimas cotações seguidas das previsões
+        serie = np.empty((len(intercepto), p + dias))
+        serie[:, :p] = ultimos[:, ::-1]
+        phi_cronologico = phi[:, ::-1]
+        for dia in range(dias):
+            serie[:, p + dia] = intercepto + np.einsum('sp,sp->s', phi_cronologico, serie[:, dia:dia + p])
+        return serie[:, p:]
+
+PREVISORES = {
+    'linear': PrevisorLinear,
+    'janela': PrevisorJanela,
+    'holt': PrevisorHolt,
+    'ar': PrevisorAR
+}
+
+def criar_previsor(especificacao):
+    """Previsor a partir de 'nome' ou 'nome:arg1,arg2' (ex.: 'ar:3', 'holt:0.5,0.1')"""
+    if isinstance(especificacao, Previsor):
+        return especificacao
+    nome, _, argumentos = str(especificacao).partition(':')
+    nome = nome.strip().lower()
+    if nome not in PREVISORES:
+        raise ValueError(f"Previsor desconhecido: {nome} (disponíveis: {', '.join(PREVISORES)})")
+    valores = [float(a) if '.' in a else int(a) for a in argumentos.split(',') if a.strip()]
+    return PREVISORES[nome](*valores)
+
+def avaliar(previsor, historico, janela, horizonte, passo=1, bloco=BLOCO_JANELAS):
+    """Backtest em janelas deslizantes: ajusta em historico[s:s + janela] e compara a previsão
+    com os `horizonte` dias seguintes, para s = 0, passo, 2·passo, ...
+
+    Retorna {'mae', 'rmse'} por dia à frente (vetores de tamanho horizonte), as médias
+    'mae_medio' e 'rmse_medio' e o número de janelas avaliadas.
+    """
+    previsor = criar_previsor(previsor)
+    y = np.asarray(historico, dtype=np.float64)
+    if janela < previsor.minimo:
+        raise ValueError(f"O previsor {previsor.nome} requer janelas de pelo menos {previsor.minimo} cotações")
+    inicios = np.arange(0, len(y) - janela - horizonte + 1, passo)
+    if len(inicios) == 0:
+        raise ValueError("Histórico curto demais para a janela e o horizonte informados")
+
+    # Ajuste de todas as janelas de uma vez; previsões e erros em blocos
+    parametros = previsor.ajustar_janelas(y, janela, inicios)
+    alvos = sliding_window_view(y[janela:], horizonte)
+    soma_abs = np.zeros(horizonte)
+    soma_quad = np.zeros(horizonte)
+    for parte in range(0, len(inicios), bloco):
+        fatia = slice(parte, parte + bloco)
+        previsto = previsor._prever(tuple(p[fatia] for p in parametros), janela, horizonte)
+        erro = previsto - alvos[inicios[fatia]]
+        soma_abs += np.abs(erro).sum(axis=0)
+        soma_quad += np.square(erro).sum(axis=0)
+
+    mae = soma_abs / len(inicios)
+    rmse = np.sqrt(soma_quad / len(inicios))
+    return {
+        'previsor': previsor.especificacao,
+        'mae': mae,
+        'rmse': rmse,
+        'mae_medio': float(mae.mean()),
+        'rmse_medio': float(np.sqrt(np.square(rmse).mean())),
+        'n_janelas': len(inicios)
+    }
+
+def comparar(previsores, historico, janela, horizonte, passo=1, criterio='mae_medio'):
+    """Avalia vários previsores (especificações ou instâncias) e os ordena pelo critério.
+
+    As chaves são as especificações com os parâmetros (ex.: 'holt:0.2,0.1' e 'holt:0.8,0.1'
+    ficam separados); especificações repetidas recebem a posição na lista ('...#2').
+    """
+    avaliacoes = {}
+    for posicao, especificacao in enumerate(previsores):
+        previsor = criar_previsor(especificacao)
+        chave = previsor.especificacao
+        if chave in avaliacoes:
+            chave = f'{chave}#{posicao}'
+        avaliacoes[chave] = avaliar(previsor, historico, janela, horizonte, passo)
+    return dict(sorted(avaliacoes.items(), key=lambda item: item[1][criterio]))
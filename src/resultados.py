@@ -0,0 +1,72 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+COLUNAS = ('Day', 'Dollar Value (R$)', 'Reserves (Billion USD)')
+
+class ResultadosSimulacao(Mapping):
+    """Resultados de todas as estratégias em matrizes contíguas (estratégia × dia) por métrica.
+
+    As matrizes cobrem só a janela prevista: o dia 0 traz a última cotação observada e as
+    reservas iniciais, e os dias 1..N a previsão. O histórico (que pode ser um memmap com
+    milhões de cotações) fica em historico, uma única referência compartilhada, sem cópia
+    por estratégia; pode ser None (ex.: resultados lidos do cache).
+
+    Funciona como o antigo dicionário {estrategia: (df, mensagem)}: o DataFrame de cada
+    estratégia só é criado quando solicitado. Gráficos, exportações e cache usam
+    diretamente as visões das matrizes, sem cópia.
+    """
+
+    def __init__(self, estrategias, dolar, reservas, mensagens, dtype=np.float64, historico=None):
+        self.estrategias = tuple(estrategias)
+        self.dolar = np.ascontiguousarray(dolar, dtype=dtype)
+        self.reservas = np.ascontiguousarray(reservas, dtype=dtype)
+        self.mensagens = dict(mensagens)
+        self.historico = None if historico is None else np.asarray(historico)
+        self.dias = np.arange(self.dolar.shape[1])
+        self._indices = {estrategia: i for i, estrategia in enumerate(self.estrategias)}
+        self._dataframes = {}
+
+    @classmethod
+    def vazio(cls, estrategias, n_dias, dtype=np.float64, historico=None):
+        """Cria o contêiner com matrizes pré-alocadas, preenchidas depois por preencher()"""
+        forma = (len(estrategias), n_dias)
+        return cls(estrategias, np.empty(forma, dtype), np.empty(forma, dtype), {}, dtype, historico)
+
+    def preencher(self, estrategia, tendencia, reservas, mensagem):
+        """Grava a linha de uma estratégia, arredondada a 2 casas; reservas curtas repetem o último valor"""
+        i = self._indices[estrategia]
+        self.dolar[i] = np.round(np.asarray(tendencia, dtype=np.float64), 2)
+        reservas = np.asarray(reservas, dtype=np.float64)
+        n = min(len(reservas), self.reservas.shape[1])
+        self.reservas[i, :n] = np.round(reservas[:n], 2)
+        self.reservas[i, n:] = self.reservas[i, n - 1] if n else 0
+        self.mensagens[estrategia] = mensagem
+        self._dataframes.pop(estrategia, None)
+
+    def serie(self, estrategia, metrica):
+        """Visão (sem cópia) da série 'dolar' ou 'reservas' de uma estratégia"""
+        return getattr(self, metrica)[self._indices[estrategia]]
+
+    def dataframe(self, estrategia):
+        """DataFrame no formato original (Day, Dollar Value (R$), Reserves (Billion USD))"""
+        if estrategia not in self._dataframes:
+            import pandas as pd
+            i = self._indices[estrategia]
+            self._dataframes[estrategia] = pd.DataFrame({
+                COLUNAS[0]: self.dias,
+                COLUNAS[1]: self.dolar[i],
+                COLUNAS[2]: self.reservas[i]
+            }, copy=False)
+        return self._dataframes[estrategia]
+
+    def __getitem__(self, estrategia):
+        if estrategia not in self._indices:
+            raise KeyError(estrategia)
+        return self.dataframe(estrategia), self.mensagens.get(estrategia, '')
+
+    def __iter__(self):
+        return iter(self.estrategias)
+
+    def __len__(self):
+        return len(self.estrategias)
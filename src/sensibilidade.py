@@ -0,0 +1,74 @@
+"""Sensibilidade exata das trajetórias em relação aos parâmetros, na mesma passagem da simulação.
+
+As reservas seguem r[t] = max(r[t-1] - q[t], 0), com q[t] = queima(b, t) * (1 - 0.1 * s).
+Enquanto não há esgotamento, r[t] = R0 - Σq e as derivadas são somas acumuladas de
+dq/dθ; depois de um esgotamento no dia c, r[t] = -(q[c+1] + ... + q[t]) até o próximo,
+então a derivada recomeça do zero em c. Nos dias com reservas zeradas a derivada é
+zero (derivada lateral do piso). O dólar ajustado é p[t] * f(t) * (1 + 0.01 * s), linear
+no sentimento.
+
+Parâmetros: initial_reserves (R0), burn_rate (b) e market_sentiment (s). dq/db vem de
+Estrategia.derivada_queima; estratégias registradas sem ela usam diferença central
+apenas sobre o kernel de queima (sem novas simulações).
+"""
+import numpy as np
+from src import estrategias, simulacao
+
+PARAMETROS = ('initial_reserves', 'burn_rate', 'market_sentiment')
+
+def _derivada_queima(estrategia, burn_rate, dias):
+    if estrategia.derivada_queima is not None:
+        return estrategia.derivada_queima(burn_rate, dias)
+    passo = 1e-6 * max(1.0, abs(burn_rate))
+    return (estrategia.queima(burn_rate + passo, dias) - estrategia.queima(burn_rate - passo, dias)) / (2 * passo)
+
+def _derivada_com_piso(reservas, derivada_saldo):
+    """Derivada de r a partir da derivada do saldo sem piso, recomeçando após cada esgotamento"""
+    indices = np.arange(len(reservas))
+    zerado = reservas <= 0
+    zerado[0] = False  # o dia 0 são as reservas iniciais, sem piso
+    ultimo_esgotamento = np.maximum.accumulate(np.where(zerado, indices, 0))
+    derivada = derivada_saldo - np.where(ultimo_esgotamento > 0, derivada_saldo[ultimo_esgotamento], 0.0)
+    derivada[zerado] = 0.0
+    return derivada
+
+def simular_com_sensibilidade(initial_reserves, burn_rate, days_to_predict, strategy, market_sentiment,
+                              dollar_values=None):
+    """Trajetórias e suas derivadas em relação a cada parâmetro de PARAMETROS.
+
+    Retorna {'reservas', 'd_reservas': {parametro: ndarray}} e, com dollar_values,
+    também 'dolar' (previsão ajustada) e 'd_dolar'. As trajetórias coincidem com
+    simular_reservas_vetorizado e ajustar_dolar_vetorizado.
+    """
+    estrategia = estrategias.obter_estrategia(strategy)
+    dias = np.arange(days_to_predict, dtype=np.float64)
+    fator_sentimento = 1 - market_sentiment * 0.1
+
+    bruta = estrategia.queima(burn_rate, dias)
+    queima = bruta * fator_sentimento
+    reservas = simulacao.saldo_com_piso(initial_reserves, queima)
+
+    # Derivadas do saldo sem piso S[t] = R0 - Σ q (S[0] = R0)
+    derivadas_queima = {
+        'initial_reserves': np.zeros(days_to_predict),
+        'burn_rate': _derivada_queima(estrategia, burn_rate, dias) * fator_sentimento,
+        'market_sentiment': -0.1 * bruta
+    }
+    d_reservas = {}
+    for parametro, derivada_queima in derivadas_queima.items():
+        derivada_saldo = np.empty(days_to_predict + 1)
+        derivada_saldo[0] = 1.0 if parametro == 'initial_reserves' else 0.0
+        np.cumsum(-derivada_queima, out=derivada_saldo[1:])
+        derivada_saldo[1:] += derivada_saldo[0]
+        d_reservas[parametro] = _derivada_com_piso(reservas, derivada_saldo)
+
+    resultado = {'reservas': reservas, 'd_reservas': d_reservas}
+    if dollar_values is not None:
+        previsto = simulacao.prever_dolar(dollar_values, days_to_predict) * estrategia.fator_dolar(dias)
+        resultado['dolar'] = previsto * (1 + market_sentiment * 0.01)
+        resultado['d_dolar'] = {
+            'initial_reserves': np.zeros(days_to_predict),
+            'burn_rate': np.zeros(days_to_predict),
+            'market_sentiment': previsto * 0.01
+        }
+    return resultado
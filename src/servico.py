@@ -0,0 +1,321 @@
+"""Serviço HTTP/JSON local (asyncio, sem dependências externas) sobre o núcleo numérico.
+
+Rotas:
+    POST /simular    parâmetros da simulação em JSON -> séries de todas as estratégias
+                     (JSON, ou Arrow IPC com ?formato=arrow ou Accept: application/vnd.apache.arrow.stream)
+    POST /relatorio  mesmos parâmetros (+ "modo": "completo" | "resumo") -> PDF
+    GET  /saude      estado e tamanho das filas
+
+Requisições de simulação concorrentes são agrupadas em micro-lotes (até
+SERVICO_LOTE_MAXIMO, esperando no máximo SERVICO_JANELA_LOTE_MS pelo lote encher) e
+resolvidas com uma chamada vetorizada de lote.simular_lote por histórico e horizonte.
+Relatórios rodam em um pool de processos. Filas cheias respondem 503 com Retry-After
+em vez de acumular trabalho (contrapressão).
+
+Uso:
+    python -m src.servico [--host 127.0.0.1] [--porta 8765]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from src import configuracoes, lote
+from src.resultados import ResultadosSimulacao
+
+MAX_CORPO = 64 * 1024 * 1024
+TIPO_ARROW = 'application/vnd.apache.arrow.stream'
+MENSAGENS_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                    406: 'Not Acceptable', 413: 'Payload Too Large', 500: 'Internal Server Error',
+                    503: 'Service Unavailable'}
+
+class RequisicaoInvalida(ValueError):
+    """Parâmetros recebidos não formam uma simulação válida"""
+
+def normalizar_requisicao(corpo):
+    """Converte e valida o JSON recebido no formato de dados de main.simular"""
+    try:
+        dados = {
+            'dollar_values': [float(v) for v in corpo['dollar_values']],
+            'initial_reserves': float(corpo['initial_reserves']),
+            'burn_rate': float(corpo['burn_rate']),
+            'days_to_predict': int(corpo['days_to_predict']),
+            'market_sentiment': float(corpo.get('market_sentiment', 0.0)),
+            'strategy': str(corpo.get('strategy', 'padrão')).lower()
+        }
+    except (KeyError, TypeError, ValueError) as erro:
+        raise RequisicaoInvalida(f"Parâmetros inválidos: {erro}") from erro
+    if len(dados['dollar_values']) < 2:
+        raise RequisicaoInvalida("É necessário pelo menos 2 valores históricos do dólar")
+    if not 0 < dados['days_to_predict'] <= configuracoes.SERVICO_MAX_DIAS:
+        raise RequisicaoInvalida(
+            f"O número de dias para previsão deve estar entre 1 e {configuracoes.SERVICO_MAX_DIAS}")
+    return dados
+
+def simular_requisicoes(requisicoes):
+    """Simula várias requisições com uma chamada vetorizada por (histórico, horizonte).
+
+    Retorna um ResultadosSimulacao por requisição, idêntico ao de main.simular: o motor
+    em lote usa o mesmo kernel de reservas (simulacao.saldo_com_piso) e a mesma previsão.
+    """
+    import main
+
+    grupos = {}
+    for indice, dados in enumerate(requisicoes):
+        historico = np.asarray(dados['dollar_values'], dtype=np.float64)
+        chave = (hashlib.blake2b(historico.tobytes(), digest_size=16).digest(), dados['days_to_predict'])
+        grupos.setdefault(chave, (historico, []))[1].append(indice)
+
+    saida = [None] * len(requisicoes)
+    for (_, dias), (historico, indices) in grupos.items():
+        calculado = lote.simular_lote(
+            [requisicoes[i]['initial_reserves'] for i in indices],
+            [requisicoes[i]['burn_rate'] for i in indices],
+            [requisicoes[i]['market_sentiment'] for i in indices],
+            dias,
+            dollar_values=historico
+        )
+        estrategias = calculado['estrategias']
+        for k, i in enumerate(indices):
+            resultados = ResultadosSimulacao.vazio(estrategias, dias + 1, historico=historico)
+            for j, estrategia in enumerate(estrategias):
+                tendencia = np.concatenate((historico[-1:], calculado['dolar'][k, j]))
+                mensagem = main.mensagem_estrategia(tendencia, estrategia, requisicoes[i]['market_sentiment'])
+                resultados.preencher(estrategia, tendencia, calculado['reservas'][k, j], mensagem)
+            saida[i] = resultados
+    return saida
+
+def resposta_json(dados, resultados):
+    return json.dumps({
+        'parametros': dados,
+        'estrategias': {
+            estrategia: {
+                'mensagem': resultados.mensagens[estrategia],
+                'dollar_values': resultados.serie(estrategia, 'dolar').tolist(),
+                'reserves': resultados.serie(estrategia, 'reservas').tolist()
+            }
+            for estrategia in resultados
+        }
+    }, ensure_ascii=False).encode('utf-8')
+
+def resposta_arrow(resultados):
+    """Tabela longa (estrategia, dia, dolar, reservas) serializada como fluxo Arrow IPC"""
+    import pyarrow as pa
+
+    n_dias = len(resultados.dias)
+    tabela = pa.table({
+        'estrategia': pa.array(np.repeat(np.array(resultados.estrategias, dtype=object), n_dias), pa.string()),
+        'dia': np.tile(resultados.dias, len(resultados.estrategias)),
+        'dolar': resultados.dolar.ravel(),
+        'reservas': resultados.reservas.ravel()
+    })
+    destino = pa.BufferOutputStream()
+    with pa.ipc.new_stream(destino, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return destino.getvalue().to_pybytes()
+
+def gerar_pdf(dados, modo='completo'):
+    """Simula e gera o relatório em um diretório temporário, retornando os bytes do PDF"""
+    import main
+
+    resultados = main.simular(dados)
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'relatorio.pdf')
+        main.gerar_relatorios(resultados, main.dados_entrada_relatorio(dados), caminho,
+                              modo=modo, gerar_imagens=False)
+        with open(caminho, 'rb') as arquivo:
+            return arquivo.read()
+
+class Servico:
+    def __init__(self, lote_maximo=None, janela_ms=None, max_pendentes=None, max_relatorios=None, workers=None):
+        self.lote_maximo = lote_maximo or configuracoes.SERVICO_LOTE_MAXIMO
+        self.janela = (configuracoes.SERVICO_JANELA_LOTE_MS if janela_ms is None else janela_ms) / 1000
+        self.max_relatorios = max_relatorios or configuracoes.SERVICO_MAX_RELATORIOS
+        self.fila = asyncio.Queue(max_pendentes or configuracoes.SERVICO_MAX_PENDENTES)
+        self.relatorios_pendentes = 0
+        self.lotes_processados = 0
+        # O serviço sempre usa um pool; sem SIMULADOR_WORKERS_SAIDAS, um processo por núcleo (até 6)
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers or configuracoes.WORKERS_SAIDAS or min(os.cpu_count() or 1, 6))
+        self._tarefa_lotes = None
+
+    async def iniciar(self, host=None, porta=None):
+        self._tarefa_lotes = asyncio.create_task(self._processar_lotes())
+        return await asyncio.start_server(self._atender, host or configuracoes.SERVICO_HOST,
+                                          configuracoes.SERVICO_PORTA if porta is None else porta)
+
+    def encerrar(self):
+        if self._tarefa_lotes is not None:
+            self._tarefa_lotes.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def simular(self, dados):
+        """Enfileira a requisição no próximo micro-lote; QueueFull indica fila cheia"""
+        futuro = asyncio.get_running_loop().create_future()
+        self.fila.put_nowait((dados, futuro))
+        return await futuro
+
+    async def _processar_lotes(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            itens = [await self.fila.get()]
+            prazo = loop.time() + self.janela
+            while len(itens) < self.lote_maximo:
+                if not self.fila.empty():
+                    itens.append(self.fila.get_nowait())
+                    continue
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    itens.append(await asyncio.wait_for(self.fila.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            # O cálculo vetorizado roda em uma thread (NumPy libera o GIL); o laço segue atendendo
+            try:
+                resultados = await loop.run_in_executor(None, simular_requisicoes, [dados for dados, _ in itens])
+            except Exception as erro:
+                for _, futuro in itens:
+                    if not futuro.done():
+                        futuro.set_exception(erro)
+            else:
+                for (_, futuro), resultado in zip(itens, resultados):
+                    if not futuro.done():
+                        futuro.set_result(resultado)
+            self.lotes_processados += 1
+
+    async def _atender(self, leitor, escritor):
+        try:
+            while True:
+                try:
+                    cabecalho = await leitor.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                linhas = cabecalho.decode('latin-1').split('\r\n')
+                try:
+                    metodo, alvo, versao = linhas[0].split(' ', 2)
+                except ValueError:
+                    break
+                cabecalhos = {}
+                for linha in linhas[1:]:
+                    if ':' in linha:
+                        nome, valor = linha.split(':', 1)
+                        cabecalhos[nome.strip().lower()] = valor.strip()
+
+                try:
+                    tamanho = int(cabecalhos.get('content-length', 0) or 0)
+                except ValueError:
+                    tamanho = -1
+                if tamanho < 0:
+                    await self._responder(escritor, 400, {'erro': 'Content-Length inválido'}, manter=False)
+                    break
+                if tamanho > MAX_CORPO:
+                    await self._responder(escritor, 413, {'erro': 'Corpo da requisição muito grande'}, manter=False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b''
+
+                try:
+                    status, conteudo, tipo, extras = await self._rotear(metodo, alvo, cabecalhos, corpo)
+                except Exception as erro:
+                    # Falha inesperada: o cliente recebe 500 em vez de ver a conexão cair
+                    traceback.print_exc()
+                    status, conteudo, tipo, extras = 500, {'erro': f'Erro interno: {erro}'}, None, {}
+                manter = versao == 'HTTP/1.1' and cabecalhos.get('connection', '').lower() != 'close'
+                await self._responder(escritor, status, conteudo, tipo, extras, manter)
+                if not manter:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Cliente desconectado ou servidor encerrando com conexões keep-alive ociosas
+            pass
+        finally:
+            escritor.close()
+
+    async def _rotear(self, metodo, alvo, cabecalhos, corpo):
+        url = urlsplit(alvo)
+        if url.path == '/saude' and metodo == 'GET':
+            return 200, {'status': 'ok', 'pendentes': self.fila.qsize(),
+                         'relatorios_pendentes': self.relatorios_pendentes,
+                         'lotes_processados': self.lotes_processados}, None, {}
+        if url.path not in ('/simular', '/relatorio'):
+            return 404, {'erro': f'Rota desconhecida: {url.path}'}, None, {}
+        if metodo != 'POST':
+            return 405, {'erro': 'Use POST'}, None, {'Allow': 'POST'}
+
+        try:
+            parametros = json.loads(corpo or b'{}')
+            if not isinstance(parametros, dict):
+                raise RequisicaoInvalida("O corpo deve ser um objeto JSON")
+            dados = normalizar_requisicao(parametros)
+        except (ValueError, RequisicaoInvalida) as erro:
+            return 400, {'erro': str(erro)}, None, {}
+
+        if url.path == '/relatorio':
+            return await self._relatorio(dados, parametros.get('modo', 'completo'))
+
+        formato = parse_qs(url.query).get('formato', [''])[0]
+        arrow = formato == 'arrow' or TIPO_ARROW in cabecalhos.get('accept', '')
+        try:
+            resultados = await self.simular(dados)
+        except asyncio.QueueFull:
+            return 503, {'erro': 'Fila de simulações cheia'}, None, {'Retry-After': '1'}
+        if arrow:
+            try:
+                return 200, resposta_arrow(resultados), TIPO_ARROW, {}
+            except ImportError:
+                return 406, {'erro': 'Formato Arrow requer o pacote pyarrow'}, None, {}
+        return 200, resposta_json(dados, resultados), 'application/json', {}
+
+    async def _relatorio(self, dados, modo):
+        if modo not in ('completo', 'resumo'):
+            return 400, {'erro': f'Modo de relatório inválido: {modo}'}, None, {}
+        if self.relatorios_pendentes >= self.max_relatorios:
+            return 503, {'erro': 'Fila de relatórios cheia'}, None, {'Retry-After': '5'}
+        self.relatorios_pendentes += 1
+        try:
+            pdf = await asyncio.get_running_loop().run_in_executor(self.pool, gerar_pdf, dados, modo)
+        finally:
+            self.relatorios_pendentes -= 1
+        return 200, pdf, 'application/pdf', {}
+
+    async def _responder(self, escritor, status, conteudo, tipo=None, extras=None, manter=True):
+        if not isinstance(conteudo, bytes):
+            conteudo = json.dumps(conteudo, ensure_ascii=False).encode('utf-8')
+            tipo = 'application/json'
+        cabecalhos = {
+            'Content-Type': tipo or 'application/octet-stream',
+            'Content-Length': str(len(conteudo)),
+            'Connection': 'keep-alive' if manter else 'close',
+            **(extras or {})
+        }
+        inicio = f"HTTP/1.1 {status} {MENSAGENS_STATUS.get(status, '')}\r\n"
+        inicio += ''.join(f"{nome}: {valor}\r\n" for nome, valor in cabecalhos.items())
+        escritor.write(inicio.encode('latin-1') + b'\r\n' + conteudo)
+        await escritor.drain()
+
+async def servir(host=None, porta=None):
+    servico = Servico()
+    servidor = await servico.iniciar(host, porta)
+    enderecos = ', '.join(str(socket.getsockname()) for socket in servidor.sockets)
+    print(f"Simulador servindo em {enderecos}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servico.encerrar()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP local do simulador")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--porta', type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
@@ -1,42 +1,134 @@
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
-import pandas as pd
-from sklearn.linear_model import LinearRegression
+from src import configuracoes, estrategias
+
+_CACHE_TENDENCIA = OrderedDict()
+_LIMITE_CACHE_TENDENCIA = 32
+# Séries maiores que isto são ajustadas em blocos, sem temporários do tamanho da série
+_BLOCO_AJUSTE = 1 << 20
+
+def ajustar_tendencia(dollar_values):
+    """Ajusta a tendência linear (mínimos quadrados em forma fechada) e devolve (inclinação, intercepto).
+
+    O ajuste é guardado em cache pelo conteúdo da série, de modo que várias estratégias
+    da mesma execução compartilham um único ajuste O(n).
+    """
+    y = np.ascontiguousarray(dollar_values, dtype=np.float64)
+    chave = hashlib.blake2b(memoryview(y), digest_size=16).digest()
+    if chave in _CACHE_TENDENCIA:
+        _CACHE_TENDENCIA.move_to_end(chave)
+        return _CACHE_TENDENCIA[chave]
+
+    n = len(y)
+    media_x = (n - 1) / 2
+    media_y = y.mean()
+    # Soma dos quadrados de x = 0..n-1 em torno da média: n(n² - 1)/12
+    sxx = n * (n * n - 1) / 12
+    if n <= _BLOCO_AJUSTE:
+        sxy = np.dot(np.arange(n) - media_x, y - media_y)
+    else:
+        # Históricos longos (ex.: mapeados de arquivo) são percorridos em blocos
+        sxy = 0.0
+        for inicio in range(0, n, _BLOCO_AJUSTE):
+            bloco = y[inicio:inicio + _BLOCO_AJUSTE]
+            sxy += np.dot(np.arange(inicio, inicio + len(bloco)) - media_x, bloco - media_y)
+    inclinacao = float(sxy / sxx) if sxx else 0.0
+    intercepto = float(media_y - inclinacao * media_x)
+
+    _CACHE_TENDENCIA[chave] = (inclinacao, intercepto)
+    if len(_CACHE_TENDENCIA) > _LIMITE_CACHE_TENDENCIA:
+        _CACHE_TENDENCIA.popitem(last=False)
+    return inclinacao, intercepto
+
+def prever_dolar(dollar_values, days_to_predict, previsor=None):
+    """Preve valores futuros do dólar usando regressão linear.
 
-def prever_dolar(dollar_values, days_to_predict):
-    """Preve valores futuros do dólar usando regressão linear."""
-    X = np.arange(len(dollar_values)).reshape(-1, 1)
-    y = np.array(dollar_values)
-    modelo = LinearRegression().fit(X, y)
-    futuro_X = np.arange(len(dollar_values), len(dollar_values) + days_to_predict).reshape(-1, 1)
-    return modelo.predict(futuro_X)
+    previsor: especificação de src.previsores (ex.: 'holt:0.5,0.1', 'ar:3'); por padrão,
+    configuracoes.PREVISOR. A tendência linear mantém o caminho em cache abaixo.
+    """
+    previsor = previsor or configuracoes.PREVISOR
+    if previsor != 'linear':
+        from src import previsores
+        return previsores.criar_previsor(previsor).prever(dollar_values, days_to_predict)
+    inclinacao, intercepto = ajustar_tendencia(dollar_values)
+    futuro_X = np.arange(len(dollar_values), len(dollar_values) + days_to_predict)
+    return intercepto + inclinacao * futuro_X
 
 def simular_reservas(initial_reserves, burn_rate, days_to_predict, strategy, market_sentiment):
     """Simula a queima de reservas cambiais com estratégias variadas."""
-    reservas = [initial_reserves]
-    for dia in range(days_to_predict):
-        if strategy == 'moderada':
-            queima = max(burn_rate - 0.1 * dia, 0)
-        elif strategy == 'agressiva':
-            queima = burn_rate * 1.5
-        elif strategy == 'inatividade':
-            queima = 0
-        else:
-            queima = burn_rate
-        queima *= (1 - market_sentiment * 0.1)
-        reservas.append(max(reservas[-1] - queima, 0))
-    return reservas
+    return simular_reservas_vetorizado(initial_reserves, burn_rate, days_to_predict, strategy, market_sentiment).tolist()
 
 def ajustar_dolar(predicted_dollar, strategy, market_sentiment):
     """Ajusta valores do dólar baseado em estratégia e sentimento."""
-    ajustado = []
-    for dia, valor in enumerate(predicted_dollar):
-        if strategy == 'moderada':
-            novo = valor * (1 + 0.001 * dia)
-        elif strategy == 'agressiva':
-            novo = valor * (1 - 0.002 * dia)
-        elif strategy == 'inatividade':
-            novo = valor * (1 + 0.003 * dia)
-        else:
-            novo = valor
-        ajustado.append(novo * (1 + market_sentiment * 0.01))
-    return ajustado
\ No newline at end of file
+    return ajustar_dolar_vetorizado(predicted_dollar, strategy, market_sentiment).tolist()
+
+def queima_programada(strategy, burn_rate, dias):
+    """Cronograma de queima bruta (antes do sentimento); burn_rate e dias são combinados por broadcast."""
+    return estrategias.obter_estrategia(strategy).queima(burn_rate, dias)
+
+def fator_dolar(strategy, dias):
+    """Multiplicador diário aplicado ao dólar previsto por cada estratégia."""
+    return estrategias.obter_estrategia(strategy).fator_dolar(dias)
+
+def simular_reservas_vetorizado(initial_reserves, burn_rate, days_to_predict, strategy, market_sentiment):
+    """Versão vetorizada de simular_reservas, retornando um ndarray com days_to_predict + 1 valores."""
+    dias = np.arange(days_to_predict, dtype=np.float64)
+    queima = queima_programada(strategy, burn_rate, dias)
+    queima *= (1 - market_sentiment * 0.1)
+    return saldo_com_piso(initial_reserves, queima)
+
+def saldo_com_piso(initial_reserves, queima):
+    """Reservas dia a dia para uma queima diária já ajustada: r[t] = max(r[t-1] - q[t], 0).
+
+    queima pode ter eixos iniciais (ex.: cenário × estratégia × dia, em src.lote); a
+    recorrência corre no último eixo e initial_reserves é combinado por broadcast com os
+    demais. O resultado é idêntico, bit a bit, ao laço original em cada trajetória.
+    """
+    queima = np.asarray(queima, dtype=np.float64)
+    saldo = np.empty(np.broadcast_shapes(np.shape(initial_reserves), queima.shape[:-1]) + (queima.shape[-1] + 1,))
+    # Soma acumulada sequencial a partir das reservas iniciais (mesma ordem de operações do laço)
+    saldo[..., 0] = initial_reserves
+    saldo[..., 1:] = -queima
+    np.cumsum(saldo, axis=-1, out=saldo)
+    if queima.shape[-1] == 0:
+        return saldo
+    # Recorrência em forma fechada: desconta o menor saldo negativo já atingido
+    piso = np.minimum.accumulate(np.minimum(saldo[..., 1:], 0), axis=-1)
+    esgotou = piso[..., -1] < 0
+    if not esgotou.any():
+        return saldo
+
+    # Só as trajetórias esgotadas são corrigidas. saldo - piso vale exatamente zero nos dias
+    # de esgotamento e coincide com o laço até a primeira recuperação (saldo positivo depois
+    # de um esgotamento); dali em diante o laço recomeça do zero, o que é refeito abaixo,
+    # uma passagem por recuperação (nenhuma quando a queima não muda de sinal)
+    trecho = saldo[esgotou]
+    queima = np.broadcast_to(queima, saldo[..., 1:].shape)[esgotou]
+    piso = piso[esgotou]
+    trecho[:, 1:] -= piso
+    dias = np.arange(1, queima.shape[-1] + 1)
+    ativas = np.arange(len(trecho))
+    recuperado = (piso < 0) & (trecho[:, 1:] > 0)
+    while True:
+        pendentes = recuperado.any(axis=1)
+        ativas, recuperado = ativas[pendentes], recuperado[pendentes]
+        if not len(ativas):
+            break
+        # Dia zerado imediatamente anterior à primeira recuperação: o laço recomeça dele
+        reinicio = np.argmax(recuperado, axis=1)[:, None]
+        acumulado = np.cumsum(np.where(dias > reinicio, -queima[ativas], 0), axis=-1)
+        piso = np.minimum.accumulate(np.minimum(acumulado, 0), axis=-1)
+        depois = dias >= reinicio
+        valores = acumulado - piso
+        trecho[ativas, 1:] = np.where(depois, valores, trecho[ativas, 1:])
+        recuperado = depois & (piso < 0) & (valores > 0)
+    saldo[esgotou] = trecho
+    return saldo
+
+def ajustar_dolar_vetorizado(predicted_dollar, strategy, market_sentiment):
+    """Versão vetorizada de ajustar_dolar, aplicando os multiplicadores em uma única operação."""
+    valores = np.asarray(predicted_dollar, dtype=np.float64)
+    dias = np.arange(len(valores), dtype=np.float64)
+    return valores * fator_dolar(strategy, dias) * (1 + market_sentiment * 0.01)
@@ -0,0 +1,37 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# Lida uma vez na importação: os.umask só pode ser consultado alterando-o, o que não é seguro entre threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def permissoes_padrao(caminho, modo=0o666):
+    """Aplica ao caminho as permissões que open()/mkdir() dariam (modo sem os bits da umask)"""
+    os.chmod(caminho, modo & ~_UMASK)
+
+@contextmanager
+def escrita_atomica(destino):
+    """Fornece um arquivo temporário no mesmo diretório e o move para destino ao final.
+
+    Leitores e execuções concorrentes nunca veem um arquivo pela metade: o destino é
+    substituído de uma vez por os.replace, ou permanece intacto se a escrita falhar.
+    O arquivo final mantém as permissões do destino existente ou, se novo, as da umask
+    (mkstemp cria o temporário só com acesso do dono).
+    """
+    diretorio = os.path.dirname(os.path.abspath(destino))
+    base, extensao = os.path.splitext(os.path.basename(destino))
+    descritor, temporario = tempfile.mkstemp(prefix=f'.{base}-', suffix=extensao, dir=diretorio)
+    os.close(descritor)
+    try:
+        yield temporario
+        try:
+            shutil.copymode(destino, temporario)
+        except FileNotFoundError:
+            permissoes_padrao(temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
@@ -0,0 +1,33 @@
+"""Armazém SQLite: janela prevista e resumos iguais em salvar e salvar_cenarios."""
+import numpy as np
+from src import lote, simulacao
+from src.armazenamento import ArmazemResultados
+
+def test_salvar_concorda_com_salvar_cenarios(tmp_path):
+    import main
+
+    historico = 5 + np.cumsum(np.random.default_rng(16).normal(0, 0.02, 400))
+    dados = {'dollar_values': historico, 'initial_reserves': 200.0, 'burn_rate': 2.5,
+             'days_to_predict': 30, 'market_sentiment': 0.35, 'strategy': 'padrão'}
+    resultados = main.simular(dados)
+    calculado = lote.simular_lote(200.0, 2.5, 0.35, 30, dollar_values=historico)
+
+    with ArmazemResultados(str(tmp_path / 'resultados.sqlite')) as armazem:
+        individual = armazem.salvar(dados, resultados)
+        cenario, = armazem.salvar_cenarios(calculado, historico)
+        linhas = {(linha['id'], linha['estrategia']): linha for linha in armazem.consultar()}
+        for estrategia in resultados:
+            a, b = linhas[(individual, estrategia)], linhas[(cenario, estrategia)]
+            for campo in ('dia_esgotamento', 'reserva_final', 'reserva_minima', 'dolar_final'):
+                assert a[campo] == b[campo]
+            dolar, reservas = armazem.caminhos(individual, estrategia)
+            # Só a janela prevista, sem arredondamento
+            assert len(dolar) == 30 and len(reservas) == 31
+            np.testing.assert_array_equal(reservas, simulacao.simular_reservas(200.0, 2.5, 30, estrategia, 0.35))
+            np.testing.assert_array_equal(
+                dolar, simulacao.ajustar_dolar_vetorizado(simulacao.prever_dolar(historico, 30), estrategia, 0.35))
+            np.testing.assert_array_equal(np.round(reservas, 2), resultados.serie(estrategia, 'reservas'))
+            for serie, outra in zip((dolar, reservas), armazem.caminhos(cenario, estrategia)):
+                np.testing.assert_array_equal(serie, outra)
+        np.testing.assert_array_equal(armazem.historico(individual), historico)
+        assert armazem.conexao.execute("SELECT COUNT(*) FROM historicos").fetchone()[0] == 1
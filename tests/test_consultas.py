@@ -0,0 +1,45 @@
+"""Consultas em forma fechada contra o motor de simulação."""
+import numpy as np
+import pytest
+from src import consultas, estrategias, simulacao
+
+def _dia_simulado(initial_reserves, burn_rate, strategy, market_sentiment, horizonte):
+    reservas = simulacao.simular_reservas_vetorizado(initial_reserves, burn_rate, horizonte, strategy, market_sentiment)
+    zerados = np.flatnonzero(reservas[1:] <= 0)
+    return int(zerados[0]) + 1 if zerados.size else None
+
+def test_dia_esgotamento_segue_a_simulacao():
+    rng = np.random.default_rng(5)
+    for _ in range(300):
+        initial_reserves = float(rng.uniform(1, 300))
+        burn_rate = float(rng.uniform(0, 10))
+        strategy = str(rng.choice(('moderada', 'agressiva', 'inatividade', 'padrão', 'desconhecida')))
+        market_sentiment = float(rng.uniform(-1, 1))
+        assert consultas.dia_esgotamento(initial_reserves, burn_rate, strategy, market_sentiment, horizonte=500) == \
+            _dia_simulado(initial_reserves, burn_rate, strategy, market_sentiment, 500)
+
+@pytest.fixture
+def agressiva_substituida():
+    """Substitui a estratégia agressiva pelo registro público e restaura a original ao final"""
+    original = estrategias.obter_estrategia('agressiva')
+    estrategias.registrar_estrategia('agressiva', lambda burn_rate, dias: 3.0 * burn_rate + 0 * dias,
+                                     original.fator_dolar)
+    yield
+    estrategias.registrar_estrategia(**vars(original))
+
+def test_estrategia_substituida_perde_a_forma_fechada(agressiva_substituida):
+    assert consultas.dia_esgotamento(100, 1, 'agressiva', 0, horizonte=200) == \
+        _dia_simulado(100, 1, 'agressiva', 0, 200) == 34
+    assert consultas.queima_acumulada(1, 10, 'agressiva', 0) == 30.0
+    with pytest.raises(ValueError):
+        consultas.dia_esgotamento(100, 1, 'agressiva', 0)
+
+def test_estrategia_restaurada_recupera_a_forma_fechada():
+    assert estrategias.obter_estrategia('agressiva').forma_fechada == 1.5
+    assert consultas.dia_esgotamento(100, 1, 'agressiva', 0) == 67
+
+def test_queima_negativa_sem_horizonte():
+    for strategy in ('moderada', 'agressiva', 'inatividade', 'padrão', 'desconhecida'):
+        assert consultas.dia_esgotamento(100, -2, strategy, 0.3) is None
+        assert consultas.dia_esgotamento(-5, -2, strategy, 0.3) == \
+            _dia_simulado(-5, -2, strategy, 0.3, 50)
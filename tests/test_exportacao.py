@@ -0,0 +1,94 @@
+"""Exportação Arrow IPC, Parquet e NPZ: gravação e leitura mapeada em memória."""
+import os
+
+import numpy as np
+import pytest
+from src import exportacao, lote, monte_carlo
+
+EXTENSOES = ['.npz', '.arrow', '.parquet']
+
+def _caminho(tmp_path, nome, extensao):
+    if extensao != '.npz':
+        pytest.importorskip('pyarrow')
+    return str(tmp_path / f'{nome}{extensao}')
+
+def _historico():
+    return 5 + np.cumsum(np.random.default_rng(22).normal(0, 0.02, 200))
+
+@pytest.mark.parametrize('extensao', EXTENSOES)
+def test_resultados_ida_e_volta(tmp_path, extensao):
+    import main
+
+    dados = {'dollar_values': _historico(), 'initial_reserves': 150.0, 'burn_rate': 3.0,
+             'days_to_predict': 40, 'market_sentiment': -0.4}
+    resultados = main.simular(dados)
+    caminho = _caminho(tmp_path, 'resultados', extensao)
+    exportacao.exportar_resultados(resultados, caminho)
+
+    lido = exportacao.ler_resultados(caminho)
+    assert lido.estrategias == resultados.estrategias
+    assert lido.mensagens == resultados.mensagens
+    np.testing.assert_array_equal(lido.dolar, resultados.dolar)
+    np.testing.assert_array_equal(lido.reservas, resultados.reservas)
+    np.testing.assert_array_equal(lido.dias, resultados.dias)
+    if extensao == '.npz':
+        assert isinstance(exportacao.ler(caminho)['reservas'], np.memmap)
+    with pytest.raises(ValueError, match="tipo 'resultados'"):
+        exportacao.ler_lote(caminho)
+
+@pytest.mark.parametrize('extensao', EXTENSOES)
+def test_cenarios_em_blocos_equivalem_ao_lote(tmp_path, extensao):
+    rng = np.random.default_rng(23)
+    n = 53
+    parametros = (rng.uniform(10, 300, n), rng.uniform(0, 8, n), rng.uniform(-1, 1, n), rng.integers(1, 60, n))
+    historico = _historico()
+    caminho = _caminho(tmp_path, 'cenarios', extensao)
+    # Blocos de tamanhos e horizontes diferentes: o arquivo completa com NaN até o maior horizonte
+    assert exportacao.exportar_cenarios(caminho, *parametros, dollar_values=historico, tamanho_bloco=10) == n
+
+    esperado = lote.simular_lote(*parametros, dollar_values=historico)
+    lido = exportacao.ler_lote(caminho)
+    assert lido['estrategias'] == esperado['estrategias']
+    assert set(lido) == set(esperado)
+    for campo in set(esperado) - {'estrategias'}:
+        np.testing.assert_array_equal(lido[campo], esperado[campo], err_msg=campo)
+    if extensao == '.npz':
+        assert isinstance(exportacao.ler(caminho)['reservas'], np.memmap)
+
+@pytest.mark.parametrize('extensao', EXTENSOES)
+def test_lote_sem_dolar(tmp_path, extensao):
+    calculado = lote.simular_lote([100.0, 50.0], [2.0, 5.0], 0.0, [10, 30])
+    caminho = _caminho(tmp_path, 'lote', extensao)
+    exportacao.exportar_lote(calculado, caminho)
+    lido = exportacao.ler_lote(caminho)
+    assert 'dolar' not in lido
+    np.testing.assert_array_equal(lido['reservas'], calculado['reservas'])
+    np.testing.assert_array_equal(lido['dia_esgotamento'], calculado['dia_esgotamento'])
+
+@pytest.mark.parametrize('extensao', EXTENSOES)
+def test_monte_carlo_ida_e_volta(tmp_path, extensao):
+    resultado = monte_carlo.simular_monte_carlo(_historico(), 80.0, 3.0, 30, 0.2, n_caminhos=3000, semente=4)
+    caminho = _caminho(tmp_path, 'monte_carlo', extensao)
+    exportacao.exportar_monte_carlo(resultado, caminho)
+
+    lido = exportacao.ler_monte_carlo(caminho)
+    assert tuple(lido['estrategias']) == resultado['estrategias']
+    assert lido['percentis'] == tuple(float(p) for p in resultado['percentis'])
+    assert lido['n_caminhos'] == resultado['n_caminhos']
+    assert lido['prob_esgotamento'] == resultado['prob_esgotamento']
+    assert lido['fora_da_faixa'] == resultado['fora_da_faixa']
+    np.testing.assert_array_equal(lido['dias'], resultado['dias'])
+    for e in resultado['estrategias']:
+        for campo in ('dolar', 'reservas', 'esgotamento'):
+            np.testing.assert_array_equal(lido[campo][e], resultado[campo][e], err_msg=f'{campo} {e}')
+
+@pytest.mark.parametrize('extensao', EXTENSOES)
+def test_lote_vazio_e_recusado(tmp_path, extensao):
+    caminho = str(tmp_path / f'vazio{extensao}')
+    with pytest.raises(ValueError, match='Nenhum cenário'):
+        exportacao.exportar_cenarios(caminho, [], [], [], [])
+    assert not os.listdir(tmp_path)
+
+def test_formato_desconhecido():
+    with pytest.raises(ValueError, match='não suportado'):
+        exportacao.formato('series.xlsx')
@@ -0,0 +1,51 @@
+"""Carga de históricos em arquivo e janela prevista dos resultados."""
+import numpy as np
+import pytest
+from src import configuracoes, ingestao
+
+@pytest.fixture(autouse=True)
+def cache_temporario(tmp_path, monkeypatch):
+    monkeypatch.setattr(configuracoes, 'DIRETORIO_CACHE', str(tmp_path / 'cache'))
+
+def test_csv_pt_br(tmp_path):
+    caminho = tmp_path / 'cotacoes.csv'
+    caminho.write_text('data;valor\n01/01;5,10\n02/01;5,15\n03/01;1.005,20\n', encoding='utf-8')
+    np.testing.assert_array_equal(ingestao.carregar_historico(str(caminho)), [5.10, 5.15, 1005.20])
+
+@pytest.mark.parametrize('conteudo', ['data;valor\n01/01;5,10\n02/01;\n03/01;5,20\n',
+                                      'valor\n5.1\nnan\n5.2\n', 'valor\n5.1\ninf\n'])
+def test_csv_recusa_valores_nao_finitos(tmp_path, conteudo):
+    caminho = tmp_path / 'cotacoes.csv'
+    caminho.write_text(conteudo, encoding='utf-8')
+    with pytest.raises(ValueError, match='posição 1'):
+        ingestao.carregar_historico(str(caminho), tamanho_bloco=1)
+
+def test_binario_recusa_valores_nao_finitos(tmp_path):
+    np.save(tmp_path / 'h.npy', np.array([5.0, 5.1, 5.2, np.nan]))
+    np.array([5.0, -np.inf]).tofile(tmp_path / 'h.f64')
+    with pytest.raises(ValueError, match='posição 3'):
+        ingestao.carregar_historico(str(tmp_path / 'h.npy'), tamanho_bloco=2)
+    with pytest.raises(ValueError, match='posição 1'):
+        ingestao.carregar_historico(str(tmp_path / 'h.f64'))
+
+def test_resultados_guardam_so_a_janela_prevista(tmp_path):
+    import main
+
+    historico = 5 + np.cumsum(np.random.default_rng(11).normal(0, 0.01, 5000))
+    historico.tofile(tmp_path / 'h.f64')
+    valores = ingestao.carregar_historico(str(tmp_path / 'h.f64'))
+    dados = {'dollar_values': valores, 'initial_reserves': 100.0, 'burn_rate': 2.0,
+             'days_to_predict': 15, 'market_sentiment': 0.1}
+    resultados = main.simular(dados)
+    assert resultados.dolar.shape == resultados.reservas.shape == (len(resultados), 16)
+    # O histórico é a mesma referência mapeada, sem cópia
+    assert np.shares_memory(resultados.historico, valores)
+    previsto = np.asarray(main.simulacao.prever_dolar(valores, 15))
+    for estrategia in resultados:
+        dolar = resultados.serie(estrategia, 'dolar')
+        assert dolar[0] == round(historico[-1], 2)
+        np.testing.assert_array_equal(
+            dolar[1:], np.round(main.simulacao.ajustar_dolar_vetorizado(previsto, estrategia, 0.1), 2))
+        np.testing.assert_array_equal(
+            resultados.serie(estrategia, 'reservas'),
+            np.round(main.simulacao.simular_reservas(100.0, 2.0, 15, estrategia, 0.1), 2))
@@ -0,0 +1,27 @@
+"""Monte Carlo: sem volatilidade, as faixas reproduzem a simulação determinística."""
+import numpy as np
+from src import monte_carlo, simulacao
+
+def test_gbm_sem_volatilidade_reproduz_simular_reservas():
+    # Histórico exponencial: retornos logarítmicos constantes, volatilidade (quase) zero
+    historico = 5.0 * 1.01 ** np.arange(30)
+    resultado = monte_carlo.simular_monte_carlo(historico, 100.0, 3.0, 60, 0.2, n_caminhos=500,
+                                                tamanho_bloco=200, semente=1)
+    for e in resultado['estrategias']:
+        esperado = np.asarray(simulacao.simular_reservas(100.0, 3.0, 60, e, 0.2)[1:])
+        for faixa in resultado['reservas'][e]:
+            np.testing.assert_allclose(faixa, esperado, rtol=1e-6, atol=0)
+        zerados = np.flatnonzero(esperado <= 0)
+        dia = int(zerados[0]) + 1 if zerados.size else 0
+        assert resultado['esgotamento'][e][dia] == 500
+        ajustado = simulacao.ajustar_dolar(simulacao.prever_dolar(historico, 60), e, 0.2)
+        np.testing.assert_allclose(resultado['dolar'][e][2], ajustado, rtol=1e-6)
+
+def test_percentis_de_reservas_esgotadas_valem_zero():
+    historico = 5 + np.cumsum(np.random.default_rng(2).normal(0, 0.05, 200))
+    resultado = monte_carlo.simular_monte_carlo(historico, 50.0, 5.0, 40, 0.0, n_caminhos=2000, semente=3,
+                                                estrategias=('agressiva',))
+    reservas = resultado['reservas']['agressiva']
+    assert (reservas >= 0).all()
+    # Com queima de 7,5/dia as reservas acabam antes do dia 10 em todos os caminhos
+    assert (reservas[:, 10:] == 0).all()
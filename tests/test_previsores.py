@@ -0,0 +1,88 @@
+"""Previsores: coeficientes conhecidos, equivalência com prever_dolar e backtest contra laço direto."""
+import numpy as np
+import pytest
+from src import previsores, simulacao
+
+def _holt_referencia(y, alfa, beta):
+    nivel, tendencia = y[0], y[1] - y[0]
+    for valor in y[1:]:
+        anterior = nivel
+        nivel = alfa * valor + (1 - alfa) * (nivel + tendencia)
+        tendencia = beta * (nivel - anterior) + (1 - beta) * tendencia
+    return nivel, tendencia
+
+def _avaliar_referencia(previsor, y, janela, horizonte, passo):
+    erros = np.array([previsor.prever(y[s:s + janela], horizonte) - y[s + janela:s + janela + horizonte]
+                      for s in range(0, len(y) - janela - horizonte + 1, passo)])
+    return np.abs(erros).mean(axis=0), np.sqrt(np.square(erros).mean(axis=0))
+
+def test_linear_equivale_a_prever_dolar():
+    rng = np.random.default_rng(17)
+    historicos = 5 + np.cumsum(rng.normal(0, 0.02, (4, 300)), axis=1)
+    previsor = previsores.PrevisorLinear()
+    em_lote = previsor.prever(historicos, 20)
+    for linha, previsto in zip(historicos, em_lote):
+        esperado = simulacao.prever_dolar(linha, 20, previsor='linear')
+        np.testing.assert_allclose(previsor.prever(linha, 20), esperado, rtol=1e-12)
+        np.testing.assert_allclose(previsto, esperado, rtol=1e-10)
+
+def test_janela_segue_so_as_ultimas_cotacoes():
+    y = np.concatenate((np.full(50, 9.0), 2.0 + 0.5 * np.arange(50, 80)))
+    np.testing.assert_allclose(previsores.PrevisorJanela(30).prever(y, 5), 2.0 + 0.5 * np.arange(80, 85))
+
+def test_ar_recupera_coeficientes():
+    rng = np.random.default_rng(18)
+    intercepto, phi = 0.8, np.array([0.5, -0.3])
+    y = np.empty(40000)
+    y[:2] = 1.0
+    ruido = rng.normal(0, 0.05, len(y))
+    for t in range(2, len(y)):
+        y[t] = intercepto + phi[0] * y[t - 1] + phi[1] * y[t - 2] + ruido[t]
+    estimado, phi_estimado, ultimos = previsores.PrevisorAR(2).ajustar(y)
+    np.testing.assert_allclose(phi_estimado[0], phi, atol=0.02)
+    np.testing.assert_allclose(estimado[0], intercepto, atol=0.03)
+    np.testing.assert_array_equal(ultimos[0], [y[-1], y[-2]])
+    # Previsão um passo à frente pela própria equação ajustada
+    previsto = previsores.PrevisorAR(2).prever(y, 1)[0]
+    np.testing.assert_allclose(previsto, estimado[0] + phi_estimado[0] @ [y[-1], y[-2]])
+
+@pytest.mark.parametrize('alfa, beta', [(0.5, 0.1), (0.2, 0.3), (0.9, 0.0), (1.0, 1.0)])
+def test_holt_equivale_a_recursao(alfa, beta):
+    rng = np.random.default_rng(19)
+    for n in (2, 3, 17, 500):
+        y = 5 + np.cumsum(rng.normal(0, 0.05, n))
+        nivel, tendencia = _holt_referencia(y, alfa, beta)
+        np.testing.assert_allclose(previsores.PrevisorHolt(alfa, beta).prever(y, 4),
+                                   nivel + tendencia * np.arange(1, 5), rtol=1e-10)
+
+def test_holt_em_serie_linear():
+    # Nível e tendência exatos desde o início: a previsão continua a reta
+    y = 3.0 + 0.25 * np.arange(200)
+    np.testing.assert_allclose(previsores.PrevisorHolt(0.3, 0.2).prever(y, 10),
+                               3.0 + 0.25 * np.arange(200, 210), rtol=1e-12)
+
+@pytest.mark.parametrize('especificacao', ['linear', 'janela:7', 'holt:0.4,0.2', 'ar:2'])
+def test_avaliar_equivale_ao_laco(especificacao):
+    y = 5 + np.cumsum(np.random.default_rng(20).normal(0, 0.05, 400))
+    avaliacao = previsores.avaliar(especificacao, y, janela=30, horizonte=5, passo=3)
+    mae, rmse = _avaliar_referencia(previsores.criar_previsor(especificacao), y, 30, 5, 3)
+    np.testing.assert_allclose(avaliacao['mae'], mae, rtol=1e-7)
+    np.testing.assert_allclose(avaliacao['rmse'], rmse, rtol=1e-7)
+    assert avaliacao['n_janelas'] == len(range(0, 400 - 35 + 1, 3))
+    assert avaliacao['previsor'] == especificacao
+
+def test_avaliar_serie_linear_sem_erro():
+    y = 2.0 + 0.5 * np.arange(300)
+    avaliacao = previsores.avaliar('linear', y, janela=20, horizonte=10)
+    assert avaliacao['mae_medio'] < 1e-9
+
+def test_comparar_separa_instancias_com_parametros_diferentes():
+    y = 5 + np.cumsum(np.random.default_rng(21).normal(0, 0.05, 500))
+    candidatos = [previsores.PrevisorHolt(alfa=0.2), previsores.PrevisorHolt(alfa=0.8), 'ar:2', 'holt:0.2,0.1']
+    ranking = previsores.comparar(candidatos, y, janela=40, horizonte=5)
+    assert set(ranking) == {'holt:0.2,0.1', 'holt:0.8,0.1', 'ar:2', 'holt:0.2,0.1#3'}
+    medias = [avaliacao['mae_medio'] for avaliacao in ranking.values()]
+    assert medias == sorted(medias)
+    for chave, avaliacao in ranking.items():
+        esperado = previsores.avaliar(chave.partition('#')[0], y, janela=40, horizonte=5)
+        assert avaliacao['mae_medio'] == esperado['mae_medio']
@@ -0,0 +1,75 @@
+"""Derivadas analíticas contra diferenças centrais da simulação."""
+import numpy as np
+import pytest
+from src import estrategias, sensibilidade, simulacao
+
+PASSO = 1e-6
+
+@pytest.fixture
+def estrategia_oscilante():
+    """Queima que muda de sinal: as reservas se esgotam e voltam a crescer (recomeço do zero)"""
+    def queima(burn_rate, dias):
+        return burn_rate * np.cos(dias / 4) + 0.02 * burn_rate ** 2
+
+    def derivada(burn_rate, dias):
+        return np.cos(dias / 4) + 0.04 * burn_rate
+
+    estrategias.registrar_estrategia('oscilante', queima, lambda dias: np.ones_like(dias), derivada_queima=derivada)
+    # Mesmo kernel sem derivada: cai na diferença central sobre o kernel
+    estrategias.registrar_estrategia('oscilante_sem_derivada', queima, lambda dias: np.ones_like(dias))
+    yield
+    estrategias.remover_estrategia('oscilante')
+    estrategias.remover_estrategia('oscilante_sem_derivada')
+
+def _diferencas_centrais(parametros, indice):
+    acima, abaixo = list(parametros), list(parametros)
+    acima[indice] += PASSO
+    abaixo[indice] -= PASSO
+    r_acima = np.asarray(simulacao.simular_reservas(*acima))
+    r_abaixo = np.asarray(simulacao.simular_reservas(*abaixo))
+    # Dias a partir de uma mudança de esgotamento dentro do passo ficam de fora (ponto de quebra)
+    quebra = np.flatnonzero((r_acima <= 0) != (r_abaixo <= 0))
+    validos = np.arange(len(r_acima)) < (quebra[0] if quebra.size else len(r_acima))
+    return (r_acima - r_abaixo) / (2 * PASSO), validos
+
+def _conferir(initial_reserves, burn_rate, dias, strategy, market_sentiment):
+    parametros = [initial_reserves, burn_rate, dias, strategy, market_sentiment]
+    calculado = sensibilidade.simular_com_sensibilidade(initial_reserves, burn_rate, dias, strategy, market_sentiment)
+    np.testing.assert_array_equal(calculado['reservas'], simulacao.simular_reservas(*parametros))
+    validos_total = np.ones(dias + 1, dtype=bool)
+    for parametro, indice in zip(sensibilidade.PARAMETROS, (0, 1, 4)):
+        numerica, validos = _diferencas_centrais(parametros, indice)
+        np.testing.assert_allclose(calculado['d_reservas'][parametro][validos], numerica[validos],
+                                   rtol=1e-5, atol=1e-5)
+        validos_total &= validos
+    return calculado['reservas'], validos_total
+
+def test_derivadas_das_estrategias_embutidas():
+    rng = np.random.default_rng(13)
+    for _ in range(200):
+        _conferir(float(rng.uniform(1, 300)), float(rng.uniform(0.05, 10)), int(rng.integers(1, 150)),
+                  str(rng.choice(('moderada', 'agressiva', 'inatividade', 'padrão'))), float(rng.uniform(-1, 1)))
+
+@pytest.mark.parametrize('strategy', ['oscilante', 'oscilante_sem_derivada'])
+def test_derivadas_com_esgotamento_e_recomeco(estrategia_oscilante, strategy):
+    recomecos = 0
+    rng = np.random.default_rng(14)
+    for _ in range(100):
+        reservas, validos = _conferir(float(rng.uniform(1, 20)), float(rng.uniform(2, 8)), 120, strategy,
+                                      float(rng.uniform(-1, 1)))
+        # Dias com reservas positivas depois de um esgotamento, conferidos contra a simulação
+        esgotado = np.maximum.accumulate(reservas <= 0)
+        recomecos += np.count_nonzero(esgotado & (reservas > 0) & validos)
+    assert recomecos > 0
+
+def test_derivada_do_dolar():
+    historico = 5 + np.cumsum(np.random.default_rng(15).normal(0, 0.02, 100))
+    for strategy in ('moderada', 'agressiva', 'inatividade', 'padrão'):
+        calculado = sensibilidade.simular_com_sensibilidade(100.0, 2.0, 30, strategy, 0.3, historico)
+        previsto = simulacao.prever_dolar(historico, 30)
+        np.testing.assert_array_equal(calculado['dolar'], simulacao.ajustar_dolar_vetorizado(previsto, strategy, 0.3))
+        numerica = (simulacao.ajustar_dolar_vetorizado(previsto, strategy, 0.3 + PASSO) -
+                    simulacao.ajustar_dolar_vetorizado(previsto, strategy, 0.3 - PASSO)) / (2 * PASSO)
+        np.testing.assert_allclose(calculado['d_dolar']['market_sentiment'], numerica, rtol=1e-6)
+        assert not calculado['d_dolar']['burn_rate'].any()
+        assert not calculado['d_dolar']['initial_reserves'].any()
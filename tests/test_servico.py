@@ -0,0 +1,24 @@
+"""Micro-lotes do serviço HTTP contra a execução individual de main.simular."""
+import numpy as np
+from src import servico
+
+def _requisicao(historico, dias, initial_reserves, burn_rate, market_sentiment):
+    return {'dollar_values': historico, 'initial_reserves': initial_reserves, 'burn_rate': burn_rate,
+            'days_to_predict': dias, 'market_sentiment': market_sentiment, 'strategy': 'padrão'}
+
+def test_simular_requisicoes_identico_a_main_simular():
+    import main
+
+    rng = np.random.default_rng(12)
+    historicos = [[5.0, 5.1, 5.2], (5 + np.cumsum(rng.normal(0, 0.02, 300))).tolist()]
+    requisicoes = [_requisicao(historicos[0], 30, 200.0, 2.5, 0.35)]
+    for _ in range(300):
+        requisicoes.append(_requisicao(historicos[int(rng.integers(0, 2))], int(rng.choice((10, 30, 90))),
+                                       float(rng.uniform(1, 400)), float(rng.uniform(0, 12)),
+                                       float(rng.uniform(-1, 1))))
+    for dados, obtido in zip(requisicoes, servico.simular_requisicoes(requisicoes)):
+        esperado = main.simular(dados)
+        assert obtido.estrategias == esperado.estrategias
+        np.testing.assert_array_equal(obtido.dolar, esperado.dolar)
+        np.testing.assert_array_equal(obtido.reservas, esperado.reservas)
+        assert obtido.mensagens == esperado.mensagens
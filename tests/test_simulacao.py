@@ -0,0 +1,133 @@
+"""Equivalência do motor vetorizado com os laços originais, em casos aleatórios.
+
+_simular_reservas_referencia e _ajustar_dolar_referencia são os laços dia a dia da
+versão original de src/simulacao.py, mantidos aqui como referência.
+"""
+import numpy as np
+import pytest
+from src import lote, simulacao
+
+ESTRATEGIAS = ('moderada', 'agressiva', 'inatividade', 'padrão', 'desconhecida')
+CASOS = 500
+
+def _simular_reservas_referencia(initial_reserves, burn_rate, days_to_predict, strategy, market_sentiment):
+    reservas = [initial_reserves]
+    for dia in range(days_to_predict):
+        if strategy == 'moderada':
+            queima = max(burn_rate - 0.1 * dia, 0)
+        elif strategy == 'agressiva':
+            queima = burn_rate * 1.5
+        elif strategy == 'inatividade':
+            queima = 0
+        else:
+            queima = burn_rate
+        queima *= (1 - market_sentiment * 0.1)
+        reservas.append(max(reservas[-1] - queima, 0))
+    return reservas
+
+def _ajustar_dolar_referencia(predicted_dollar, strategy, market_sentiment):
+    ajustado = []
+    for dia, valor in enumerate(predicted_dollar):
+        if strategy == 'moderada':
+            novo = valor * (1 + 0.001 * dia)
+        elif strategy == 'agressiva':
+            novo = valor * (1 - 0.002 * dia)
+        elif strategy == 'inatividade':
+            novo = valor * (1 + 0.003 * dia)
+        else:
+            novo = valor
+        ajustado.append(novo * (1 + market_sentiment * 0.01))
+    return ajustado
+
+def _saldo_com_piso_referencia(initial_reserves, queima):
+    reservas = [initial_reserves]
+    for q in queima:
+        reservas.append(max(reservas[-1] - q, 0))
+    return reservas
+
+def _parametros(rng):
+    """Reservas e queima com sinais variados (inclusive negativos) e horizontes a partir de zero"""
+    return (
+        float(rng.uniform(-50, 500)),
+        float(rng.uniform(-5, 20)),
+        int(rng.integers(0, 120)),
+        str(rng.choice(ESTRATEGIAS)),
+        float(rng.uniform(-1, 1))
+    )
+
+def _comparar(obtido, esperado):
+    # Igualdade exata: o motor vetorizado repete a ordem das operações dos laços
+    np.testing.assert_array_equal(obtido, np.asarray(esperado, dtype=np.float64))
+
+def test_simular_reservas_vetorizado_equivale_ao_laco():
+    rng = np.random.default_rng(1)
+    for _ in range(CASOS):
+        parametros = _parametros(rng)
+        obtido = simulacao.simular_reservas_vetorizado(*parametros)
+        esperado = _simular_reservas_referencia(*parametros)
+        assert obtido.shape == (parametros[2] + 1,)
+        _comparar(obtido, esperado)
+
+def test_simular_reservas_horizonte_zero():
+    for strategy in ESTRATEGIAS:
+        _comparar(simulacao.simular_reservas_vetorizado(-3.0, -1.0, 0, strategy, 0.5), [-3.0])
+        _comparar(simulacao.simular_reservas_vetorizado(10.0, 2.0, 0, strategy, 0.0), [10.0])
+
+def test_saldo_com_piso_equivale_ao_laco():
+    rng = np.random.default_rng(2)
+    for _ in range(CASOS):
+        n = int(rng.integers(0, 200))
+        initial_reserves = float(rng.uniform(-20, 100))
+        queima = rng.normal(rng.uniform(-2, 4), rng.uniform(0, 10), n)
+        _comparar(simulacao.saldo_com_piso(initial_reserves, queima),
+                  _saldo_com_piso_referencia(initial_reserves, queima))
+
+def test_ajustar_dolar_vetorizado_equivale_ao_laco():
+    rng = np.random.default_rng(3)
+    for _ in range(CASOS):
+        previsto = rng.uniform(-2, 10, int(rng.integers(0, 150)))
+        strategy = str(rng.choice(ESTRATEGIAS))
+        market_sentiment = float(rng.uniform(-1, 1))
+        obtido = simulacao.ajustar_dolar_vetorizado(previsto, strategy, market_sentiment)
+        _comparar(obtido, _ajustar_dolar_referencia(previsto, strategy, market_sentiment))
+
+def test_simular_lote_equivale_ao_laco():
+    rng = np.random.default_rng(4)
+    historico = 5 + np.cumsum(rng.normal(0, 0.05, 60))
+    estrategias = ESTRATEGIAS
+    for _ in range(20):
+        n = int(rng.integers(1, 40))
+        reservas = rng.uniform(-50, 500, n)
+        queima = rng.uniform(-5, 20, n)
+        sentimento = rng.uniform(-1, 1, n)
+        horizonte = rng.integers(1, 90, n)
+        calculado = lote.simular_lote(reservas, queima, sentimento, horizonte,
+                                      dollar_values=historico, estrategias=estrategias)
+        previsao = simulacao.prever_dolar(historico, int(horizonte.max()))
+        for s in range(n):
+            h = int(horizonte[s])
+            for j, strategy in enumerate(estrategias):
+                esperado = _simular_reservas_referencia(reservas[s], queima[s], h, strategy, sentimento[s])
+                _comparar(calculado['reservas'][s, j, :h + 1], esperado)
+                assert np.isnan(calculado['reservas'][s, j, h + 1:]).all()
+                _comparar(calculado['reserva_final'][s, j], esperado[-1])
+                zerados = [dia for dia in range(1, h + 1) if esperado[dia] <= 0]
+                assert calculado['dia_esgotamento'][s, j] == (zerados[0] if zerados else -1)
+                _comparar(calculado['dolar'][s, j, :h],
+                          _ajustar_dolar_referencia(previsao[:h], strategy, sentimento[s]))
+
+def test_simular_lote_recusa_horizonte_zero():
+    with pytest.raises(ValueError):
+        lote.simular_lote([100.0, 50.0], 1.0, 0.0, [10, 0])
+
+def test_simular_lote_identico_a_simular_reservas():
+    rng = np.random.default_rng(6)
+    n = 2000
+    reservas = rng.uniform(50, 300, n)
+    queima = rng.uniform(0.5, 10, n)
+    sentimento = rng.uniform(-1, 1, n)
+    calculado = lote.simular_lote(reservas, queima, sentimento, 40)
+    for s in range(n):
+        for j, strategy in enumerate(calculado['estrategias']):
+            esperado = simulacao.simular_reservas(reservas[s], queima[s], 40, strategy, sentimento[s])
+            np.testing.assert_array_equal(calculado['reservas'][s, j], esperado)
@@ -0,0 +1,66 @@
+"""Ajuste da tendência do dólar: forma fechada em blocos contra np.polyfit e cache por conteúdo."""
+import numpy as np
+from src import simulacao
+
+def _polyfit(y):
+    inclinacao, intercepto = np.polyfit(np.arange(len(y), dtype=np.float64), y, 1)
+    return inclinacao, intercepto
+
+def test_ajuste_em_blocos_equivale_ao_polyfit():
+    rng = np.random.default_rng(7)
+    # Maior que _BLOCO_AJUSTE: percorre o caminho em blocos
+    n = 3 * simulacao._BLOCO_AJUSTE + 12345
+    y = 5 + 2e-6 * np.arange(n) + np.cumsum(rng.normal(0, 1e-3, n))
+    inclinacao, intercepto = simulacao.ajustar_tendencia(y)
+    esperado = _polyfit(y)
+    np.testing.assert_allclose(inclinacao, esperado[0], rtol=1e-9)
+    np.testing.assert_allclose(intercepto, esperado[1], rtol=1e-9)
+
+def test_ajuste_curto_equivale_ao_polyfit():
+    rng = np.random.default_rng(8)
+    for n in (2, 3, 10, 1000):
+        y = rng.uniform(3, 7, n)
+        np.testing.assert_allclose(simulacao.ajustar_tendencia(y), _polyfit(y), rtol=1e-9, atol=1e-12)
+
+def test_cache_acompanha_alteracoes_da_serie():
+    y = np.linspace(5.0, 6.0, 500)
+    primeiro = simulacao.ajustar_tendencia(y)
+    # Mesmo objeto alterado no lugar: a chave é o conteúdo, não a identidade
+    y[-100:] += np.linspace(0, 1, 100)
+    segundo = simulacao.ajustar_tendencia(y)
+    assert segundo != primeiro
+    np.testing.assert_allclose(segundo, _polyfit(y), rtol=1e-9)
+    np.testing.assert_allclose(simulacao.prever_dolar(y, 5, previsor='linear'),
+                               np.polyval(_polyfit(y), np.arange(500, 505)), rtol=1e-12)
+
+def test_cache_limitado():
+    for deslocamento in range(simulacao._LIMITE_CACHE_TENDENCIA + 10):
+        simulacao.ajustar_tendencia(np.arange(10, dtype=np.float64) + deslocamento)
+    assert len(simulacao._CACHE_TENDENCIA) <= simulacao._LIMITE_CACHE_TENDENCIA
+
+def test_previsor_incremental_equivale_a_prever_dolar():
+    from src.previsao import PrevisorIncremental
+
+    rng = np.random.default_rng(9)
+    y = 5 + np.cumsum(rng.normal(0, 0.01, 5000))
+    previsor = PrevisorIncremental(y[:1000])
+    for valor in y[1000:1100]:
+        previsor.atualizar(valor)
+    previsor.estender(y[1100:])
+    np.testing.assert_allclose(previsor.prever(30), simulacao.prever_dolar(y, 30, previsor='linear'), rtol=1e-10)
+    # Novas cotações mudam a série e, com ela, a previsão em cache
+    previsor.atualizar(y[-1] + 1)
+    estendida = np.append(y, y[-1] + 1)
+    np.testing.assert_allclose(previsor.prever(30), simulacao.prever_dolar(estendida, 30, previsor='linear'),
+                               rtol=1e-10)
+
+def test_previsor_incremental_com_janela():
+    from src.previsao import PrevisorIncremental
+
+    rng = np.random.default_rng(10)
+    y = rng.uniform(4, 6, 700)
+    previsor = PrevisorIncremental(y[:300], janela=250)
+    previsor.estender(y[300:])
+    inclinacao, intercepto = _polyfit(y[-250:])
+    esperado = intercepto + inclinacao * (np.arange(700, 710) - 450)
+    np.testing.assert_allclose(previsor.prever(10), esperado, rtol=1e-9)